@@ -0,0 +1,353 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Benchmarks of ansatz construction and parameter binding.
+
+Usage:
+    python benchmarks/run_benchmarks.py --save-baseline   # store current timings
+    python benchmarks/run_benchmarks.py                    # compare with baseline
+    python benchmarks/run_benchmarks.py -k "hea_.*qubits=4-"
+
+Each benchmark is timed as the best of several runs, with setup (e.g. creating
+the ansatz, clearing caches) excluded from the measurement. Setup is done once
+per benchmark, or before every run for benchmarks of cold construction.
+Benchmarks slower than the baseline by more than the threshold are reported as
+regressions and the script exits with non-zero status.
+
+Timings depend on the machine, so no baseline is committed. Create one on each
+machine with --save-baseline before comparing; comparing without a baseline is
+an error.
+"""
+
+import argparse
+import json
+import platform
+import re
+import sys
+import time
+from functools import partial
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from zquantum.core.openfermion import FermionOperator
+from zquantum.vqe.quantum_compiling import HEAQuantumCompilingAnsatz
+from zquantum.vqe.singlet_uccsd import SingletUCCSDAnsatz
+from zquantum.vqe.utils import clear_transformation_cache, exponentiate_fermion_operator
+
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Callable[[], Any]
+    run: Callable[[Any], Any]
+    # If True, setup is repeated before every run, e.g. to time construction from
+    # scratch
+    setup_per_run: bool = False
+
+
+def _new_uccsd_ansatz(
+    number_of_spatial_orbitals: int, transformation: str
+) -> SingletUCCSDAnsatz:
+    # Measure cold construction, without qubit images cached by earlier runs
+    clear_transformation_cache()
+    return SingletUCCSDAnsatz(
+        number_of_spatial_orbitals,
+        number_of_spatial_orbitals // 2,
+        transformation=transformation,
+    )
+
+
+def _with_random_params(new_ansatz: Callable[[], Any]) -> Tuple[Any, np.ndarray]:
+    ansatz = new_ansatz()
+    # Build the parametrized circuit and its template beforehand, so that only
+    # parameter binding is timed
+    ansatz.parametrized_circuit
+    if getattr(type(ansatz), "circuit_template", None) is not None:
+        ansatz.circuit_template
+    random_generator = np.random.default_rng(1234)
+    return ansatz, random_generator.uniform(-np.pi, np.pi, ansatz.number_of_params)
+
+
+def _build_parametrized_circuit(ansatz):
+    return ansatz.parametrized_circuit
+
+
+def _bind_params(ansatz_and_params):
+    ansatz, params = ansatz_and_params
+    return ansatz.get_executable_circuit(params)
+
+
+def _with_random_params_batch(
+    new_ansatz: Callable[[], Any], batch_size: int = 16
+) -> Tuple[Any, np.ndarray]:
+    ansatz, _ = _with_random_params(new_ansatz)
+    random_generator = np.random.default_rng(1234)
+    return ansatz, random_generator.uniform(
+        -np.pi, np.pi, (batch_size, ansatz.number_of_params)
+    )
+
+
+def _bind_params_one_by_one(ansatz_and_params_batch):
+    ansatz, params_batch = ansatz_and_params_batch
+    return [ansatz.get_executable_circuit(params) for params in params_batch]
+
+
+def _bind_params_batch(ansatz_and_params_batch):
+    ansatz, params_batch = ansatz_and_params_batch
+    return ansatz.get_executable_circuits(params_batch)
+
+
+def _uccsd_benchmarks() -> List[Benchmark]:
+    benchmarks = []
+    for transformation in ["Jordan-Wigner", "Bravyi-Kitaev"]:
+        for number_of_spatial_orbitals in range(2, 13, 2):
+            new_ansatz = partial(
+                _new_uccsd_ansatz, number_of_spatial_orbitals, transformation
+            )
+            suffix = f"[{transformation},orbitals={number_of_spatial_orbitals}]"
+            benchmarks += [
+                Benchmark(
+                    "uccsd_construction" + suffix,
+                    new_ansatz,
+                    _build_parametrized_circuit,
+                    setup_per_run=True,
+                ),
+                Benchmark(
+                    "uccsd_executable_circuit" + suffix,
+                    partial(_with_random_params, new_ansatz),
+                    _bind_params,
+                ),
+            ]
+    return benchmarks
+
+
+def _hea_benchmarks() -> List[Benchmark]:
+    benchmarks = []
+    for number_of_qubits in [4, 8, 16, 32, 64]:
+        for number_of_layers in [1, 5, 10, 20]:
+            new_ansatz = partial(
+                HEAQuantumCompilingAnsatz, number_of_layers, number_of_qubits
+            )
+            suffix = f"[qubits={number_of_qubits}-layers={number_of_layers}]"
+            benchmarks += [
+                Benchmark(
+                    "hea_construction" + suffix,
+                    new_ansatz,
+                    _build_parametrized_circuit,
+                    setup_per_run=True,
+                ),
+                Benchmark(
+                    "hea_executable_circuit" + suffix,
+                    partial(_with_random_params, new_ansatz),
+                    _bind_params,
+                ),
+                # The same batch of parameter vectors bound one by one and at once
+                Benchmark(
+                    "hea_executable_circuits_one_by_one" + suffix,
+                    partial(_with_random_params_batch, new_ansatz),
+                    _bind_params_one_by_one,
+                ),
+                Benchmark(
+                    "hea_executable_circuits_batch" + suffix,
+                    partial(_with_random_params_batch, new_ansatz),
+                    _bind_params_batch,
+                ),
+            ]
+    return benchmarks
+
+
+def _random_anti_hermitian_generator(
+    number_of_qubits: int, number_of_excitations: int, seed: int = 1234
+) -> FermionOperator:
+    # Measure cold exponentiation, without qubit images cached by earlier runs
+    clear_transformation_cache()
+    random_state = np.random.RandomState(seed)
+    fermion_generator = FermionOperator()
+    for _ in range(number_of_excitations):
+        excitation_rank = random_state.choice([1, 2])
+        orbitals = random_state.choice(
+            number_of_qubits, 2 * excitation_rank, replace=False
+        )
+        term = tuple((int(orbital), 1) for orbital in orbitals[:excitation_rank]) + (
+            tuple((int(orbital), 0) for orbital in orbitals[excitation_rank:])
+        )
+        conjugate_term = tuple((orbital, 1 - action) for orbital, action in term[::-1])
+        coefficient = random_state.uniform(-1, 1)
+        fermion_generator += FermionOperator(term, coefficient)
+        fermion_generator += FermionOperator(conjugate_term, -coefficient)
+    return fermion_generator
+
+
+def _exponentiation_benchmarks() -> List[Benchmark]:
+    benchmarks = []
+    for transformation in ["Jordan-Wigner", "Bravyi-Kitaev"]:
+        for number_of_qubits in [4, 8, 16, 24]:
+            for number_of_excitations in [10, 100, 1000]:
+                benchmarks.append(
+                    Benchmark(
+                        f"exponentiate_fermion_operator[{transformation},"
+                        f"qubits={number_of_qubits}-"
+                        f"excitations={number_of_excitations}]",
+                        partial(
+                            _random_anti_hermitian_generator,
+                            number_of_qubits,
+                            number_of_excitations,
+                        ),
+                        partial(
+                            exponentiate_fermion_operator,
+                            transformation=transformation,
+                            number_of_qubits=number_of_qubits,
+                        ),
+                        setup_per_run=True,
+                    )
+                )
+    return benchmarks
+
+
+def get_benchmarks() -> List[Benchmark]:
+    return _uccsd_benchmarks() + _hea_benchmarks() + _exponentiation_benchmarks()
+
+
+def time_benchmark(
+    benchmark: Benchmark, min_time: float = 0.5, max_repeats: int = 10
+) -> float:
+    """Best wall time of the benchmark over repeated runs, in seconds.
+
+    Runs are repeated until their total time exceeds `min_time` or `max_repeats`
+    runs are done; a single run is made if it takes longer than `min_time`.
+    """
+    timings: List[float] = []
+    state = None if benchmark.setup_per_run else benchmark.setup()
+    while len(timings) < max_repeats and sum(timings) < min_time:
+        if benchmark.setup_per_run:
+            state = benchmark.setup()
+        start_time = time.perf_counter()
+        benchmark.run(state)
+        timings.append(time.perf_counter() - start_time)
+    return min(timings)
+
+
+def compare_with_baseline(
+    timings: Dict[str, float], baseline: Dict[str, float], threshold: float
+) -> Dict[str, List[str]]:
+    """Classify benchmarks as regressions, improvements or unchanged.
+
+    Args:
+        timings: current timings of benchmarks.
+        baseline: timings of benchmarks stored in the baseline.
+        threshold: relative change of timing considered significant, e.g. 0.2
+            for 20%.
+
+    Returns:
+        names of benchmarks in each category. Benchmarks missing in the baseline
+        are listed as "new".
+    """
+    comparison: Dict[str, List[str]] = {
+        "regressions": [],
+        "improvements": [],
+        "unchanged": [],
+        "new": [],
+    }
+    for name, timing in timings.items():
+        if name not in baseline:
+            comparison["new"].append(name)
+        elif timing > baseline[name] * (1 + threshold):
+            comparison["regressions"].append(name)
+        elif timing < baseline[name] / (1 + threshold):
+            comparison["improvements"].append(name)
+        else:
+            comparison["unchanged"].append(name)
+    return comparison
+
+
+def _load_baseline(filename: str) -> Optional[Dict[str, float]]:
+    try:
+        with open(filename) as f:
+            return json.load(f)["timings"]
+    except FileNotFoundError:
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        epilog="Timings depend on the machine, so no baseline is committed. Run "
+        "with --save-baseline once on each machine before comparing.",
+    )
+    parser.add_argument(
+        "-k", "--filter", default="", help="Regex selecting benchmarks by name."
+    )
+    parser.add_argument(
+        "--baseline",
+        default=DEFAULT_BASELINE,
+        help="Baseline file, created with --save-baseline (default: "
+        f"{DEFAULT_BASELINE}).",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store timings in the baseline file instead of comparing.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative slowdown reported as regression (default: 0.2).",
+    )
+    parser.add_argument("--min-time", type=float, default=0.5)
+    parser.add_argument("--max-repeats", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    baseline = None if args.save_baseline else _load_baseline(args.baseline)
+    if baseline is None and not args.save_baseline:
+        print(
+            f"No baseline found at {args.baseline}. Create one on this machine with "
+            "--save-baseline first.",
+            file=sys.stderr,
+        )
+        return 2
+
+    timings: Dict[str, float] = {}
+    for benchmark in get_benchmarks():
+        if not re.search(args.filter, benchmark.name):
+            continue
+        timings[benchmark.name] = time_benchmark(
+            benchmark, args.min_time, args.max_repeats
+        )
+        reference = (
+            f" (baseline {baseline[benchmark.name]:.6f} s)"
+            if baseline and benchmark.name in baseline
+            else ""
+        )
+        print(f"{benchmark.name}: {timings[benchmark.name]:.6f} s{reference}")
+
+    if args.save_baseline:
+        stored_timings = _load_baseline(args.baseline) or {}
+        stored_timings.update(timings)
+        with open(args.baseline, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "timings": stored_timings,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+        print(f"Saved {len(timings)} timings to {args.baseline}.")
+        return 0
+
+    assert baseline is not None
+    comparison = compare_with_baseline(timings, baseline, args.threshold)
+    for category, names in comparison.items():
+        print(f"{category}: {len(names)}")
+        if category in ("regressions", "improvements"):
+            for name in names:
+                print(f"    {name}: {baseline[name]:.6f} s -> {timings[name]:.6f} s")
+    return 1 if comparison["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
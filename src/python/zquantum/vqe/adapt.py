@@ -0,0 +1,333 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import sympy
+from overrides import overrides
+from zquantum.core.circuits import Circuit
+from zquantum.core.interfaces.ansatz import Ansatz
+from zquantum.core.interfaces.ansatz_utils import invalidates_parametrized_circuit
+from zquantum.core.openfermion import (
+    FermionOperator,
+    QubitOperator,
+    uccsd_singlet_generator,
+    uccsd_singlet_paramsize,
+)
+
+from .statevector import (
+    PauliTerm,
+    apply_pauli_rotation,
+    apply_pauli_string,
+    apply_qubit_operator,
+)
+from .utils import (
+    build_hartree_fock_circuit,
+    exponentiate_fermion_operator,
+    get_hartree_fock_bitstrings,
+    get_pauli_rotations,
+)
+
+
+def _scale_fermion_operator(
+    fermion_operator: FermionOperator, coefficient
+) -> FermionOperator:
+    scaled_operator = FermionOperator()
+    scaled_operator.terms = {
+        term: value * coefficient for term, value in fermion_operator.terms.items()
+    }
+    return scaled_operator
+
+
+class SingletADAPTAnsatz(Ansatz):
+
+    supports_parametrized_circuits = True
+
+    def __init__(
+        self,
+        number_of_spatial_orbitals: int,
+        number_of_alpha_electrons: int,
+        transformation: str = "Jordan-Wigner",
+        selected_operators: Optional[Sequence[int]] = None,
+    ):
+        """
+        Adaptive ansatz growing the circuit one operator at a time (ADAPT-VQE).
+
+        The operator pool consists of the generators of the singlet UCCSD
+        ansatz: pool operator k is the singlet UCCSD generator with parameter k
+        set to 1 and all others to 0. The circuit is the Hartree-Fock circuit
+        followed by exp(-theta_j A_{s_j}) for every selected pool operator s_j,
+        each with its own parameter theta_j. Operators are appended with
+        `append_operator` or `grow`, which picks the operator with the largest
+        energy gradient; the blocks already in the circuit are never rebuilt.
+
+        Args:
+            number_of_spatial_orbitals: number of spatial orbitals.
+            number_of_alpha_electrons: number of alpha electrons.
+            transformation: transformation used for translation between fermions
+                and qubits.
+            selected_operators: indices of the pool operators the ansatz starts
+                with. Defaults to none, i.e. only the Hartree-Fock circuit.
+
+        Attributes:
+            number_of_qubits: number of qubits required for the ansatz circuit.
+            number_of_params: number of selected operators.
+            pool_size: number of operators in the pool.
+            selected_operators: indices of the selected pool operators, in the
+                order in which they are applied.
+        """
+        super().__init__(number_of_layers=1)
+        if number_of_spatial_orbitals <= number_of_alpha_electrons:
+            raise ValueError(
+                "Number of spatial orbitals must be greater than "
+                "number_of_alpha_electrons and is {0}".format(
+                    number_of_spatial_orbitals
+                )
+            )
+        self._number_of_spatial_orbitals = number_of_spatial_orbitals
+        self._number_of_alpha_electrons = number_of_alpha_electrons
+        self._transformation = transformation
+        self._selected_operators: List[int] = []
+        self._pool: Optional[List[FermionOperator]] = None
+        self._pool_rotations: Dict[int, Tuple[List[PauliTerm], np.ndarray]] = {}
+        self._pool_gradient_rotations: Optional[tuple] = None
+        self._prefix_circuit: Optional[Circuit] = None
+        self._number_of_prefix_blocks = 0
+        for index in selected_operators or []:
+            self.append_operator(index)
+
+    @property
+    def number_of_spatial_orbitals(self) -> int:
+        return self._number_of_spatial_orbitals
+
+    @property
+    def number_of_alpha_electrons(self) -> int:
+        return self._number_of_alpha_electrons
+
+    @property
+    def number_of_electrons(self) -> int:
+        return 2 * self._number_of_alpha_electrons
+
+    @property
+    def transformation(self) -> str:
+        return self._transformation
+
+    @property
+    def number_of_qubits(self) -> int:
+        return 2 * self._number_of_spatial_orbitals
+
+    @property
+    def pool_size(self) -> int:
+        return uccsd_singlet_paramsize(
+            n_qubits=self.number_of_qubits, n_electrons=self.number_of_electrons
+        )
+
+    @property
+    def selected_operators(self) -> List[int]:
+        return list(self._selected_operators)
+
+    @property
+    def number_of_params(self) -> int:
+        """
+        Returns number of parameters in the ansatz.
+        """
+        return len(self._selected_operators)
+
+    @property
+    def symbols(self) -> List[sympy.Symbol]:
+        """
+        Returns a list of symbolic parameters used for creating the ansatz.
+        The order of the symbols should match the order in which parameters
+        should be passed for creating executable circuit.
+        """
+        return [
+            sympy.Symbol("theta_{}".format(i), real=True)
+            for i in range(self.number_of_params)
+        ]
+
+    def _get_pool(self) -> List[FermionOperator]:
+        if self._pool is None:
+            self._pool = [
+                uccsd_singlet_generator(
+                    unit_vector,
+                    self.number_of_qubits,
+                    self.number_of_electrons,
+                    anti_hermitian=True,
+                )
+                for unit_vector in np.eye(self.pool_size)
+            ]
+        return self._pool
+
+    @invalidates_parametrized_circuit
+    def append_operator(self, index: int) -> None:
+        """Appends the pool operator with the given index, with a new parameter.
+
+        The parametrized circuit is extended by the block of the new operator
+        when it is next requested.
+        """
+        if not 0 <= index < self.pool_size:
+            raise ValueError(
+                f"Pool operator index must be between 0 and {self.pool_size - 1}, "
+                f"got {index}."
+            )
+        self._selected_operators.append(int(index))
+
+    def _build_block(self, operator_index: int, param) -> Circuit:
+        return exponentiate_fermion_operator(
+            _scale_fermion_operator(self._get_pool()[operator_index], param),
+            self._transformation,
+            self.number_of_qubits,
+        )
+
+    def _build_hartree_fock_circuit(self) -> Circuit:
+        return build_hartree_fock_circuit(
+            self.number_of_qubits,
+            self._number_of_alpha_electrons,
+            self._number_of_alpha_electrons,
+            self._transformation,
+        )
+
+    @overrides
+    def _generate_circuit(self, params: Optional[np.ndarray] = None) -> Circuit:
+        """
+        Returns a parametrizable circuit represention of the ansatz.
+        Args:
+            params: parameters of the circuit.
+        """
+        if params is not None:
+            circuit = self._build_hartree_fock_circuit()
+            for operator_index, param in zip(self._selected_operators, params):
+                circuit += self._build_block(operator_index, param)
+            return circuit
+
+        # Only blocks of operators selected since the last call are built
+        if self._prefix_circuit is None:
+            self._prefix_circuit = self._build_hartree_fock_circuit()
+        symbols = self.symbols
+        while self._number_of_prefix_blocks < len(self._selected_operators):
+            position = self._number_of_prefix_blocks
+            self._prefix_circuit += self._build_block(
+                self._selected_operators[position], symbols[position]
+            )
+            self._number_of_prefix_blocks += 1
+        return self._prefix_circuit
+
+    def _get_operator_rotations(
+        self, operator_index: int
+    ) -> Tuple[List[PauliTerm], np.ndarray]:
+        """Pauli strings and angles per unit parameter of the rotations
+        implementing the block of a pool operator."""
+        if operator_index not in self._pool_rotations:
+            symbol = sympy.Symbol("theta")
+            pauli_terms, coefficients, _ = get_pauli_rotations(
+                _scale_fermion_operator(self._get_pool()[operator_index], symbol),
+                [symbol],
+                self._transformation,
+                self.number_of_qubits,
+            )
+            self._pool_rotations[operator_index] = (
+                pauli_terms,
+                coefficients.toarray().ravel(),
+            )
+        return self._pool_rotations[operator_index]
+
+    def get_statevector(self, params: np.ndarray) -> np.ndarray:
+        """Simulates the ansatz circuit as a statevector in big-endian ordering.
+
+        Args:
+            params: parameters of the circuit.
+        """
+        params = np.asarray(params, dtype=float)
+        if params.shape != (self.number_of_params,):
+            raise ValueError(
+                f"Expected {self.number_of_params} parameters, got {params.shape}."
+            )
+        bitstring = get_hartree_fock_bitstrings(
+            self.number_of_qubits,
+            self._number_of_alpha_electrons,
+            self._number_of_alpha_electrons,
+            self._transformation,
+        )
+        statevector = np.zeros(2**self.number_of_qubits, dtype=np.complex128)
+        statevector[int("".join(map(str, bitstring)), 2)] = 1.0
+        for operator_index, param in zip(self._selected_operators, params):
+            pauli_terms, angles = self._get_operator_rotations(operator_index)
+            for pauli_term, angle in zip(pauli_terms, param * angles):
+                apply_pauli_rotation(
+                    statevector, self.number_of_qubits, pauli_term, angle
+                )
+        return statevector
+
+    def compute_pool_gradients(
+        self, params: np.ndarray, qubit_hamiltonian: QubitOperator
+    ) -> np.ndarray:
+        """Computes energy gradients of appending each pool operator.
+
+        Entry k is the derivative of the energy with respect to the parameter of
+        pool operator k appended to the current ansatz, at parameter 0. All
+        gradients are obtained in one pass: every distinct Pauli string of the
+        pool is applied to the state once, and the results are combined with the
+        sparse (Pauli strings x pool operators) coefficient matrix.
+
+        Args:
+            params: current parameters of the ansatz.
+            qubit_hamiltonian: Hamiltonian whose expectation value is minimized.
+        """
+        if self._pool_gradient_rotations is None:
+            pool_symbols = [sympy.Symbol(f"t_{k}") for k in range(self.pool_size)]
+            pauli_terms, coefficients, _ = get_pauli_rotations(
+                uccsd_singlet_generator(
+                    np.asarray(pool_symbols),
+                    self.number_of_qubits,
+                    self.number_of_electrons,
+                    anti_hermitian=True,
+                ),
+                pool_symbols,
+                self._transformation,
+                self.number_of_qubits,
+            )
+            self._pool_gradient_rotations = (pauli_terms, coefficients.tocsc())
+        pauli_terms, coefficients = self._pool_gradient_rotations
+
+        n_qubits = self.number_of_qubits
+        statevector = self.get_statevector(params)
+        hamiltonian_statevector = apply_qubit_operator(
+            qubit_hamiltonian, statevector, n_qubits
+        )
+        # dE/d(angle) = Im <H psi|P|psi> for exp(-i angle P / 2)
+        angle_gradients = np.array(
+            [
+                np.vdot(
+                    hamiltonian_statevector,
+                    apply_pauli_string(statevector, n_qubits, pauli_term),
+                ).imag
+                for pauli_term in pauli_terms
+            ]
+        )
+        return coefficients.T @ angle_gradients
+
+    def grow(
+        self,
+        params: np.ndarray,
+        qubit_hamiltonian: QubitOperator,
+        gradient_threshold: float = 1e-3,
+    ) -> Optional[int]:
+        """Appends the pool operator with the largest energy gradient magnitude.
+
+        Args:
+            params: current parameters of the ansatz. The parameter of the new
+                operator should be initialized to 0.
+            qubit_hamiltonian: Hamiltonian whose expectation value is minimized.
+            gradient_threshold: no operator is appended if all gradient
+                magnitudes are below this value.
+
+        Returns:
+            index of the appended pool operator, or None if the ansatz converged.
+        """
+        gradients = self.compute_pool_gradients(params, qubit_hamiltonian)
+        operator_index = int(np.argmax(np.abs(gradients)))
+        if abs(gradients[operator_index]) < gradient_threshold:
+            return None
+        self.append_operator(operator_index)
+        return operator_index
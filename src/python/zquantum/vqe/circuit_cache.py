@@ -0,0 +1,340 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Persistent on-disk cache of parametrized ansatz circuits.
+
+Each cached circuit is stored in its own directory as a small JSON header and a
+few flat NumPy arrays, which are memory-mapped on load:
+
+    opcodes             index of each operation's gate in the header's gate list
+    qubit_offsets       operation i acts on qubits[qubit_offsets[i]:qubit_offsets[i+1]]
+    qubits
+    param_offsets       operation i has params param_offsets[i]:param_offsets[i+1]
+    param_constants     constant part of each gate parameter
+    coefficient_indptr  CSR table of coefficients of symbols in each gate parameter
+    coefficient_indices
+    coefficient_values
+
+Only gates with parameters linear in the ansatz symbols can be stored. A loaded
+entry is a `CachedCircuitTemplate`, which takes the linear forms of the gate
+parameters directly from the arrays; symbolic gate parameters are created only
+when its parametrized circuit is requested.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import sympy
+from scipy.sparse import csr_matrix
+from zquantum.core.circuits import Circuit
+
+from .common import split_linear_expression
+from .gates import FIXED_GATES, PARAMETRIZED_GATES
+from .templates import LinearCircuitTemplate
+
+_FORMAT_VERSION = 1
+
+_ARRAY_NAMES = [
+    "opcodes",
+    "qubit_offsets",
+    "qubits",
+    "param_offsets",
+    "param_constants",
+    "coefficient_indptr",
+    "coefficient_indices",
+    "coefficient_values",
+]
+
+
+def _get_library_versions() -> Dict[str, str]:
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:  # Python < 3.8
+        return {}
+
+    versions = {}
+    for package in ["z-quantum-vqe", "z-quantum-core"]:
+        try:
+            versions[package] = version(package)
+        except PackageNotFoundError:
+            versions[package] = "unknown"
+    return versions
+
+
+def _encode_circuit(
+    circuit: Circuit, symbols: Sequence[sympy.Symbol]
+) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """Gate names indexed by opcodes and arrays describing the circuit."""
+    symbol_indices = {symbol: index for index, symbol in enumerate(symbols)}
+    gate_names: List[str] = []
+    arrays: Dict[str, List[Any]] = {name: [] for name in _ARRAY_NAMES}
+    arrays["qubit_offsets"].append(0)
+    arrays["param_offsets"].append(0)
+    arrays["coefficient_indptr"].append(0)
+    for operation in circuit.operations:
+        name = operation.gate.name
+        if name not in FIXED_GATES and name not in PARAMETRIZED_GATES:
+            raise ValueError(f"Gate {name} is not supported by the circuit cache.")
+        if name not in gate_names:
+            gate_names.append(name)
+        arrays["opcodes"].append(gate_names.index(name))
+        arrays["qubits"] += operation.qubit_indices
+        arrays["qubit_offsets"].append(len(arrays["qubits"]))
+        for param in operation.params:
+            if isinstance(param, sympy.Expr) and param.free_symbols:
+                coefficients, offset = split_linear_expression(param, symbol_indices)
+            else:
+                coefficients, offset = {}, float(param)
+            arrays["param_constants"].append(offset)
+            arrays["coefficient_indices"] += coefficients.keys()
+            arrays["coefficient_values"] += coefficients.values()
+            arrays["coefficient_indptr"].append(len(arrays["coefficient_indices"]))
+        arrays["param_offsets"].append(len(arrays["param_constants"]))
+
+    dtypes = {"param_constants": np.float64, "coefficient_values": np.float64}
+    return gate_names, {
+        name: np.asarray(values, dtype=dtypes.get(name, np.int64))
+        for name, values in arrays.items()
+    }
+
+
+def _get_symbolic_gate_parameters(
+    arrays: Dict[str, np.ndarray], symbols: Sequence[sympy.Symbol]
+) -> List[Any]:
+    param_constants = arrays["param_constants"].tolist()
+    coefficient_indptr = arrays["coefficient_indptr"].tolist()
+    coefficient_indices = arrays["coefficient_indices"].tolist()
+    coefficient_values = arrays["coefficient_values"].tolist()
+
+    params: List[Any] = []
+    for slot, constant in enumerate(param_constants):
+        start, stop = coefficient_indptr[slot], coefficient_indptr[slot + 1]
+        if start == stop:
+            params.append(constant)
+            continue
+        terms = [
+            coefficient_values[position] * symbols[coefficient_indices[position]]
+            for position in range(start, stop)
+        ]
+        if constant != 0:
+            terms.append(constant)
+        params.append(sympy.Add(*terms))
+    return params
+
+
+def _decode_circuit(
+    arrays: Dict[str, np.ndarray],
+    gate_names: List[str],
+    number_of_qubits: int,
+    params: Sequence[Any],
+) -> Circuit:
+    """Circuit described by the arrays, with the given values of all gate
+    parameters, in the order of `param_constants`."""
+    qubit_offsets = arrays["qubit_offsets"].tolist()
+    qubits = arrays["qubits"].tolist()
+    param_offsets = arrays["param_offsets"].tolist()
+
+    operations = []
+    for index, opcode in enumerate(arrays["opcodes"].tolist()):
+        name = gate_names[opcode]
+        operation_qubits = qubits[qubit_offsets[index] : qubit_offsets[index + 1]]
+        if name in FIXED_GATES:
+            operations.append(FIXED_GATES[name](*operation_qubits))
+        else:
+            operation_params = params[param_offsets[index] : param_offsets[index + 1]]
+            operations.append(
+                PARAMETRIZED_GATES[name](*operation_params)(*operation_qubits)
+            )
+    return Circuit(operations, n_qubits=number_of_qubits)
+
+
+class CachedCircuitTemplate(LinearCircuitTemplate):
+    def __init__(
+        self,
+        arrays: Dict[str, np.ndarray],
+        gate_names: List[str],
+        number_of_qubits: int,
+        symbols: Sequence[sympy.Symbol],
+    ):
+        """Template of a cached circuit, read directly from its arrays.
+
+        Coefficients and offsets of the gate parameters are taken from the stored
+        CSR table and executable circuits are built from the arrays, so no
+        symbolic expressions are created unless `circuit` is accessed.
+
+        Args:
+            arrays: arrays of the cache entry, see module docstring.
+            gate_names: gate names indexed by opcodes.
+            number_of_qubits: number of qubits of the circuit.
+            symbols: symbols of the circuit, in the order used when saving it.
+        """
+        self.symbols = list(symbols)
+        self._arrays = arrays
+        self._gate_names = gate_names
+        self._number_of_qubits = number_of_qubits
+        self._circuit: Optional[Circuit] = None
+
+        param_constants = np.asarray(arrays["param_constants"], dtype=float)
+        coefficient_indptr = np.asarray(arrays["coefficient_indptr"])
+        coefficients = csr_matrix(
+            (
+                np.asarray(arrays["coefficient_values"]),
+                np.asarray(arrays["coefficient_indices"]),
+                coefficient_indptr,
+            ),
+            shape=(len(param_constants), len(self.symbols)),
+        )
+        # Gate parameters depending on symbols
+        self._symbolic_params = np.flatnonzero(np.diff(coefficient_indptr))
+        self.coefficients = coefficients[self._symbolic_params]
+        self.offsets = param_constants[self._symbolic_params]
+
+        param_offsets = np.asarray(arrays["param_offsets"])
+        operation_indices = (
+            np.searchsorted(param_offsets, self._symbolic_params, side="right") - 1
+        )
+        self._slots = list(
+            zip(
+                operation_indices.tolist(),
+                (self._symbolic_params - param_offsets[operation_indices]).tolist(),
+            )
+        )
+
+    @property  # type: ignore
+    def circuit(self) -> Circuit:
+        """Parametrized circuit, created on first access."""
+        if self._circuit is None:
+            self._circuit = _decode_circuit(
+                self._arrays,
+                self._gate_names,
+                self._number_of_qubits,
+                _get_symbolic_gate_parameters(self._arrays, self.symbols),
+            )
+        return self._circuit
+
+    def _build_circuit(self, gate_parameters: np.ndarray) -> Circuit:
+        params = np.array(self._arrays["param_constants"], dtype=float)
+        params[self._symbolic_params] = gate_parameters
+        return _decode_circuit(
+            self._arrays, self._gate_names, self._number_of_qubits, params.tolist()
+        )
+
+
+class CircuitCache:
+    def __init__(self, directory: str):
+        """Persistent cache of parametrized circuits, shared between processes.
+
+        Entries are keyed by `get_key`, which includes the versions of the
+        installed libraries, so entries from other versions are never reused.
+        Entries are written atomically, so concurrent processes may share the
+        directory.
+
+        Args:
+            directory: directory in which the cached circuits are stored. It is
+                created if it doesn't exist.
+
+        Attributes:
+            directory: See Args
+        """
+        self.directory = directory
+
+    @staticmethod
+    def get_key(ansatz_class: type, arguments: Dict[str, Any]) -> str:
+        """Key of the parametrized circuit of an ansatz.
+
+        Args:
+            ansatz_class: class of the ansatz.
+            arguments: JSON-serializable arguments determining the circuit, e.g.
+                constructor arguments and transformation.
+        """
+        description = json.dumps(
+            {
+                "ansatz": f"{ansatz_class.__module__}.{ansatz_class.__qualname__}",
+                "arguments": arguments,
+                "versions": _get_library_versions(),
+                "format": _FORMAT_VERSION,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def _entry_directory(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def load(self, key: str, symbols: Sequence[sympy.Symbol]) -> Optional[Circuit]:
+        """Load circuit stored under the key, or return None if there is none.
+
+        Args:
+            key: key of the circuit.
+            symbols: symbols of the circuit, in the order used when saving it.
+        """
+        template = self.load_template(key, symbols)
+        return None if template is None else template.circuit
+
+    def load_template(
+        self, key: str, symbols: Sequence[sympy.Symbol]
+    ) -> Optional[CachedCircuitTemplate]:
+        """Load template of the circuit stored under the key, or return None if
+        there is none. The arrays of the entry are memory-mapped.
+
+        Args:
+            key: key of the circuit.
+            symbols: symbols of the circuit, in the order used when saving it.
+        """
+        entry_directory = self._entry_directory(key)
+        try:
+            with open(os.path.join(entry_directory, "header.json")) as f:
+                header = json.load(f)
+        except FileNotFoundError:
+            return None
+        if header["symbols"] != [str(symbol) for symbol in symbols]:
+            raise ValueError(
+                f"Symbols {symbols} don't match symbols of cached circuit {key}."
+            )
+        arrays = {
+            name: np.load(os.path.join(entry_directory, f"{name}.npy"), mmap_mode="r")
+            for name in _ARRAY_NAMES
+        }
+        return CachedCircuitTemplate(
+            arrays, header["gate_names"], header["number_of_qubits"], symbols
+        )
+
+    def save(self, key: str, circuit: Circuit, symbols: Sequence[sympy.Symbol]) -> None:
+        """Store circuit under the key. Existing entries are kept.
+
+        Args:
+            key: key of the circuit.
+            circuit: circuit whose gate parameters are linear in the symbols.
+            symbols: symbols of the circuit.
+        """
+        entry_directory = self._entry_directory(key)
+        if os.path.exists(entry_directory):
+            return
+        gate_names, arrays = _encode_circuit(circuit, symbols)
+        os.makedirs(self.directory, exist_ok=True)
+        temporary_directory = tempfile.mkdtemp(dir=self.directory, prefix=".tmp-")
+        try:
+            for name in _ARRAY_NAMES:
+                np.save(os.path.join(temporary_directory, f"{name}.npy"), arrays[name])
+            with open(os.path.join(temporary_directory, "header.json"), "w") as f:
+                json.dump(
+                    {
+                        "format": _FORMAT_VERSION,
+                        "gate_names": gate_names,
+                        "number_of_qubits": circuit.n_qubits,
+                        "symbols": [str(symbol) for symbol in symbols],
+                    },
+                    f,
+                )
+            os.rename(temporary_directory, entry_directory)
+        except OSError:
+            # Entry was stored concurrently by another process
+            if not os.path.exists(entry_directory):
+                raise
+        finally:
+            shutil.rmtree(temporary_directory, ignore_errors=True)
@@ -0,0 +1,136 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import sympy
+from zquantum.core.circuits import Circuit
+from zquantum.core.openfermion import QubitOperator
+
+from .statevector import PauliTerm
+
+_SELF_INVERSE_GATES = {"I", "X", "Y", "Z", "H", "CNOT", "CZ", "SWAP"}
+_MERGEABLE_ROTATIONS = {"RX", "RY", "RZ"}
+_ANGLE_TOLERANCE = 1e-10
+
+
+class CircuitCost(NamedTuple):
+    """Gate counts driving both simulation time and hardware fidelity."""
+
+    number_of_gates: int
+    cnot_count: int
+    depth: int
+
+
+def get_circuit_cost(circuit: Circuit) -> CircuitCost:
+    """Counts gates and CNOTs and computes the depth of the circuit."""
+    qubit_depths: Dict[int, int] = {}
+    cnot_count = 0
+    for operation in circuit.operations:
+        layer = 1 + max(
+            (qubit_depths.get(qubit, 0) for qubit in operation.qubit_indices),
+            default=0,
+        )
+        for qubit in operation.qubit_indices:
+            qubit_depths[qubit] = layer
+        cnot_count += operation.gate.name == "CNOT"
+    return CircuitCost(
+        len(circuit.operations), cnot_count, max(qubit_depths.values(), default=0)
+    )
+
+
+def _commute(first_term: PauliTerm, second_term: PauliTerm) -> bool:
+    second_paulis = dict(second_term)
+    anticommuting_positions = sum(
+        qubit in second_paulis and second_paulis[qubit] != pauli
+        for qubit, pauli in first_term
+    )
+    return anticommuting_positions % 2 == 0
+
+
+def order_commuting_pauli_terms(qubit_operator: QubitOperator) -> QubitOperator:
+    """Reorder terms to maximize basis changes and CNOT ladders shared between
+    consecutive Pauli exponentials.
+
+    Terms are only moved within blocks of consecutive, mutually commuting terms,
+    so the product of their exponentials stays exactly the same. Within a block,
+    terms acting on the same qubits are placed next to each other.
+    """
+    blocks: List[List[PauliTerm]] = []
+    for term in qubit_operator.terms:
+        if blocks and all(_commute(term, other) for other in blocks[-1]):
+            blocks[-1].append(term)
+        else:
+            blocks.append([term])
+
+    ordered_operator = QubitOperator()
+    for block in blocks:
+        for term in sorted(
+            block,
+            key=lambda term: (
+                tuple(qubit for qubit, _ in term),
+                tuple(pauli for _, pauli in term),
+            ),
+        ):
+            ordered_operator.terms[term] = qubit_operator.terms[term]
+    return ordered_operator
+
+
+def _is_zero_angle(angle) -> bool:
+    if isinstance(angle, sympy.Expr) and angle.free_symbols:
+        return sympy.expand(angle) == 0
+    return abs(complex(angle)) < _ANGLE_TOLERANCE
+
+
+def cancel_redundant_gates(circuit: Circuit) -> Circuit:
+    """Peephole pass removing pairs of self-inverse gates and merging rotations.
+
+    Two gates are combined when they act on the same qubits and no other gate
+    acts on any of those qubits in between. Consecutive CNOT/H/X/... pairs are
+    removed, consecutive RX/RY/RZ rotations are merged into one rotation and
+    removed if the resulting angle vanishes. Removals can cascade, e.g. once
+    matching basis changes of two Pauli exponentials cancel, the CNOT ladders
+    between them cancel as well.
+    """
+    operations: List[Optional[Any]] = []
+    # Indices (in operations) of the not-removed operations acting on each qubit
+    qubit_stacks: Dict[int, List[int]] = {}
+
+    def _remove(index: int) -> None:
+        for qubit in operations[index].qubit_indices:
+            qubit_stacks[qubit].pop()
+        operations[index] = None
+
+    def _append(operation) -> None:
+        for qubit in operation.qubit_indices:
+            qubit_stacks.setdefault(qubit, []).append(len(operations))
+        operations.append(operation)
+
+    for operation in circuit.operations:
+        previous_indices = {
+            qubit_stacks[qubit][-1] if qubit_stacks.get(qubit) else None
+            for qubit in operation.qubit_indices
+        }
+        previous_index = previous_indices.pop() if len(previous_indices) == 1 else None
+        if previous_index is not None:
+            previous_operation = operations[previous_index]
+            name = operation.gate.name
+            if (
+                previous_operation.qubit_indices == operation.qubit_indices
+                and previous_operation.gate.name == name
+            ):
+                if name in _SELF_INVERSE_GATES:
+                    _remove(previous_index)
+                    continue
+                if name in _MERGEABLE_ROTATIONS:
+                    angle = previous_operation.params[0] + operation.params[0]
+                    _remove(previous_index)
+                    if not _is_zero_angle(angle):
+                        _append(operation.replace_params((angle,)))
+                    continue
+        _append(operation)
+
+    return Circuit(
+        [operation for operation in operations if operation is not None],
+        n_qubits=circuit.n_qubits,
+    )
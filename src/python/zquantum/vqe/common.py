@@ -0,0 +1,101 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Helpers shared by the ansatzes, circuit builders and simulators of this
+package: linear forms of symbolic coefficients, fermionic excitation terms and
+bit parities."""
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+import sympy
+from zquantum.core.openfermion import (
+    FermionOperator,
+    uccsd_singlet_generator,
+    uccsd_singlet_paramsize,
+)
+
+FermionTerm = Tuple[Tuple[int, int], ...]
+
+
+def split_linear_expression(
+    expression: sympy.Expr,
+    symbol_indices: Dict[sympy.Symbol, int],
+    number_type: Callable = float,
+) -> Tuple[Dict[int, Any], Any]:
+    """Split expression linear in the given symbols into coefficients and offset.
+
+    Args:
+        expression: expression to split.
+        symbol_indices: mapping of symbols to their position in parameter vector.
+        number_type: type to which coefficients are converted, float or complex.
+
+    Returns:
+        mapping from parameter index to its coefficient and the constant offset.
+
+    Raises:
+        ValueError: if the expression is not linear in the symbols.
+    """
+    coefficients: Dict[int, Any] = {}
+    offset = number_type(0)
+    for term, coefficient in sympy.expand(expression).as_coefficients_dict().items():
+        factors = sympy.Mul.make_args(term)
+        if sympy.I in factors:
+            coefficient = sympy.I * coefficient
+            term = sympy.Mul(*(factor for factor in factors if factor != sympy.I))
+        if term == 1:
+            offset += number_type(coefficient)
+        elif term in symbol_indices:
+            index = symbol_indices[term]
+            coefficients[index] = coefficients.get(index, 0) + number_type(coefficient)
+        else:
+            raise ValueError(
+                f"Gate parameter {expression} is not linear in the ansatz symbols."
+            )
+    return coefficients, offset
+
+
+def bit_parity(values: np.ndarray) -> np.ndarray:
+    """Parity of the number of set bits of each (non-negative) value."""
+    values = values.copy()
+    for shift in (32, 16, 8, 4, 2, 1):
+        values ^= values >> shift
+    return values & 1
+
+
+def hermitian_conjugate_term(term: FermionTerm) -> FermionTerm:
+    """Product of ladder operators of the hermitian conjugate of a term."""
+    return tuple((orbital, 1 - action) for orbital, action in reversed(term))
+
+
+def get_excitation_generator(term: FermionTerm, coefficient) -> FermionOperator:
+    """Anti-hermitian generator coefficient * (T - T^dagger) of a single excitation."""
+    return FermionOperator(term, coefficient) + FermionOperator(
+        hermitian_conjugate_term(term), -coefficient
+    )
+
+
+@lru_cache(maxsize=64)
+def get_uccsd_parameter_indices(
+    number_of_qubits: int, number_of_electrons: int
+) -> Dict[FermionTerm, int]:
+    """Table mapping excitation terms of the singlet UCCSD generator to the index
+    of the parameter they are multiplied by. The returned dict is shared between
+    calls and must not be modified."""
+    symbols = [
+        sympy.Symbol("theta_{}".format(i))
+        for i in range(uccsd_singlet_paramsize(number_of_qubits, number_of_electrons))
+    ]
+    symbol_indices = {symbol: index for index, symbol in enumerate(symbols)}
+    fermion_generator = uccsd_singlet_generator(
+        np.asarray(symbols), number_of_qubits, number_of_electrons
+    )
+    parameter_indices = {}
+    for term, coefficient in fermion_generator.terms.items():
+        coefficients, offset = split_linear_expression(coefficient, symbol_indices)
+        if offset == 0 and len(coefficients) == 1:
+            ((index, value),) = coefficients.items()
+            if value == 1:
+                parameter_indices[term] = index
+    return parameter_indices
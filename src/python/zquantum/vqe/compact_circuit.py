@@ -0,0 +1,135 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Array-backed representation of circuits with a regular gate structure.
+
+A `CompactCircuit` stores each operation as a row of a few flat arrays instead
+of a Python gate object, which takes tens of bytes per gate instead of hundreds
+and can be saved or loaded as a whole with NumPy.
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+import sympy
+from zquantum.core.circuits import Circuit
+
+from .gates import FIXED_GATES, PARAMETRIZED_GATES
+
+
+class CompactCircuit:
+    def __init__(
+        self,
+        number_of_qubits: int,
+        gate_names: Sequence[str],
+        opcodes: np.ndarray,
+        qubits: np.ndarray,
+        parameter_indices: np.ndarray,
+        angles: np.ndarray,
+    ):
+        """Circuit of one- and two-qubit gates stored as structure of arrays.
+
+        Operation i applies gate gate_names[opcodes[i]] to qubits[i], where the
+        second qubit is -1 for single-qubit gates. Parametrized gates use the
+        parameter parameter_indices[i] as their angle, or the fixed angle
+        angles[i] if the index is -1.
+
+        Args:
+            number_of_qubits: number of qubits of the circuit.
+            gate_names: names of the gates indexed by opcodes.
+            opcodes: index of the gate of each operation.
+            qubits: (number of operations, 2) array of qubits of each operation.
+            parameter_indices: index of the parameter of each operation.
+            angles: fixed angle of each operation.
+
+        Attributes:
+            number_of_qubits: See Args
+            gate_names: See Args
+            opcodes: See Args
+            qubits: See Args
+            parameter_indices: See Args
+            angles: See Args
+            number_of_params: number of parameters of the circuit.
+        """
+        for name in gate_names:
+            if name not in FIXED_GATES and name not in PARAMETRIZED_GATES:
+                raise ValueError(f"Gate {name} is not supported by CompactCircuit.")
+        self.number_of_qubits = number_of_qubits
+        self.gate_names = list(gate_names)
+        self.opcodes = np.asarray(opcodes, dtype=np.uint8)
+        self.qubits = np.asarray(qubits, dtype=np.int32)
+        self.parameter_indices = np.asarray(parameter_indices, dtype=np.int32)
+        self.angles = np.asarray(angles, dtype=np.float64)
+        self.number_of_params = int(self.parameter_indices.max(initial=-1)) + 1
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory taken by the arrays of the circuit, in bytes."""
+        return (
+            self.opcodes.nbytes
+            + self.qubits.nbytes
+            + self.parameter_indices.nbytes
+            + self.angles.nbytes
+        )
+
+    def to_circuit(self, params: Optional[Sequence] = None) -> Circuit:
+        """Convert to `Circuit`.
+
+        Args:
+            params: values (or symbols) of the parameters. Defaults to symbols
+                theta_0, theta_1, ...
+        """
+        if params is None:
+            params = [
+                sympy.Symbol("theta_{}".format(i)) for i in range(self.number_of_params)
+            ]
+        if len(params) != self.number_of_params:
+            raise ValueError(
+                f"Expected {self.number_of_params} parameters, got {len(params)}."
+            )
+        params = list(params)
+        angles = self.angles.tolist()
+
+        operations: List = []
+        for opcode, (first_qubit, second_qubit), parameter_index, angle in zip(
+            self.opcodes.tolist(),
+            self.qubits.tolist(),
+            self.parameter_indices.tolist(),
+            angles,
+        ):
+            name = self.gate_names[opcode]
+            qubit_indices = (
+                (first_qubit,) if second_qubit < 0 else (first_qubit, second_qubit)
+            )
+            if name in FIXED_GATES:
+                operations.append(FIXED_GATES[name](*qubit_indices))
+            else:
+                gate_angle = params[parameter_index] if parameter_index >= 0 else angle
+                operations.append(PARAMETRIZED_GATES[name](gate_angle)(*qubit_indices))
+        return Circuit(operations, n_qubits=self.number_of_qubits)
+
+    def save(self, filename: str) -> None:
+        np.savez(
+            filename,
+            number_of_qubits=self.number_of_qubits,
+            gate_names=np.asarray(self.gate_names),
+            opcodes=self.opcodes,
+            qubits=self.qubits,
+            parameter_indices=self.parameter_indices,
+            angles=self.angles,
+        )
+
+    @classmethod
+    def load(cls, filename: str) -> "CompactCircuit":
+        with np.load(filename) as data:
+            return cls(
+                int(data["number_of_qubits"]),
+                data["gate_names"].tolist(),
+                data["opcodes"],
+                data["qubits"],
+                data["parameter_indices"],
+                data["angles"],
+            )
@@ -0,0 +1,418 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Low-rank double-factorized singlet UCCSD.
+
+Double excitations of the singlet UCCSD generator are T2 = 1/2 sum_PQ M_PQ E_P E_Q,
+where P = (a, i) runs over pairs of virtual and occupied spatial orbitals and
+E_ai = sum_sigma a_{a sigma}^dagger a_{i sigma}. With the eigendecomposition
+M = sum_l lambda_l v_l v_l^T and O_l = sum_P v_lP E_P,
+
+    T2 - T2^dagger = 1/2 sum_l lambda_l (O_l^2 - O_l^dagger^2)
+                   = i/2 sum_l lambda_l ((A_l + B_l)^2 - (A_l - B_l)^2),
+
+with hermitian one-body operators A_l = (O_l + O_l^dagger) / 2 and
+B_l = (O_l - O_l^dagger) / 2i. A hermitian one-body operator C = sum_pq h_pq E_pq
+with h = U diag(eps) U^dagger is the orbital rotation by U of sum_k eps_k n_k, so
+exp(i t C^2) is an orbital rotation, a diagonal evolution of Z and ZZ terms and
+the inverse rotation. Each factor takes O(N^2) gates for N spatial orbitals, so
+keeping only the factors with the largest |lambda_l| trades accuracy for depth.
+"""
+
+from itertools import combinations, product
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import sympy
+from overrides import overrides
+from zquantum.core.circuits import Circuit
+from zquantum.core.interfaces.ansatz import Ansatz
+from zquantum.core.interfaces.ansatz_utils import (
+    ansatz_property,
+    invalidates_parametrized_circuit,
+)
+from zquantum.core.openfermion import FermionOperator
+
+from .common import get_excitation_generator, get_uccsd_parameter_indices
+from .utils import build_hartree_fock_circuit, exponentiate_fermion_operator
+
+_EQ_TOLERANCE = 1e-8
+
+
+def _get_singlet_uccsd_excitations(
+    number_of_spatial_orbitals: int, number_of_alpha_electrons: int
+) -> Tuple[
+    List[Tuple[Tuple[int, int], int]],
+    List[Tuple[Tuple[int, int], Tuple[int, int], int]],
+]:
+    """Spatial orbital pairs (virtual, occupied) of the single excitations and of
+    the double excitations E_P E_Q of the singlet UCCSD generator, each with the
+    index of its amplitude in the UCCSD parameter vector."""
+    singles = []
+    doubles = []
+    for term, index in get_uccsd_parameter_indices(
+        2 * number_of_spatial_orbitals, 2 * number_of_alpha_electrons
+    ).items():
+        orbitals = [orbital for orbital, _ in term]
+        spins = [orbital % 2 for orbital in orbitals]
+        spatial_orbitals = [orbital // 2 for orbital in orbitals]
+        # Every excitation appears with the first pair of operators acting on
+        # alpha spin-orbitals and the second one on beta spin-orbitals
+        if len(term) == 2 and spins == [0, 0]:
+            singles.append(((spatial_orbitals[0], spatial_orbitals[1]), index))
+        elif len(term) == 4 and spins == [0, 0, 1, 1]:
+            doubles.append(
+                (
+                    (spatial_orbitals[0], spatial_orbitals[1]),
+                    (spatial_orbitals[2], spatial_orbitals[3]),
+                    index,
+                )
+            )
+    return sorted(singles, key=lambda single: single[1]), doubles
+
+
+def get_double_amplitudes_matrix(
+    amplitudes: np.ndarray,
+    number_of_spatial_orbitals: int,
+    number_of_alpha_electrons: int,
+) -> Tuple[np.ndarray, List[Tuple[int, int]]]:
+    """Computes the symmetric matrix M of double excitation amplitudes of singlet
+    UCCSD, such that T2 = 1/2 sum_PQ M_PQ E_P E_Q.
+
+    Args:
+        amplitudes: singlet UCCSD parameter vector, e.g. from
+            `SingletUCCSDAnsatz.compute_uccsd_vector_from_fermion_generator`.
+        number_of_spatial_orbitals: number of spatial orbitals.
+        number_of_alpha_electrons: number of alpha electrons.
+
+    Returns:
+        matrix M and pairs (virtual, occupied) of spatial orbitals indexing it.
+    """
+    pairs = list(
+        product(
+            range(number_of_alpha_electrons, number_of_spatial_orbitals),
+            range(number_of_alpha_electrons),
+        )
+    )
+    pair_indices = {pair: index for index, pair in enumerate(pairs)}
+    matrix = np.zeros((len(pairs), len(pairs)))
+    _, doubles = _get_singlet_uccsd_excitations(
+        number_of_spatial_orbitals, number_of_alpha_electrons
+    )
+    for first_pair, second_pair, index in doubles:
+        row, column = pair_indices[first_pair], pair_indices[second_pair]
+        if row == column:
+            # E_P^2 contains each excitation of the pair twice
+            matrix[row, row] = 2 * amplitudes[index]
+        else:
+            matrix[row, column] = matrix[column, row] = amplitudes[index]
+    return matrix, pairs
+
+
+def double_factorize(
+    amplitudes_matrix: np.ndarray, rank: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Truncated eigendecomposition of a symmetric matrix of double amplitudes.
+
+    Args:
+        amplitudes_matrix: matrix M, see `get_double_amplitudes_matrix`.
+        rank: number of factors to keep. Defaults to all factors with nonzero
+            eigenvalue.
+
+    Returns:
+        eigenvalues sorted by decreasing magnitude, eigenvectors as columns and
+        the truncation error, i.e. the Frobenius norm of M minus its truncation.
+    """
+    eigenvalues, eigenvectors = np.linalg.eigh(amplitudes_matrix)
+    order = np.argsort(-np.abs(eigenvalues), kind="stable")
+    eigenvalues, eigenvectors = eigenvalues[order], eigenvectors[:, order]
+    if rank is None:
+        rank = int(np.sum(np.abs(eigenvalues) > _EQ_TOLERANCE))
+    return (
+        eigenvalues[:rank],
+        eigenvectors[:, :rank],
+        float(np.linalg.norm(eigenvalues[rank:])),
+    )
+
+
+def _get_one_body_generator(entries: Dict[Tuple[int, int], complex]) -> FermionOperator:
+    """sum_pq kappa_pq E_pq for the given entries of kappa."""
+    generator = FermionOperator()
+    for (p, q), value in entries.items():
+        for spin in (0, 1):
+            generator += FermionOperator(((2 * p + spin, 1), (2 * q + spin, 0)), value)
+    return generator
+
+
+def _get_orbital_rotation_generators(unitary: np.ndarray) -> List[FermionOperator]:
+    """Decomposes the rotation of spatial orbitals a_k^dagger -> sum_p
+    unitary[p, k] a_p^dagger into exponentials of one-body generators.
+
+    The unitary is reduced to a diagonal by Givens rotations of adjacent rows,
+    each preceded by a phase aligning the two entries, so every generator is a
+    single real rotation or phase acting on both spins and its Pauli terms
+    commute.
+
+    Returns:
+        generators G_j such that the rotation is exp(G_m) ... exp(G_1).
+    """
+    matrix = np.array(unitary, dtype=complex)
+    size = len(matrix)
+    # Factors (phase, rotation)^dagger of the reduction, in matrix product order
+    inverse_factors = []
+    for column in range(size - 1):
+        for row in range(size - 1, column, -1):
+            first, second = matrix[row - 1, column], matrix[row, column]
+            if abs(second) <= _EQ_TOLERANCE:
+                continue
+            phase = (
+                np.angle(first) - np.angle(second)
+                if abs(first) > _EQ_TOLERANCE
+                else 0.0
+            )
+            angle = np.arctan2(abs(second), abs(first))
+            matrix[row] *= np.exp(1j * phase)
+            cosine, sine = np.cos(angle), np.sin(angle)
+            matrix[[row - 1, row]] = (
+                np.array([[cosine, sine], [-sine, cosine]]) @ matrix[[row - 1, row]]
+            )
+            if abs(phase) > _EQ_TOLERANCE:
+                inverse_factors.append(
+                    _get_one_body_generator({(row, row): -1j * phase})
+                )
+            inverse_factors.append(
+                _get_one_body_generator({(row - 1, row): -angle, (row, row - 1): angle})
+            )
+
+    phases = np.angle(np.diag(matrix))
+    diagonal_entries = {
+        (index, index): 1j * phase
+        for index, phase in enumerate(phases)
+        if abs(phase) > _EQ_TOLERANCE
+    }
+    generators = [_get_one_body_generator(diagonal_entries)] if diagonal_entries else []
+    return generators + inverse_factors[::-1]
+
+
+def _get_diagonal_generator(
+    orbital_energies: np.ndarray, coefficient
+) -> FermionOperator:
+    """coefficient * (sum_k eps_k n_k)^2 with n_k counting electrons of both spins
+    in spatial orbital k."""
+    spin_orbital_energies = np.repeat(orbital_energies, 2)
+    generator = FermionOperator()
+    for p, energy in enumerate(spin_orbital_energies):
+        generator += FermionOperator(((p, 1), (p, 0)), coefficient * energy**2)
+    for p, q in combinations(range(len(spin_orbital_energies)), 2):
+        generator += FermionOperator(
+            ((p, 1), (p, 0), (q, 1), (q, 0)),
+            2 * coefficient * spin_orbital_energies[p] * spin_orbital_energies[q],
+        )
+    return generator
+
+
+class DoubleFactorizedUCCSDAnsatz(Ansatz):
+
+    supports_parametrized_circuits = True
+    transformation = ansatz_property("transformation")
+
+    def __init__(
+        self,
+        number_of_spatial_orbitals: int,
+        number_of_alpha_electrons: int,
+        reference_amplitudes: np.ndarray,
+        rank: Optional[int] = None,
+        transformation: str = "Jordan-Wigner",
+    ):
+        """
+        Singlet UCCSD ansatz with double excitations replaced by a truncated
+        double factorization of reference amplitudes, e.g. MP2 amplitudes.
+
+        Double amplitudes of the reference form a matrix M over pairs of virtual
+        and occupied orbitals, whose eigendecomposition gives factors that are
+        implemented by orbital rotations and diagonal evolutions, see the module
+        docstring. The factors are fixed by the reference, and their weights
+        (initially the eigenvalues of M) are parameters of the ansatz next to
+        the singles amplitudes. As in `SingletUCCSDAnsatz`, the circuit prepares
+        the Hartree-Fock state and applies exp(-(T - T^dagger)), with singles
+        and the squares of the factors applied one after another.
+
+        Args:
+            number_of_spatial_orbitals: number of spatial orbitals.
+            number_of_alpha_electrons: number of alpha electrons.
+            reference_amplitudes: singlet UCCSD parameter vector the factors are
+                computed from, e.g. from
+                `SingletUCCSDAnsatz.compute_uccsd_vector_from_fermion_generator`.
+            rank: number of factors to keep. Defaults to all factors with nonzero
+                eigenvalue.
+            transformation: transformation used for translation between fermions
+                and qubits.
+
+        Attributes:
+            number_of_qubits: number of qubits required for the ansatz circuit.
+            number_of_params: number of single excitations plus rank.
+            rank: See Args
+            factor_eigenvalues: eigenvalues of M sorted by decreasing magnitude.
+            truncation_error: Frobenius norm of the double amplitudes dropped by
+                the truncation to rank factors.
+            initial_params: parameters reproducing the reference amplitudes up to
+                the truncation.
+        """
+        super().__init__(number_of_layers=1)
+        if number_of_spatial_orbitals <= number_of_alpha_electrons:
+            raise ValueError(
+                "Number of spatial orbitals must be greater than "
+                "number_of_alpha_electrons and is {0}".format(
+                    number_of_spatial_orbitals
+                )
+            )
+        self._number_of_spatial_orbitals = number_of_spatial_orbitals
+        self._number_of_alpha_electrons = number_of_alpha_electrons
+        self._transformation = transformation
+
+        singles, _ = _get_singlet_uccsd_excitations(
+            number_of_spatial_orbitals, number_of_alpha_electrons
+        )
+        self._single_excitations = [pair for pair, _ in singles]
+        reference_amplitudes = np.asarray(reference_amplitudes, dtype=float)
+        self._reference_single_amplitudes = reference_amplitudes[
+            [index for _, index in singles]
+        ]
+        amplitudes_matrix, self._pairs = get_double_amplitudes_matrix(
+            reference_amplitudes, number_of_spatial_orbitals, number_of_alpha_electrons
+        )
+        self._eigenvalues, self._eigenvectors, _ = double_factorize(
+            amplitudes_matrix, rank=len(self._pairs)
+        )
+        self._rank = 0
+        self.rank = rank
+
+    @property
+    def number_of_qubits(self) -> int:
+        return 2 * self._number_of_spatial_orbitals
+
+    @property
+    def rank(self) -> int:
+        return self._rank
+
+    @invalidates_parametrized_circuit  # type: ignore
+    @rank.setter
+    def rank(self, new_rank: Optional[int]):
+        if new_rank is None:
+            new_rank = int(np.sum(np.abs(self._eigenvalues) > _EQ_TOLERANCE))
+        if not 0 <= new_rank <= len(self._eigenvalues):
+            raise ValueError(
+                f"Rank must be between 0 and {len(self._eigenvalues)}, got {new_rank}."
+            )
+        self._rank = new_rank
+
+    @property
+    def factor_eigenvalues(self) -> np.ndarray:
+        return self._eigenvalues.copy()
+
+    @property
+    def truncation_error(self) -> float:
+        return float(np.linalg.norm(self._eigenvalues[self._rank :]))
+
+    @property
+    def number_of_params(self) -> int:
+        """
+        Returns number of parameters in the ansatz.
+        """
+        return len(self._single_excitations) + self._rank
+
+    @property
+    def initial_params(self) -> np.ndarray:
+        return np.concatenate(
+            [self._reference_single_amplitudes, self._eigenvalues[: self._rank]]
+        )
+
+    @property
+    def symbols(self) -> List[sympy.Symbol]:
+        """
+        Returns a list of symbolic parameters used for creating the ansatz.
+        The order of the symbols should match the order in which parameters
+        should be passed for creating executable circuit.
+        """
+        return [
+            sympy.Symbol("theta_{}".format(i), real=True)
+            for i in range(self.number_of_params)
+        ]
+
+    def _get_factor_squares(self) -> List[Tuple[int, int, np.ndarray, np.ndarray]]:
+        """Factor index, sign, orbital energies and orbitals of the squared
+        one-body operators (A_l + B_l)^2 and (A_l - B_l)^2 of the kept factors."""
+        squares = []
+        size = self._number_of_spatial_orbitals
+        for factor_index in range(self._rank):
+            # Matrix of O_l = sum_P v_lP E_P over spatial orbitals
+            excitation_matrix = np.zeros((size, size))
+            for (virtual, occupied), value in zip(
+                self._pairs, self._eigenvectors[:, factor_index]
+            ):
+                excitation_matrix[virtual, occupied] = value
+            for sign in (1, -1):
+                # sign * i * (O_l - O_l^T) / 2 is the matrix of +-B_l
+                energies, orbitals = np.linalg.eigh(
+                    (excitation_matrix + excitation_matrix.T) / 2
+                    - sign * 0.5j * (excitation_matrix - excitation_matrix.T)
+                )
+                squares.append((factor_index, sign, energies, orbitals))
+        return squares
+
+    def _exponentiate(self, generator: FermionOperator) -> Circuit:
+        # exponentiate_fermion_operator(G) implements exp(-G)
+        return exponentiate_fermion_operator(
+            -1 * generator, self._transformation, self.number_of_qubits
+        )
+
+    def _build_orbital_rotation(self, unitary: np.ndarray) -> Circuit:
+        circuit = Circuit(n_qubits=self.number_of_qubits)
+        for generator in _get_orbital_rotation_generators(unitary):
+            circuit += self._exponentiate(generator)
+        return circuit
+
+    @overrides
+    def _generate_circuit(self, params: Optional[np.ndarray] = None) -> Circuit:
+        """
+        Returns a parametrizable circuit represention of the ansatz.
+        Args:
+            params: parameters of the circuit.
+        """
+        if params is None:
+            params = np.asarray(self.symbols)
+        number_of_singles = len(self._single_excitations)
+        single_params = params[:number_of_singles]
+        factor_params = params[number_of_singles:]
+
+        circuit = build_hartree_fock_circuit(
+            self.number_of_qubits,
+            self._number_of_alpha_electrons,
+            self._number_of_alpha_electrons,
+            self._transformation,
+        )
+        singles_generator = FermionOperator()
+        for (virtual, occupied), param in zip(self._single_excitations, single_params):
+            for spin in (0, 1):
+                singles_generator += get_excitation_generator(
+                    ((2 * virtual + spin, 1), (2 * occupied + spin, 0)), param
+                )
+        circuit += exponentiate_fermion_operator(
+            singles_generator, self._transformation, self.number_of_qubits
+        )
+
+        # exp(-sign i/2 theta_l C^2) = U exp(-sign i/2 theta_l (sum eps n)^2) U^dagger,
+        # with the rotations between consecutive squares merged into one
+        orbitals = np.eye(self._number_of_spatial_orbitals)
+        for factor_index, sign, energies, square_orbitals in self._get_factor_squares():
+            circuit += self._build_orbital_rotation(square_orbitals.conj().T @ orbitals)
+            circuit += exponentiate_fermion_operator(
+                _get_diagonal_generator(
+                    energies, sign * 0.5j * factor_params[factor_index]
+                ),
+                self._transformation,
+                self.number_of_qubits,
+            )
+            orbitals = square_orbitals
+        circuit += self._build_orbital_rotation(orbitals)
+        return circuit
@@ -0,0 +1,181 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Compact circuits for fermionic single and double excitations.
+
+Under the Jordan-Wigner transformation, exp(-theta (T - T^dagger)) for a single or
+double excitation T acts only on the two determinants connected by T: it rotates
+them into each other, with a sign given by the parity of the spin-orbitals lying
+between the excited ones. The circuits built here implement exactly that: the
+parity is collected with a CNOT ladder, the two determinants are mapped onto a
+single target qubit and rotated by a multi-controlled RY. This needs far fewer
+CNOTs than exponentiating each of the 2 (single) or 8 (double) Pauli strings of
+the excitation separately.
+
+A double excitation takes 14 two-qubit gates: 8 CNOTs of the Gray-code RY with
+three controls and 6 CNOTs mapping the determinants onto the target and back. A
+single excitation takes 4. With k > 0 spin-orbitals lying between the excited
+ones, the parity adds 2k more: 2 (k - 1) CNOTs of the ladder and 2 CZs.
+"""
+
+from typing import Any, List, Optional, Tuple
+
+import sympy
+from zquantum.core.circuits import CNOT, CZ, RY, Circuit
+from zquantum.core.openfermion import FermionOperator
+
+from .circuit_optimization import cancel_redundant_gates
+from .common import FermionTerm, hermitian_conjugate_term
+from .profiling import profiled
+
+_EQ_TOLERANCE = 1e-8
+
+
+def _is_zero(value) -> bool:
+    if isinstance(value, sympy.Expr) and value.free_symbols:
+        return sympy.expand(value) == 0
+    return abs(complex(value)) <= _EQ_TOLERANCE
+
+
+def get_fermionic_excitations(
+    fermion_generator: FermionOperator,
+) -> List[Tuple[FermionTerm, Any]]:
+    """Split anti-hermitian generator into excitations.
+
+    Args:
+        fermion_generator: anti-hermitian fermionic operator with real (or real
+            symbolic) coefficients.
+
+    Returns:
+        pairs (T, theta) such that the generator is the sum of
+        theta (T - T^dagger), in the order in which the terms appear.
+    """
+    excitations = []
+    visited_terms = set()
+    for term, coefficient in fermion_generator.terms.items():
+        if term in visited_terms:
+            continue
+        conjugate_term = hermitian_conjugate_term(term)
+        visited_terms.update((term, conjugate_term))
+        conjugate_coefficient = fermion_generator.terms.get(conjugate_term, 0)
+        if term == conjugate_term or not _is_zero(coefficient + conjugate_coefficient):
+            raise RuntimeError("fermion_generator is not anti-hermitian.")
+        if not _is_zero(coefficient):
+            excitations.append((term, coefficient))
+    return excitations
+
+
+def _excitation_sign(term: FermionTerm) -> int:
+    """Sign of T acting on the determinant in which only the orbitals annihilated
+    by T are occupied."""
+    occupied_orbitals = {orbital for orbital, action in term if not action}
+    sign = 1
+    for orbital, action in reversed(term):
+        if sum(other < orbital for other in occupied_orbitals) % 2:
+            sign = -sign
+        if action:
+            occupied_orbitals.add(orbital)
+        else:
+            occupied_orbitals.remove(orbital)
+    return sign
+
+
+def _excitation_operations(term: FermionTerm, angle) -> list:
+    """Operations implementing exp(-angle (T - T^dagger)) under Jordan-Wigner."""
+    annihilated_orbitals = {orbital for orbital, action in term if not action}
+    orbitals = sorted(orbital for orbital, _ in term)
+    if (
+        len(term) not in (2, 4)
+        or len(annihilated_orbitals) != len(term) // 2
+        or len(set(orbitals)) != len(term)
+    ):
+        raise ValueError(f"Term {term} is not a single or double excitation.")
+
+    # Orbitals with odd number of excited orbitals above them contribute to the sign
+    parity_qubits = [
+        qubit
+        for low, high in zip(orbitals[::2], orbitals[1::2])
+        for qubit in range(low + 1, high)
+    ]
+    parity_ladder = [
+        CNOT(control, target)
+        for control, target in zip(parity_qubits, parity_qubits[1:])
+    ]
+    parity_flip = [CZ(parity_qubits[-1], orbitals[-1])] if parity_qubits else []
+
+    # Both connected determinants are complementary on the excited orbitals, so
+    # CNOTs from the target make them agree everywhere except the target.
+    target, controls = orbitals[-1], orbitals[:-1]
+    target_occupied = target in annihilated_orbitals
+    fan_out = [CNOT(target, control) for control in controls]
+    control_values = [
+        (control in annihilated_orbitals) != target_occupied for control in controls
+    ]
+
+    rotation_angle = 2 * _excitation_sign(term) * angle
+    if not target_occupied:
+        rotation_angle = -rotation_angle
+
+    # Multi-controlled RY decomposed into RYs and CNOTs along a Gray code: the
+    # rotation in step j is conjugated by X on the target for the odd-parity
+    # controls in the Gray code word.
+    number_of_controls = len(controls)
+    controlled_rotation = []
+    for step in range(2**number_of_controls):
+        word = step ^ (step >> 1)
+        next_step = (step + 1) % 2**number_of_controls
+        changed_bit = (word ^ next_step ^ (next_step >> 1)).bit_length() - 1
+        sign = (-1) ** sum(
+            control_value and (word >> index) & 1
+            for index, control_value in enumerate(control_values)
+        )
+        controlled_rotation += [
+            RY(sign * rotation_angle / 2**number_of_controls)(target),
+            CNOT(controls[changed_bit], target),
+        ]
+
+    return (
+        parity_ladder
+        + fan_out
+        + parity_flip
+        + controlled_rotation
+        + parity_flip
+        + fan_out[::-1]
+        + parity_ladder[::-1]
+    )
+
+
+@profiled("compile_fermionic_excitations")
+def compile_fermionic_excitations(
+    fermion_generator: FermionOperator,
+    number_of_qubits: Optional[int] = None,
+    optimize_circuit: bool = False,
+) -> Circuit:
+    """Create a circuit exponentiating a generator made of fermionic excitations.
+
+    The circuit implements the same operator as `exponentiate_fermion_operator`
+    with the Jordan-Wigner transformation, except for the Trotter ordering:
+    excitations are exponentiated one by one, in the order of
+    `get_fermionic_excitations`, instead of Pauli term by Pauli term. For a
+    generator consisting of a single excitation both circuits are equivalent.
+
+    Args:
+        fermion_generator: anti-hermitian generator consisting of single and double
+            excitations.
+        number_of_qubits: number of qubits of the circuit. Defaults to the number
+            of qubits acted on by the generator.
+        optimize_circuit: if True, redundant gates between consecutive excitations
+            (e.g. shared parity ladders) are cancelled.
+    """
+    operations = [
+        operation
+        for term, coefficient in get_fermionic_excitations(fermion_generator)
+        for operation in _excitation_operations(term, coefficient)
+    ]
+    if number_of_qubits is None:
+        number_of_qubits = 1 + max(
+            (index for term in fermion_generator.terms for index, _ in term),
+            default=-1,
+        )
+    circuit = Circuit(operations, n_qubits=number_of_qubits)
+    return cancel_redundant_gates(circuit) if optimize_circuit else circuit
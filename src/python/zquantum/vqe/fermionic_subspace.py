@@ -0,0 +1,230 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from itertools import combinations
+from typing import List, Tuple, Union
+
+import numpy as np
+import sympy
+from scipy.sparse import csr_matrix, spmatrix
+from scipy.sparse.linalg import expm_multiply
+from zquantum.core.openfermion import (
+    FermionOperator,
+    InteractionOperator,
+    get_fermion_operator,
+    uccsd_singlet_generator,
+    uccsd_singlet_paramsize,
+)
+
+from .common import bit_parity, split_linear_expression
+
+
+class FermionicSubspace:
+    def __init__(
+        self,
+        number_of_spatial_orbitals: int,
+        number_of_alpha_electrons: int,
+        number_of_beta_electrons: int,
+    ):
+        """Space of Slater determinants with fixed numbers of alpha and beta
+        electrons, using interleaved spin ordering.
+
+        Determinants are stored as integers in which bit p is the occupation of
+        spin-orbital p. Signs of fermionic operators follow the Jordan-Wigner
+        convention, i.e. a_p^ picks up a sign for every occupied spin-orbital
+        with index smaller than p.
+
+        Args:
+            number_of_spatial_orbitals: number of spatial orbitals.
+            number_of_alpha_electrons: number of alpha electrons.
+            number_of_beta_electrons: number of beta electrons.
+
+        Attributes:
+            determinants: sorted occupation bitmasks spanning the subspace.
+        """
+        alpha_orbitals = range(0, 2 * number_of_spatial_orbitals, 2)
+        beta_orbitals = range(1, 2 * number_of_spatial_orbitals, 2)
+        determinants = [
+            sum(1 << orbital for orbital in alpha + beta)
+            for alpha in combinations(alpha_orbitals, number_of_alpha_electrons)
+            for beta in combinations(beta_orbitals, number_of_beta_electrons)
+        ]
+        self.number_of_spatial_orbitals = number_of_spatial_orbitals
+        self.number_of_alpha_electrons = number_of_alpha_electrons
+        self.number_of_beta_electrons = number_of_beta_electrons
+        self.determinants = np.sort(np.asarray(determinants, dtype=np.int64))
+
+    @property
+    def dimension(self) -> int:
+        return len(self.determinants)
+
+    def hartree_fock_state(self) -> np.ndarray:
+        """Vector of the determinant with the lowest orbitals occupied."""
+        occupied_orbitals = list(
+            range(0, 2 * self.number_of_alpha_electrons, 2)
+        ) + list(range(1, 2 * self.number_of_beta_electrons, 2))
+        hartree_fock_determinant = sum(1 << orbital for orbital in occupied_orbitals)
+        state = np.zeros(self.dimension)
+        state[np.searchsorted(self.determinants, hartree_fock_determinant)] = 1.0
+        return state
+
+    def _apply_term(
+        self, term: Tuple[Tuple[int, int], ...]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Action of a product of ladder operators on all determinants at once.
+
+        Returns:
+            row indices, column indices and signs of the non-zero matrix elements.
+        """
+        determinants = self.determinants.copy()
+        signs = np.ones(self.dimension, dtype=np.int64)
+        valid = np.ones(self.dimension, dtype=bool)
+        for orbital, action in reversed(term):
+            bit = np.int64(1) << orbital
+            occupied = (determinants & bit) != 0
+            valid &= occupied != bool(action)
+            signs *= 1 - 2 * bit_parity(determinants & (bit - 1))
+            determinants ^= bit
+
+        positions = np.searchsorted(self.determinants, determinants[valid])
+        positions = np.minimum(positions, self.dimension - 1)
+        in_subspace = self.determinants[positions] == determinants[valid]
+        columns = np.flatnonzero(valid)[in_subspace]
+        return positions[in_subspace], columns, signs[valid][in_subspace]
+
+    def get_operator_matrix(
+        self, operator: Union[FermionOperator, InteractionOperator]
+    ) -> csr_matrix:
+        """Sparse matrix of a numerical fermionic operator restricted to the
+        subspace. Parts of the operator leading out of the subspace are dropped."""
+        if isinstance(operator, InteractionOperator):
+            operator = get_fermion_operator(operator)
+        rows: List[np.ndarray] = []
+        columns: List[np.ndarray] = []
+        values: List[np.ndarray] = []
+        for term, coefficient in operator.terms.items():
+            term_rows, term_columns, signs = self._apply_term(term)
+            rows.append(term_rows)
+            columns.append(term_columns)
+            values.append(complex(coefficient) * signs)
+        return _build_matrix(rows, columns, values, self.dimension)
+
+
+def _build_matrix(
+    rows: List[np.ndarray],
+    columns: List[np.ndarray],
+    values: List[np.ndarray],
+    dimension: int,
+) -> csr_matrix:
+    matrix = csr_matrix(
+        (
+            np.concatenate(values) if values else np.zeros(0),
+            (
+                np.concatenate(rows) if rows else np.zeros(0, dtype=int),
+                np.concatenate(columns) if columns else np.zeros(0, dtype=int),
+            ),
+        ),
+        shape=(dimension, dimension),
+    )
+    if not np.iscomplexobj(matrix.data) or not np.any(matrix.data.imag):
+        matrix = matrix.real
+    matrix.sum_duplicates()
+    matrix.eliminate_zeros()
+    return matrix
+
+
+class SingletUCCSDSubspaceEngine:
+    def __init__(self, number_of_spatial_orbitals: int, number_of_alpha_electrons: int):
+        """Classical evaluation of the singlet UCCSD state without quantum circuits.
+
+        The state is represented in the subspace with fixed numbers of alpha and
+        beta electrons only, which is exponentially smaller than the full
+        statevector. Each parameter of the generator from `uccsd_singlet_generator`
+        corresponds to a singlet single or double excitation, which is applied as
+        a sparse matrix exponential:
+            |psi> = exp(-theta_N G_N) ... exp(-theta_1 G_1) |HF>,
+        matching the sign convention of `exponentiate_fermion_operator`.
+        Note that this product of fermionic exponentials does not reproduce the
+        Pauli-string Trotterization used by `SingletUCCSDAnsatz` exactly.
+        Parameters follow the same ordering as `SingletUCCSDAnsatz`, so vectors
+        from `compute_uccsd_vector_from_fermion_generator` can be refined here.
+
+        Args:
+            number_of_spatial_orbitals: number of spatial orbitals.
+            number_of_alpha_electrons: number of alpha (and beta) electrons.
+
+        Attributes:
+            subspace: FermionicSubspace in which the state is represented.
+            excitation_generators: anti-hermitian sparse matrices G_i, one for
+                each parameter.
+        """
+        self.subspace = FermionicSubspace(
+            number_of_spatial_orbitals,
+            number_of_alpha_electrons,
+            number_of_alpha_electrons,
+        )
+        number_of_qubits = 2 * number_of_spatial_orbitals
+        number_of_electrons = 2 * number_of_alpha_electrons
+        symbols = [
+            sympy.Symbol("theta_{}".format(i), real=True)
+            for i in range(
+                uccsd_singlet_paramsize(number_of_qubits, number_of_electrons)
+            )
+        ]
+        symbol_indices = {symbol: index for index, symbol in enumerate(symbols)}
+        fermion_generator = uccsd_singlet_generator(
+            symbols, number_of_qubits, number_of_electrons, anti_hermitian=True
+        )
+
+        rows: List[List[np.ndarray]] = [[] for _ in symbols]
+        columns: List[List[np.ndarray]] = [[] for _ in symbols]
+        values: List[List[np.ndarray]] = [[] for _ in symbols]
+        for term, coefficient in fermion_generator.terms.items():
+            coefficients, _ = split_linear_expression(coefficient, symbol_indices)
+            term_rows, term_columns, signs = self.subspace._apply_term(term)
+            for index, value in coefficients.items():
+                rows[index].append(term_rows)
+                columns[index].append(term_columns)
+                values[index].append(value * signs)
+
+        self.excitation_generators = [
+            _build_matrix(
+                rows[index], columns[index], values[index], self.subspace.dimension
+            )
+            for index in range(len(symbols))
+        ]
+
+    @property
+    def number_of_params(self) -> int:
+        return len(self.excitation_generators)
+
+    def get_state(self, params: np.ndarray) -> np.ndarray:
+        """Amplitudes of the UCCSD state in the basis of `subspace.determinants`."""
+        params = np.asarray(params, dtype=float)
+        if params.shape != (self.number_of_params,):
+            raise ValueError(
+                f"Expected {self.number_of_params} parameters, got {params.shape}."
+            )
+        state = self.subspace.hartree_fock_state()
+        for param, generator in zip(params, self.excitation_generators):
+            if param != 0 and generator.nnz:
+                state = expm_multiply(-param * generator, state)
+        return state
+
+    def get_expectation_value(
+        self,
+        params: np.ndarray,
+        operator: Union[FermionOperator, InteractionOperator, spmatrix],
+    ) -> float:
+        """Expectation value of a hermitian operator in the UCCSD state.
+
+        Args:
+            params: parameters of the UCCSD generator.
+            operator: fermionic operator, or its matrix obtained from
+                `subspace.get_operator_matrix`. Passing the matrix avoids
+                rebuilding it in every call, e.g. during optimization.
+        """
+        if not isinstance(operator, spmatrix):
+            operator = self.subspace.get_operator_matrix(operator)
+        state = self.get_state(params)
+        return float(np.vdot(state, operator @ state).real)
@@ -0,0 +1,15 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Gates that can be stored by name in array-based circuit representations.
+
+Used by `CircuitCache` and `CompactCircuit` to turn gate names back into
+zquantum gates.
+"""
+
+from zquantum.core.circuits import CNOT, CZ, RX, RY, RZ, H, X, Y, Z
+
+# Gate names mapped to gates acting on qubit indices
+FIXED_GATES = {"X": X, "Y": Y, "Z": Z, "H": H, "CNOT": CNOT, "CZ": CZ}
+# Gate names mapped to gate factories taking a single angle
+PARAMETRIZED_GATES = {"RX": RX, "RY": RY, "RZ": RZ}
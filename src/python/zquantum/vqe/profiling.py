@@ -0,0 +1,186 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Opt-in instrumentation of the stages of ansatz circuit generation.
+
+Stages of e.g. `exponentiate_fermion_operator` or `build_hartree_fock_circuit` are
+wrapped in `profile_stage`. Nothing is measured unless a callback is registered,
+either directly with `add_stage_callback` or by activating a `StageProfiler`:
+
+    with StageProfiler() as profiler:
+        ansatz.parametrized_circuit
+    profiler.save("profile.json")
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+_stage_callbacks: List[Callable[["StageRecord"], None]] = []
+_active_stages: List[str] = []
+
+
+def _get_output_size(output: Any) -> Optional[int]:
+    """Number of operations of a circuit, terms of an operator or items of a
+    container."""
+    if hasattr(output, "operations"):
+        return len(output.operations)
+    if hasattr(output, "terms"):
+        return len(output.terms)
+    if hasattr(output, "__len__"):
+        return len(output)
+    return None
+
+
+class StageRecord:
+    def __init__(self, name: str, parent: Optional[str] = None):
+        """Measurements of a single run of a stage.
+
+        Args:
+            name: name of the stage.
+            parent: name of the stage within which this stage was run, if any.
+
+        Attributes:
+            name: See Args
+            parent: See Args
+            wall_time: wall time of the stage in seconds.
+            allocated_blocks: net number of memory blocks allocated by the
+                interpreter during the stage.
+            allocated_bytes: net number of bytes allocated during the stage.
+                Only available if tracemalloc is tracing.
+            output_size: size of the output of the stage, e.g. number of gates or
+                Pauli terms.
+        """
+        self.name = name
+        self.parent = parent
+        self.wall_time = 0.0
+        self.allocated_blocks = 0
+        self.allocated_bytes: Optional[int] = None
+        self.output_size: Optional[int] = None
+
+    def set_output(self, output: Any) -> None:
+        self.output_size = _get_output_size(output)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "parent": self.parent,
+            "wall_time": self.wall_time,
+            "allocated_blocks": self.allocated_blocks,
+            "allocated_bytes": self.allocated_bytes,
+            "output_size": self.output_size,
+        }
+
+
+class _DisabledStageRecord:
+    def set_output(self, output: Any) -> None:
+        pass
+
+
+_DISABLED_STAGE_RECORD = _DisabledStageRecord()
+
+
+def add_stage_callback(callback: Callable[[StageRecord], None]) -> None:
+    """Register function called with the record of every finished stage."""
+    _stage_callbacks.append(callback)
+
+
+def remove_stage_callback(callback: Callable[[StageRecord], None]) -> None:
+    _stage_callbacks.remove(callback)
+
+
+@contextmanager
+def profile_stage(name: str) -> Iterator[Any]:
+    """Measure the enclosed block as a stage, if any callback is registered.
+
+    Yields:
+        record of the stage, whose `set_output` can be called to store the size
+        of the stage's output.
+    """
+    if not _stage_callbacks:
+        yield _DISABLED_STAGE_RECORD
+        return
+
+    record = StageRecord(name, _active_stages[-1] if _active_stages else None)
+    _active_stages.append(name)
+    tracing = tracemalloc.is_tracing()
+    initial_bytes = tracemalloc.get_traced_memory()[0] if tracing else 0
+    initial_blocks = sys.getallocatedblocks()
+    start_time = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.wall_time = time.perf_counter() - start_time
+        record.allocated_blocks = sys.getallocatedblocks() - initial_blocks
+        if tracing:
+            record.allocated_bytes = tracemalloc.get_traced_memory()[0] - initial_bytes
+        _active_stages.pop()
+        for callback in list(_stage_callbacks):
+            callback(record)
+
+
+def profiled(name: str) -> Callable:
+    """Decorator profiling every call of a function as a stage, with the size of
+    the returned value as the output size."""
+
+    def _decorator(function: Callable) -> Callable:
+        @wraps(function)
+        def _wrapper(*args, **kwargs):
+            with profile_stage(name) as stage:
+                output = function(*args, **kwargs)
+                stage.set_output(output)
+            return output
+
+        return _wrapper
+
+    return _decorator
+
+
+class StageProfiler:
+    def __init__(self):
+        """Collects records of all stages run while the profiler is active.
+
+        Attributes:
+            records: records of finished stages, in the order in which they
+                finished (i.e. nested stages before the enclosing stage).
+        """
+        self.records: List[StageRecord] = []
+
+    def __enter__(self) -> "StageProfiler":
+        self._callback = self.records.append
+        add_stage_callback(self._callback)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        remove_stage_callback(self._callback)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Number of calls and totals of the measurements for each stage."""
+        summary: Dict[str, Dict[str, Any]] = {}
+        for record in self.records:
+            stage_summary = summary.setdefault(
+                record.name,
+                {"calls": 0, "wall_time": 0.0, "allocated_blocks": 0},
+            )
+            stage_summary["calls"] += 1
+            stage_summary["wall_time"] += record.wall_time
+            stage_summary["allocated_blocks"] += record.allocated_blocks
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "records": [record.to_dict() for record in self.records],
+            "summary": self.summary(),
+        }
+
+    def to_json(self, **kwargs) -> str:
+        """Serialize records and summary, kwargs are passed to `json.dumps`."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def save(self, filename: str) -> None:
+        with open(filename, "w") as f:
+            f.write(self.to_json(indent=2))
@@ -1,7 +1,7 @@
 ################################################################################
 # © Copyright 2021 Zapata Computing Inc.
 ################################################################################
-from typing import List, Optional
+from typing import Callable, List, Optional, Sequence, Tuple
 
 import numpy as np
 import sympy
@@ -10,6 +10,11 @@ from zquantum.core.circuits import CNOT, RX, RZ, Circuit
 from zquantum.core.interfaces.ansatz import Ansatz
 from zquantum.core.interfaces.ansatz_utils import ansatz_property
 
+from .compact_circuit import CompactCircuit
+from .profiling import profiled
+from .statevector import apply_cnot, apply_rx, apply_rz, initial_statevector
+from .templates import LinearCircuitTemplate
+
 
 class HEAQuantumCompilingAnsatz(Ansatz):
 
@@ -33,7 +38,9 @@ class HEAQuantumCompilingAnsatz(Ansatz):
         super().__init__(number_of_layers)
         assert number_of_qubits % 2 == 0
         self._number_of_qubits = number_of_qubits
+        self._circuit_template: Optional[LinearCircuitTemplate] = None
 
+    @profiled("hea_rotational_subcircuit")
     def _build_rotational_subcircuit(
         self, circuit: Circuit, parameters: np.ndarray
     ) -> Circuit:
@@ -47,18 +54,39 @@ class HEAQuantumCompilingAnsatz(Ansatz):
             circuit with added rotational sub-layer
         """
         # Add RZ(theta) RX(pi/2) RZ(theta') RX(pi/2) RZ(theta'')
+        operations = []
         for qubit_index in range(self.number_of_qubits):
 
             qubit_parameters = parameters[qubit_index * 3 : (qubit_index + 1) * 3]
 
-            circuit += RZ(qubit_parameters[0])(qubit_index)
-            circuit += RX(np.pi / 2)(qubit_index)
-            circuit += RZ(qubit_parameters[1])(qubit_index)
-            circuit += RX(np.pi / 2)(qubit_index)
-            circuit += RZ(qubit_parameters[2])(qubit_index)
+            operations += [
+                RZ(qubit_parameters[0])(qubit_index),
+                RX(np.pi / 2)(qubit_index),
+                RZ(qubit_parameters[1])(qubit_index),
+                RX(np.pi / 2)(qubit_index),
+                RZ(qubit_parameters[2])(qubit_index),
+            ]
+
+        return circuit + Circuit(operations)
 
-        return circuit
+    def _even_cnot_pairs(self) -> List[Tuple[int, int]]:
+        """Control and target qubits of CNOT(x, x+1) for x in even(qubits)"""
+        qubit_ids = list(range(self.number_of_qubits))
+        return list(zip(qubit_ids[::2], qubit_ids[1::2]))
 
+    def _inside_out_cnot_pairs(self) -> List[Tuple[int, int]]:
+        """Control and target qubits of the CNOT layer working "inside -> out",
+        skipping every other qubit"""
+        qubit_ids = list(range(self.number_of_qubits))
+        pairs = []
+        for qubit_index in qubit_ids[: int(self.number_of_qubits / 2)][::-1][::2]:
+            pairs.append((qubit_index, self.number_of_qubits - qubit_index - 1))
+
+            if qubit_index != 0 or self.number_of_qubits % 4 == 0:
+                pairs.append((self.number_of_qubits - qubit_index, qubit_index - 1))
+        return pairs
+
+    @profiled("hea_circuit_layer")
     def _build_circuit_layer(self, parameters: np.ndarray) -> Circuit:
         """Build circuit layer for the hardware efficient quantum compiling ansatz
 
@@ -76,12 +104,10 @@ class HEAQuantumCompilingAnsatz(Ansatz):
             circuit_layer, parameters[: 3 * self.number_of_qubits]
         )
 
-        qubit_ids = list(range(self.number_of_qubits))
         # Add CNOT(x, x+1) for x in even(qubits)
-        for control, target in zip(
-            qubit_ids[::2], qubit_ids[1::2]
-        ):  # loop over qubits 0, 2, 4...
-            circuit_layer += CNOT(control, target)
+        circuit_layer += Circuit(
+            [CNOT(control, target) for control, target in self._even_cnot_pairs()]
+        )
 
         # Add RZ(theta) RX(pi/2) RZ(theta') RX(pi/2) RZ(theta'')
         circuit_layer = self._build_rotational_subcircuit(
@@ -90,16 +116,9 @@ class HEAQuantumCompilingAnsatz(Ansatz):
         )
 
         # Add CNOT layer working "inside -> out", skipping every other qubit
-
-        for qubit_index in qubit_ids[: int(self.number_of_qubits / 2)][::-1][::2]:
-            control = qubit_index
-            target = self.number_of_qubits - qubit_index - 1
-            circuit_layer += CNOT(control, target)
-
-            if qubit_index != 0 or self.number_of_qubits % 4 == 0:
-                control = self.number_of_qubits - qubit_index
-                target = qubit_index - 1
-                circuit_layer += CNOT(control, target)
+        circuit_layer += Circuit(
+            [CNOT(control, target) for control, target in self._inside_out_cnot_pairs()]
+        )
 
         return circuit_layer
 
@@ -118,16 +137,195 @@ class HEAQuantumCompilingAnsatz(Ansatz):
 
         assert len(parameters) == self.number_of_params
 
-        circuit = Circuit()
+        operations = []
         for layer_index in range(self.number_of_layers):
-            circuit += self._build_circuit_layer(
+            operations += self._build_circuit_layer(
                 parameters[
                     layer_index
                     * self.number_of_params_per_layer : (layer_index + 1)
                     * self.number_of_params_per_layer
                 ]
+            ).operations
+        return Circuit(operations)
+
+    def get_compact_circuit(self) -> CompactCircuit:
+        """Builds the parametrized circuit as a `CompactCircuit`, without creating
+        gate objects. `to_circuit()` of the result equals `parametrized_circuit`.
+        """
+        n_qubits = self.number_of_qubits
+        rz_opcode, rx_opcode, cnot_opcode = range(3)
+
+        # RZ(theta) RX(pi/2) RZ(theta') RX(pi/2) RZ(theta'') on every qubit
+        rotation_opcodes = np.tile(
+            [rz_opcode, rx_opcode, rz_opcode, rx_opcode, rz_opcode], n_qubits
+        )
+        rotation_qubits = np.stack(
+            [np.repeat(np.arange(n_qubits), 5), np.full(5 * n_qubits, -1)], axis=1
+        )
+        rotation_parameter_indices = np.full((2, n_qubits, 5), -1)
+        rotation_parameter_indices[..., ::2] = np.arange(6 * n_qubits).reshape(
+            2, n_qubits, 3
+        )
+        rotation_angles = np.tile([0.0, np.pi / 2, 0.0, np.pi / 2, 0.0], n_qubits)
+
+        opcodes, qubits, parameter_indices, angles = [], [], [], []
+        for sublayer_index, cnot_pairs in enumerate(
+            [self._even_cnot_pairs(), self._inside_out_cnot_pairs()]
+        ):
+            opcodes += [rotation_opcodes, np.full(len(cnot_pairs), cnot_opcode)]
+            qubits += [rotation_qubits, np.reshape(cnot_pairs, (-1, 2))]
+            parameter_indices += [
+                rotation_parameter_indices[sublayer_index].ravel(),
+                np.full(len(cnot_pairs), -1),
+            ]
+            angles += [rotation_angles, np.zeros(len(cnot_pairs))]
+
+        layer_parameter_indices = np.concatenate(parameter_indices)
+        layer_offsets = self.number_of_params_per_layer * np.arange(
+            self.number_of_layers
+        )
+        return CompactCircuit(
+            n_qubits,
+            ["RZ", "RX", "CNOT"],
+            np.tile(np.concatenate(opcodes), self.number_of_layers),
+            np.tile(np.concatenate(qubits), (self.number_of_layers, 1)),
+            np.where(
+                layer_parameter_indices >= 0,
+                layer_parameter_indices + layer_offsets[:, None],
+                -1,
+            ).ravel(),
+            np.tile(np.concatenate(angles), self.number_of_layers),
+        )
+
+    @property
+    def circuit_template(self) -> LinearCircuitTemplate:
+        """
+        Returns the template of the parametrized circuit, i.e. the fixed gate
+        skeleton with RZ angles indexed to the parameters they depend on.
+        It is rebuilt only after the parametrized circuit gets invalidated.
+        """
+        circuit = self.parametrized_circuit
+        if (
+            self._circuit_template is None
+            or self._circuit_template.circuit is not circuit
+        ):
+            self._circuit_template = LinearCircuitTemplate(circuit, self.symbols)
+        return self._circuit_template
+
+    def get_executable_circuits(self, params_batch: np.ndarray) -> List[Circuit]:
+        """Builds executable circuits for many parameter vectors at once.
+
+        Gate angles of the whole batch are evaluated with a single matrix product
+        of the circuit template, see `LinearCircuitTemplate.bind_batch`.
+
+        Args:
+            params_batch: 2D array of shape (number of parameter sets,
+                number_of_params).
+
+        Returns:
+            list of executable circuits, one per parameter set.
+        """
+        return self.circuit_template.bind_batch(params_batch)
+
+    def get_parameter_shift_circuits(self, params: np.ndarray) -> List[Circuit]:
+        """Builds all circuits needed for the parameter-shift gradient in one batch.
+
+        Every parameter feeds exactly one RZ gate, so the two-term shift rule with
+        shifts of +-pi/2 gives the exact gradient.
+
+        Args:
+            params: parameters at which the gradient is evaluated (1d array).
+
+        Returns:
+            2 * number_of_params circuits. The first half has consecutive
+            parameters shifted by +pi/2, the second half by -pi/2.
+        """
+        params = np.asarray(params, dtype=float)
+        if params.shape != (self.number_of_params,):
+            raise ValueError(
+                f"Expected {self.number_of_params} parameters, got {params.shape}."
+            )
+        shifts = np.pi / 2 * np.eye(self.number_of_params)
+        return self.get_executable_circuits(
+            np.concatenate([params + shifts, params - shifts])
+        )
+
+    @staticmethod
+    def compute_parameter_shift_gradient(energies: Sequence[float]) -> np.ndarray:
+        """Reduces energies of the circuits from `get_parameter_shift_circuits`
+        into the gradient vector.
+
+        Args:
+            energies: energies measured for the shifted circuits, in the same order.
+
+        Returns:
+            gradient of the energy with respect to the parameters.
+        """
+        energies = np.asarray(energies, dtype=float)
+        if energies.ndim != 1 or len(energies) % 2 != 0:
+            raise ValueError(
+                "Expected even number of energies of parameter-shifted circuits."
             )
-        return circuit
+        plus_energies, minus_energies = np.split(energies, 2)
+        return (plus_energies - minus_energies) / 2
+
+    def get_parameter_shift_gradient(
+        self,
+        params: np.ndarray,
+        estimate_energies: Callable[[List[Circuit]], Sequence[float]],
+    ) -> np.ndarray:
+        """Computes exact gradient of the energy with the parameter-shift rule.
+
+        Args:
+            params: parameters at which the gradient is evaluated (1d array).
+            estimate_energies: function returning energies for a batch of circuits.
+
+        Returns:
+            gradient of the energy with respect to the parameters.
+        """
+        circuits = self.get_parameter_shift_circuits(params)
+        return self.compute_parameter_shift_gradient(estimate_energies(circuits))
+
+    def get_statevector(
+        self, params: np.ndarray, initial_state: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Simulates the ansatz directly on a statevector, without building circuits.
+
+        RZ gates are applied as diagonal phase multiplications and CNOTs as
+        in-place permutations of the amplitudes.
+
+        Args:
+            params: parameters of the circuit (1d array).
+            initial_state: amplitudes of the initial state in big-endian ordering.
+                Defaults to |0...0>.
+
+        Returns:
+            amplitudes of the final state in big-endian ordering.
+        """
+        params = np.asarray(params, dtype=float)
+        if params.shape != (self.number_of_params,):
+            raise ValueError(
+                f"Expected {self.number_of_params} parameters, got {params.shape}."
+            )
+        n_qubits = self.number_of_qubits
+        statevector = initial_statevector(n_qubits, initial_state)
+
+        for layer_params in params.reshape(self.number_of_layers, 2, n_qubits, 3):
+            for sublayer_params, cnot_pairs in zip(
+                layer_params, [self._even_cnot_pairs(), self._inside_out_cnot_pairs()]
+            ):
+                # RZ(theta) RX(pi/2) RZ(theta') RX(pi/2) RZ(theta'')
+                for qubit_index, qubit_params in enumerate(sublayer_params):
+                    apply_rz(statevector, n_qubits, qubit_index, qubit_params[0])
+                    apply_rx(statevector, n_qubits, qubit_index, np.pi / 2)
+                    apply_rz(statevector, n_qubits, qubit_index, qubit_params[1])
+                    apply_rx(statevector, n_qubits, qubit_index, np.pi / 2)
+                    apply_rz(statevector, n_qubits, qubit_index, qubit_params[2])
+
+                for control, target in cnot_pairs:
+                    apply_cnot(statevector, n_qubits, control, target)
+
+        return statevector
 
     @property
     def number_of_params(self) -> int:
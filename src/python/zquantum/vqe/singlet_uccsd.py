@@ -1,30 +1,47 @@
 ################################################################################
 # © Copyright 2020-2022 Zapata Computing Inc.
 ################################################################################
-from typing import Optional, Tuple
+from typing import Iterator, List, Optional, Sequence, Tuple
 
 import numpy as np
 import sympy
 from overrides import overrides
+from scipy.sparse import vstack
 from zquantum.core.circuits import Circuit
 from zquantum.core.interfaces.ansatz import Ansatz
 from zquantum.core.interfaces.ansatz_utils import (
-    ansatz_property,
     invalidates_parametrized_circuit,
 )
 from zquantum.core.openfermion import (
     FermionOperator,
+    QubitOperator,
     uccsd_singlet_generator,
     uccsd_singlet_paramsize,
 )
 
-from .utils import build_hartree_fock_circuit, exponentiate_fermion_operator
+from .circuit_cache import CircuitCache
+from .common import get_excitation_generator, get_uccsd_parameter_indices
+from .fermionic_excitations import (
+    compile_fermionic_excitations,
+    get_fermionic_excitations,
+)
+from .profiling import profile_stage
+from .statevector import apply_pauli_rotation, apply_pauli_string, apply_qubit_operator
+from .tapering import Z2Tapering
+from .templates import LinearCircuitTemplate
+from .utils import (
+    build_hartree_fock_circuit,
+    exponentiate_fermion_operator,
+    get_hartree_fock_bitstrings,
+    get_pauli_rotations,
+    get_two_qubit_reduction,
+    iterate_exponentiated_fermion_operator,
+)
 
 
 class SingletUCCSDAnsatz(Ansatz):
 
     supports_parametrized_circuits = True
-    transformation = ansatz_property("transformation")
 
     def __init__(
         self,
@@ -32,6 +49,13 @@ class SingletUCCSDAnsatz(Ansatz):
         number_of_alpha_electrons: int,
         number_of_layers: int = 1,
         transformation: str = "Jordan-Wigner",
+        use_circuit_template: bool = False,
+        optimize_circuit: bool = False,
+        compilation: str = "pauli",
+        active_parameter_indices: Optional[Sequence[int]] = None,
+        circuit_cache_dir: Optional[str] = None,
+        workers: int = 1,
+        taper_qubits: bool = False,
     ):
         """
         Ansatz class representing Singlet UCCSD Ansatz.
@@ -42,16 +66,45 @@ class SingletUCCSDAnsatz(Ansatz):
             number_of_spatial_orbitals: number of spatial orbitals.
             number_of_alpha_electrons: number of alpha electrons.
             transformation: transformation used for translation between fermions
-                and qubits.
+                and qubits: "Jordan-Wigner", "Bravyi-Kitaev" or "Parity".
+            use_circuit_template: if True, executable circuits are created by
+                binding parameters to a precompiled template of the parametrized
+                circuit instead of substituting symbols gate by gate.
+            optimize_circuit: if True, the UCCSD evolution is compiled with Pauli
+                term ordering and gate cancellation, see
+                `exponentiate_fermion_operator`.
+            compilation: "pauli" to exponentiate the transformed generator Pauli
+                term by Pauli term, or "fermionic_excitations" to use compact
+                circuits for each fermionic excitation, see
+                `compile_fermionic_excitations`. The latter requires Jordan-Wigner
+                transformation.
+            active_parameter_indices: if provided, only excitations corresponding to
+                these indices of the full UCCSD parameter vector are included in the
+                ansatz, and the ansatz has only as many parameters. Use
+                `screen_parameters` to select them from amplitude guesses and
+                `expand_params` to map parameters back to the full vector.
+            circuit_cache_dir: if provided, the parametrized circuit is loaded from
+                this directory if it was built before with the same configuration,
+                possibly by another process, and stored there otherwise. See
+                `CircuitCache`.
+            workers: number of processes used to build the circuit with Pauli
+                compilation, see `exponentiate_fermion_operator`.
+            taper_qubits: if True, the qubits fixed by the parities of the numbers
+                of alpha and beta electrons are removed from the circuit, see
+                `get_two_qubit_reduction`. Hamiltonians have to be mapped to the
+                reduced space with `taper_operator`. Requires Pauli compilation.
 
         Attributes:
             number_of_beta_electrons: number of beta electrons
                 (equal to number_of_alpha_electrons).
             number_of_electrons: total number of electrons (number_of_alpha_electrons
                 + number_of_beta_electrons).
-            number_of_qubits: number of qubits required for the ansatz circuit.
+            number_of_qubits: number of qubits required for the ansatz circuit,
+                i.e. number of spin-orbitals less the number of tapered qubits.
             number_of_params: number of the parameters that need to be set for
                 the ansatz circuit.
+            full_number_of_params: number of parameters of the unscreened UCCSD
+                ansatz.
         """
         super().__init__(number_of_layers=number_of_layers)
         self._number_of_layers = number_of_layers
@@ -60,6 +113,20 @@ class SingletUCCSDAnsatz(Ansatz):
         self._number_of_alpha_electrons = number_of_alpha_electrons
         self._transformation = transformation
         self._assert_number_of_spatial_orbitals()
+        self._use_circuit_template = use_circuit_template
+        self._optimize_circuit = optimize_circuit
+        self._compilation = compilation
+        self._taper_qubits = taper_qubits
+        self._tapering: Optional[Z2Tapering] = None
+        self._assert_compilation()
+        self._active_parameter_indices: Optional[List[int]] = None
+        self.active_parameter_indices = active_parameter_indices
+        self._workers = workers
+        self._circuit_cache = (
+            CircuitCache(circuit_cache_dir) if circuit_cache_dir is not None else None
+        )
+        self._circuit_template: Optional[LinearCircuitTemplate] = None
+        self._pauli_rotations_cache: Optional[tuple] = None
 
     @property
     def number_of_layers(self):
@@ -80,11 +147,42 @@ class SingletUCCSDAnsatz(Ansatz):
     def number_of_spatial_orbitals(self, new_number_of_spatial_orbitals):
         self._number_of_spatial_orbitals = new_number_of_spatial_orbitals
         self._assert_number_of_spatial_orbitals()
+        self._assert_active_parameter_indices()
+        self._tapering = None
 
     @property
-    def number_of_qubits(self):
+    def number_of_spin_orbitals(self):
         return self._number_of_spatial_orbitals * 2
 
+    @property
+    def number_of_qubits(self):
+        tapering = self._get_tapering()
+        if tapering is not None:
+            return tapering.reduced_number_of_qubits
+        return self.number_of_spin_orbitals
+
+    def _get_tapering(self) -> Optional[Z2Tapering]:
+        if not self._taper_qubits:
+            return None
+        if self._tapering is None:
+            self._tapering = get_two_qubit_reduction(
+                self.number_of_spin_orbitals,
+                self.number_of_alpha_electrons,
+                self._number_of_beta_electrons,
+                self._transformation,
+            )
+        return self._tapering
+
+    def taper_operator(self, qubit_operator: QubitOperator) -> QubitOperator:
+        """
+        Maps an operator on the spin-orbital qubits, e.g. the qubit Hamiltonian, to
+        the qubits of the ansatz circuit. Without tapering it is returned as is.
+        """
+        tapering = self._get_tapering()
+        if tapering is None:
+            return qubit_operator
+        return tapering.taper_qubit_operator(qubit_operator)
+
     @property
     def number_of_alpha_electrons(self):
         return self._number_of_alpha_electrons
@@ -94,6 +192,19 @@ class SingletUCCSDAnsatz(Ansatz):
     def number_of_alpha_electrons(self, new_number_of_alpha_electrons):
         self._number_of_alpha_electrons = new_number_of_alpha_electrons
         self._assert_number_of_spatial_orbitals()
+        self._assert_active_parameter_indices()
+        self._tapering = None
+
+    @property
+    def transformation(self):
+        return self._transformation
+
+    @invalidates_parametrized_circuit  # type: ignore
+    @transformation.setter
+    def transformation(self, new_transformation):
+        self._transformation = new_transformation
+        self._assert_compilation()
+        self._tapering = None
 
     @property
     def _number_of_beta_electrons(self):
@@ -103,15 +214,219 @@ class SingletUCCSDAnsatz(Ansatz):
     def number_of_electrons(self):
         return self._number_of_alpha_electrons + self._number_of_beta_electrons
 
+    @property
+    def active_parameter_indices(self) -> Optional[List[int]]:
+        return self._active_parameter_indices
+
+    @invalidates_parametrized_circuit  # type: ignore
+    @active_parameter_indices.setter
+    def active_parameter_indices(self, new_active_parameter_indices):
+        if new_active_parameter_indices is None:
+            self._active_parameter_indices = None
+            return
+        self._active_parameter_indices = [
+            int(index) for index in new_active_parameter_indices
+        ]
+        self._assert_active_parameter_indices()
+
+    @property
+    def full_number_of_params(self) -> int:
+        return uccsd_singlet_paramsize(
+            n_qubits=self.number_of_spin_orbitals,
+            n_electrons=self.number_of_electrons,
+        )
+
     @property
     def number_of_params(self) -> int:
         """
         Returns number of parameters in the ansatz.
         """
-        return uccsd_singlet_paramsize(
-            n_qubits=self.number_of_qubits,
-            n_electrons=self.number_of_electrons,
+        if self._active_parameter_indices is not None:
+            return len(self._active_parameter_indices)
+        return self.full_number_of_params
+
+    def expand_params(self, params: np.ndarray) -> np.ndarray:
+        """
+        Maps parameters of the ansatz to the full UCCSD parameter vector, with
+        zeros for excitations that are not active.
+        """
+        params = np.asarray(params)
+        if self._active_parameter_indices is None:
+            return params
+        full_params = np.zeros(self.full_number_of_params, dtype=params.dtype)
+        full_params[self._active_parameter_indices] = params
+        return full_params
+
+    def screen_parameters(
+        self, raw_fermion_generator: FermionOperator, screening_threshold: float = 0.0
+    ) -> np.ndarray:
+        """
+        Keeps only excitations whose amplitudes in the raw fermion generator (e.g.
+        MP2 amplitudes) survive the screening, reducing the number of parameters.
+
+        Returns:
+            amplitudes of the active excitations, to be used as initial parameters.
+        """
+        self.active_parameter_indices = None
+        full_params = self.compute_uccsd_vector_from_fermion_generator(
+            raw_fermion_generator, screening_threshold
+        )
+        self.active_parameter_indices = np.flatnonzero(full_params)
+        return full_params[self._active_parameter_indices]
+
+    def _build_fermion_generator(self, params: np.ndarray) -> FermionOperator:
+        return uccsd_singlet_generator(
+            self.expand_params(params),
+            self.number_of_spin_orbitals,
+            self.number_of_electrons,
+            anti_hermitian=True,
+        )
+
+    @property
+    def symbols(self) -> List[sympy.Symbol]:
+        """
+        Returns a list of symbolic parameters used for creating the ansatz.
+        The order of the symbols should match the order in which parameters
+        should be passed for creating executable circuit.
+        """
+        return [
+            sympy.Symbol("theta_{}".format(i), real=True)
+            for i in range(self.number_of_params)
+        ]
+
+    @property
+    def circuit_template(self) -> LinearCircuitTemplate:
+        """
+        Returns the template of the parametrized circuit. It is built once and
+        rebuilt only after the parametrized circuit gets invalidated.
+        """
+        circuit = self.parametrized_circuit
+        if (
+            self._circuit_template is None
+            or self._circuit_template.circuit is not circuit
+        ):
+            self._circuit_template = LinearCircuitTemplate(circuit, self.symbols)
+        return self._circuit_template
+
+    @overrides
+    def get_executable_circuit(self, params: np.ndarray) -> Circuit:
+        if self._use_circuit_template:
+            return self.circuit_template.bind(params)
+        return super().get_executable_circuit(params)
+
+    def _get_pauli_rotations(self):
+        """Pauli rotations implementing the UCCSD evolution, cached for the current
+        ansatz configuration."""
+        key = (
+            self.number_of_spin_orbitals,
+            self.number_of_electrons,
+            self.transformation,
+            self._compilation,
+            self._active_parameter_indices and tuple(self._active_parameter_indices),
+            self._taper_qubits,
+        )
+        if self._pauli_rotations_cache is None or self._pauli_rotations_cache[0] != key:
+            symbols = self.symbols
+            fermion_generator = self._build_fermion_generator(np.asarray(symbols))
+            if self._compilation == "pauli":
+                pauli_rotations = get_pauli_rotations(
+                    fermion_generator,
+                    symbols,
+                    self.transformation,
+                    self.number_of_spin_orbitals,
+                    self._get_tapering(),
+                )
+            else:
+                # Pauli strings of a single excitation commute, so the circuit of
+                # each excitation is the product of its Pauli rotations.
+                excitation_rotations = [
+                    get_pauli_rotations(
+                        get_excitation_generator(term, coefficient),
+                        symbols,
+                        self.transformation,
+                        self.number_of_spin_orbitals,
+                    )
+                    for term, coefficient in get_fermionic_excitations(
+                        fermion_generator
+                    )
+                ]
+                pauli_rotations = (
+                    [
+                        pauli_term
+                        for pauli_terms, _, _ in excitation_rotations
+                        for pauli_term in pauli_terms
+                    ],
+                    vstack(
+                        [coefficients for _, coefficients, _ in excitation_rotations],
+                        format="csr",
+                    ),
+                    np.concatenate([offsets for _, _, offsets in excitation_rotations]),
+                )
+            self._pauli_rotations_cache = (key, pauli_rotations)
+        return self._pauli_rotations_cache[1]
+
+    def _get_hartree_fock_statevector(self) -> np.ndarray:
+        bitstring = get_hartree_fock_bitstrings(
+            self.number_of_spin_orbitals,
+            self.number_of_alpha_electrons,
+            self._number_of_beta_electrons,
+            self._transformation,
+        )
+        tapering = self._get_tapering()
+        if tapering is not None:
+            bitstring = tapering.taper_bitstring(bitstring)
+        index = int("".join(map(str, bitstring)), 2)
+        statevector = np.zeros(2**self.number_of_qubits, dtype=np.complex128)
+        statevector[index] = 1.0
+        return statevector
+
+    def get_energy_and_gradient(
+        self, params: np.ndarray, qubit_hamiltonian: QubitOperator
+    ) -> Tuple[float, np.ndarray]:
+        """Computes energy and its exact gradient with the adjoint method.
+
+        The state is simulated locally as a statevector: one forward sweep over
+        the Pauli rotations of the UCCSD evolution and one backward sweep that
+        uncomputes the state and accumulates all partial derivatives at once.
+
+        Args:
+            params: parameters of the circuit.
+            qubit_hamiltonian: Hamiltonian whose expectation value is computed,
+                acting on the qubits of the ansatz (see `taper_operator`).
+
+        Returns:
+            energy and its gradient with respect to params.
+        """
+        params = np.asarray(params, dtype=float)
+        if params.shape != (self.number_of_params,):
+            raise ValueError(
+                f"Expected {self.number_of_params} parameters, got {params.shape}."
+            )
+        n_qubits = self.number_of_qubits
+        pauli_terms, coefficients, offsets = self._get_pauli_rotations()
+        angles = coefficients @ params + offsets
+
+        statevector = self._get_hartree_fock_statevector()
+        for pauli_term, angle in zip(pauli_terms, angles):
+            apply_pauli_rotation(statevector, n_qubits, pauli_term, angle)
+
+        adjoint_statevector = apply_qubit_operator(
+            qubit_hamiltonian, statevector, n_qubits
         )
+        energy = np.vdot(statevector, adjoint_statevector).real
+
+        angle_gradient = np.zeros(len(pauli_terms))
+        for index in reversed(range(len(pauli_terms))):
+            pauli_term, angle = pauli_terms[index], angles[index]
+            # dE/d(angle) = Im <lambda|P|psi> for exp(-i angle P / 2)
+            angle_gradient[index] = np.vdot(
+                adjoint_statevector,
+                apply_pauli_string(statevector, n_qubits, pauli_term),
+            ).imag
+            apply_pauli_rotation(statevector, n_qubits, pauli_term, -angle)
+            apply_pauli_rotation(adjoint_statevector, n_qubits, pauli_term, -angle)
+
+        return energy, coefficients.T @ angle_gradient
 
     @staticmethod
     def screen_out_operator_terms_below_threshold(
@@ -146,23 +461,22 @@ class SingletUCCSDAnsatz(Ansatz):
     def compute_uccsd_vector_from_fermion_generator(
         self, raw_fermion_generator: FermionOperator, screening_threshold: float = 0.0
     ) -> np.ndarray:
-        _, screened_mp2_operator = self.screen_out_operator_terms_below_threshold(
-            screening_threshold, raw_fermion_generator
-        )
-
-        ansatz_operator = uccsd_singlet_generator(
-            np.arange(1.0, self.number_of_params + 1),
-            2 * self.number_of_spatial_orbitals,
-            self.number_of_electrons,
-            anti_hermitian=True,
+        parameter_indices = get_uccsd_parameter_indices(
+            self.number_of_spin_orbitals, self.number_of_electrons
         )
+        indices = []
+        amplitudes = []
+        for term, coefficient in raw_fermion_generator.terms.items():
+            index = parameter_indices.get(term)
+            if index is not None and abs(coefficient) > screening_threshold:
+                indices.append(index)
+                amplitudes.append(coefficient)
 
-        params_vector = np.zeros(self.number_of_params)
-
-        for term, coeff in screened_mp2_operator.terms.items():
-            if term in ansatz_operator.terms.keys():
-                params_vector[int(ansatz_operator.terms[term]) - 1] = coeff
+        params_vector = np.zeros(self.full_number_of_params)
+        params_vector[indices] = amplitudes
 
+        if self._active_parameter_indices is not None:
+            return params_vector[self._active_parameter_indices]
         return params_vector
 
     def generate_circuit_from_fermion_generator(
@@ -181,35 +495,119 @@ class SingletUCCSDAnsatz(Ansatz):
         Args:
             params: parameters of the circuit.
         """
+        if params is None:
+            if self._circuit_cache is not None:
+                return self._get_cached_parametrized_circuit()
+            params = np.asarray(self.symbols)
+
+        tapering = self._get_tapering()
         circuit = build_hartree_fock_circuit(
-            self.number_of_qubits,
+            self.number_of_spin_orbitals,
             self.number_of_alpha_electrons,
             self._number_of_beta_electrons,
             self._transformation,
+            tapering=tapering,
         )
-        if params is None:
-            params = np.asarray(
-                [
-                    sympy.Symbol("theta_" + str(i), real=True)
-                    for i in range(self.number_of_params)
-                ]
-            )
         # Build UCCSD generator
-        fermion_generator = uccsd_singlet_generator(
-            params,
-            self.number_of_qubits,
-            self.number_of_electrons,
-            anti_hermitian=True,
-        )
+        with profile_stage("uccsd_generator") as stage:
+            fermion_generator = self._build_fermion_generator(params)
+            stage.set_output(fermion_generator)
+
+        self._assert_compilation()
+        if self._compilation == "fermionic_excitations":
+            evolution_operator = compile_fermionic_excitations(
+                fermion_generator, self.number_of_spin_orbitals, self._optimize_circuit
+            )
+        else:
+            evolution_operator = exponentiate_fermion_operator(
+                fermion_generator,
+                self._transformation,
+                self.number_of_spin_orbitals,
+                self._optimize_circuit,
+                self._workers,
+                tapering,
+            )
+
+        circuit += evolution_operator
+        return circuit
+
+    def iterate_circuit_blocks(
+        self, params: Optional[np.ndarray] = None
+    ) -> Iterator[Circuit]:
+        """Generates the circuit of the ansatz block by block.
+
+        The first block prepares the Hartree-Fock state. With "fermionic_excitations"
+        compilation each following block implements a single excitation of the UCCSD
+        generator, with "pauli" compilation a chunk of consecutive Pauli
+        exponentials of the transformed generator, see
+        `iterate_exponentiated_fermion_operator`. The blocks concatenate to the
+        circuit of the ansatz. They are built only when requested, so a consumer
+        writing or simulating them one at a time never holds more than one block
+        in memory.
+
+        Args:
+            params: parameters of the circuit. If None, blocks are parametrized by
+                the symbols of the ansatz.
+
+        Raises:
+            ValueError: if the circuit is optimized, since redundant gates are
+                cancelled across block boundaries.
+        """
+        self._assert_compilation()
+        if self._optimize_circuit:
+            raise ValueError(
+                "Circuit blocks can't be generated for an optimized circuit."
+            )
+        if params is None:
+            params = np.asarray(self.symbols)
 
-        evolution_operator = exponentiate_fermion_operator(
-            fermion_generator,
+        tapering = self._get_tapering()
+        yield build_hartree_fock_circuit(
+            self.number_of_spin_orbitals,
+            self.number_of_alpha_electrons,
+            self._number_of_beta_electrons,
             self._transformation,
-            self.number_of_qubits,
+            tapering=tapering,
         )
+        fermion_generator = self._build_fermion_generator(params)
+        if self._compilation == "fermionic_excitations":
+            for term, coefficient in get_fermionic_excitations(fermion_generator):
+                yield compile_fermionic_excitations(
+                    get_excitation_generator(term, coefficient),
+                    self.number_of_spin_orbitals,
+                )
+        else:
+            yield from iterate_exponentiated_fermion_operator(
+                fermion_generator,
+                self._transformation,
+                self.number_of_spin_orbitals,
+                self._workers,
+                tapering,
+            )
 
-        circuit += evolution_operator
-        return circuit
+    def _get_cached_parametrized_circuit(self) -> Circuit:
+        assert self._circuit_cache is not None
+        key = self._circuit_cache.get_key(
+            type(self),
+            {
+                "number_of_spatial_orbitals": self.number_of_spatial_orbitals,
+                "number_of_alpha_electrons": self.number_of_alpha_electrons,
+                "transformation": self.transformation,
+                "optimize_circuit": self._optimize_circuit,
+                "compilation": self._compilation,
+                "active_parameter_indices": self.active_parameter_indices,
+                "taper_qubits": self._taper_qubits,
+            },
+        )
+        symbols = self.symbols
+        template = self._circuit_cache.load_template(key, symbols)
+        if template is None:
+            circuit = self._generate_circuit(np.asarray(symbols))
+            self._circuit_cache.save(key, circuit, symbols)
+            return circuit
+        # Reused by `circuit_template`, which then needs no analysis of the gates
+        self._circuit_template = template
+        return template.circuit
 
     def _assert_number_of_spatial_orbitals(self):
         if self._number_of_spatial_orbitals < 2:
@@ -229,6 +627,32 @@ class SingletUCCSDAnsatz(Ansatz):
                 )
             )
 
+    def _assert_active_parameter_indices(self):
+        indices = self._active_parameter_indices
+        if indices is None:
+            return
+        if indices != sorted(set(indices)) or any(
+            index < 0 or index >= self.full_number_of_params for index in indices
+        ):
+            raise ValueError(
+                "Active parameter indices must be unique, sorted and smaller than "
+                "{0}, got {1}.".format(self.full_number_of_params, indices)
+            )
+
+    def _assert_compilation(self):
+        if self._compilation not in ("pauli", "fermionic_excitations"):
+            raise ValueError(f"Unrecognized compilation {self._compilation}.")
+        if (
+            self._compilation == "fermionic_excitations"
+            and self._transformation != "Jordan-Wigner"
+        ):
+            raise ValueError(
+                "Compilation into fermionic excitations requires Jordan-Wigner "
+                "transformation."
+            )
+        if self._compilation != "pauli" and self._taper_qubits:
+            raise ValueError("Tapering qubits requires Pauli compilation.")
+
     def _assert_number_of_layers(self):
         if self._number_of_layers != 1:
             raise (
@@ -0,0 +1,152 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""In-place NumPy kernels for applying gates directly to a statevector.
+
+Statevectors are 1D complex arrays of length 2**number_of_qubits using big-endian
+ordering, i.e. qubit 0 corresponds to the most significant bit of the index.
+"""
+
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .common import bit_parity
+
+
+def _single_qubit_view(
+    statevector: np.ndarray, number_of_qubits: int, qubit: int
+) -> np.ndarray:
+    """View of the statevector with the given qubit as the middle axis."""
+    return statevector.reshape(2**qubit, 2, 2 ** (number_of_qubits - qubit - 1))
+
+
+def initial_statevector(
+    number_of_qubits: int, initial_state: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Statevector to be evolved in place by the kernels in this module.
+
+    Args:
+        number_of_qubits: number of qubits.
+        initial_state: initial amplitudes. Defaults to |0...0>.
+
+    Returns:
+        new complex array, never aliasing `initial_state`.
+    """
+    if initial_state is None:
+        statevector = np.zeros(2**number_of_qubits, dtype=np.complex128)
+        statevector[0] = 1.0
+        return statevector
+
+    statevector = np.array(initial_state, dtype=np.complex128)
+    if statevector.shape != (2**number_of_qubits,):
+        raise ValueError(
+            f"Initial state for {number_of_qubits} qubits should have "
+            f"{2 ** number_of_qubits} amplitudes, got {statevector.shape}."
+        )
+    return statevector
+
+
+def apply_rz(
+    statevector: np.ndarray, number_of_qubits: int, qubit: int, angle: float
+) -> None:
+    """Apply RZ(angle) = exp(-i angle Z / 2) as a diagonal phase multiplication."""
+    view = _single_qubit_view(statevector, number_of_qubits, qubit)
+    view[:, 0, :] *= np.exp(-0.5j * angle)
+    view[:, 1, :] *= np.exp(0.5j * angle)
+
+
+def apply_rx(
+    statevector: np.ndarray, number_of_qubits: int, qubit: int, angle: float
+) -> None:
+    """Apply RX(angle) = exp(-i angle X / 2)."""
+    view = _single_qubit_view(statevector, number_of_qubits, qubit)
+    cos, minus_i_sin = np.cos(angle / 2), -1j * np.sin(angle / 2)
+    zero_amplitudes = view[:, 0, :].copy()
+    view[:, 0, :] *= cos
+    view[:, 0, :] += minus_i_sin * view[:, 1, :]
+    view[:, 1, :] *= cos
+    view[:, 1, :] += minus_i_sin * zero_amplitudes
+
+
+def apply_cnot(
+    statevector: np.ndarray, number_of_qubits: int, control: int, target: int
+) -> None:
+    """Apply CNOT by swapping the target amplitudes where control is set."""
+    if control == target:
+        raise ValueError("Control and target of CNOT have to be different qubits.")
+    tensor = statevector.reshape((2,) * number_of_qubits)
+    target_zero = [slice(None)] * number_of_qubits
+    target_zero[control] = 1
+    target_one = list(target_zero)
+    target_zero[target] = 0
+    target_one[target] = 1
+    swapped = tensor[tuple(target_zero)].copy()
+    tensor[tuple(target_zero)] = tensor[tuple(target_one)]
+    tensor[tuple(target_one)] = swapped
+
+
+PauliTerm = Tuple[Tuple[int, str], ...]
+
+
+@lru_cache(maxsize=8)
+def _basis_indices(number_of_qubits: int) -> np.ndarray:
+    indices = np.arange(2**number_of_qubits, dtype=np.int64)
+    indices.setflags(write=False)
+    return indices
+
+
+def apply_pauli_string(
+    statevector: np.ndarray, number_of_qubits: int, pauli_term: PauliTerm
+) -> np.ndarray:
+    """Compute P|psi> for Pauli string P given as ((qubit, "X"|"Y"|"Z"), ...).
+
+    Returns:
+        new array with the result, `statevector` is left untouched.
+    """
+    flip_mask = 0
+    phase_mask = 0
+    number_of_ys = 0
+    for qubit, pauli in pauli_term:
+        bit = 1 << (number_of_qubits - qubit - 1)
+        if pauli in ("X", "Y"):
+            flip_mask |= bit
+        if pauli in ("Y", "Z"):
+            phase_mask |= bit
+        number_of_ys += pauli == "Y"
+
+    indices = _basis_indices(number_of_qubits)
+    # P|x> = i^(#Y) (-1)^(popcount(x & phase_mask)) |x ^ flip_mask>
+    signs = 1 - 2 * bit_parity(indices & phase_mask)
+    result = np.empty_like(statevector)
+    result[indices ^ flip_mask] = (1j**number_of_ys) * signs * statevector
+    return result
+
+
+def apply_pauli_rotation(
+    statevector: np.ndarray, number_of_qubits: int, pauli_term: PauliTerm, angle: float
+) -> None:
+    """Apply exp(-i angle P / 2) for Pauli string P."""
+    rotated = apply_pauli_string(statevector, number_of_qubits, pauli_term)
+    statevector *= np.cos(angle / 2)
+    statevector += -1j * np.sin(angle / 2) * rotated
+
+
+def apply_qubit_operator(
+    qubit_operator, statevector: np.ndarray, number_of_qubits: int
+) -> np.ndarray:
+    """Compute O|psi> for a QubitOperator O.
+
+    Returns:
+        new array with the result, `statevector` is left untouched.
+    """
+    result = np.zeros_like(statevector)
+    for term, coefficient in qubit_operator.terms.items():
+        if term:
+            result += coefficient * apply_pauli_string(
+                statevector, number_of_qubits, term
+            )
+        else:
+            result += coefficient * statevector
+    return result
@@ -0,0 +1,290 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Removal of qubits using Z2 symmetries ("qubit tapering").
+
+If commuting Pauli strings tau_1, ..., tau_k made of Z only commute with every
+term of an operator, the Clifford unitary U = prod_i (X_{q_i} + tau_i) / sqrt(2)
+maps tau_i to X_{q_i}, where q_i is a qubit acted on only by tau_i. Terms of
+U H U then act on q_i with I or X only, and within the sector of fixed
+eigenvalues s_i of tau_i the qubits q_i can be removed by replacing X_{q_i} with
+s_i. A basis state |b> in that sector is mapped to |b> with the bits q_i removed.
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+from zquantum.core.openfermion import QubitOperator
+
+from .statevector import PauliTerm
+
+_PAULI_PRODUCTS = {
+    ("X", "Y"): (1j, "Z"),
+    ("Y", "X"): (-1j, "Z"),
+    ("Y", "Z"): (1j, "X"),
+    ("Z", "Y"): (-1j, "X"),
+    ("Z", "X"): (1j, "Y"),
+    ("X", "Z"): (-1j, "Y"),
+}
+
+
+def _multiply_pauli_terms(
+    first_term: PauliTerm, second_term: PauliTerm
+) -> Tuple[complex, PauliTerm]:
+    """Phase and Pauli string of the product of two Pauli strings."""
+    paulis = dict(first_term)
+    phase: complex = 1
+    for qubit, pauli in second_term:
+        if qubit not in paulis:
+            paulis[qubit] = pauli
+        elif paulis[qubit] == pauli:
+            del paulis[qubit]
+        else:
+            factor, paulis[qubit] = _PAULI_PRODUCTS[(paulis[qubit], pauli)]
+            phase *= factor
+    return phase, tuple(sorted(paulis.items()))
+
+
+def _gf2_row_reduce(
+    matrix: np.ndarray, number_of_pivot_columns: int
+) -> Tuple[np.ndarray, List[int]]:
+    """Reduced row echelon form of a binary matrix over GF(2), with pivots
+    chosen among the first columns.
+
+    Returns:
+        reduced matrix and pivot columns, pivot i lying in row i.
+    """
+    matrix = np.array(matrix, dtype=np.uint8) % 2
+    pivot_columns: List[int] = []
+    for column in range(number_of_pivot_columns):
+        row = len(pivot_columns)
+        if row == len(matrix):
+            break
+        candidate_rows = np.flatnonzero(matrix[row:, column])
+        if not len(candidate_rows):
+            continue
+        matrix[[row, row + candidate_rows[0]]] = matrix[[row + candidate_rows[0], row]]
+        other_rows = np.flatnonzero(matrix[:, column])
+        matrix[other_rows[other_rows != row]] ^= matrix[row]
+        pivot_columns.append(column)
+    return matrix, pivot_columns
+
+
+def _gf2_inverse(matrix: np.ndarray) -> np.ndarray:
+    size = len(matrix)
+    reduced_matrix, pivot_columns = _gf2_row_reduce(
+        np.hstack([matrix, np.eye(size, dtype=np.uint8)]), size
+    )
+    if len(pivot_columns) != size:
+        raise ValueError("Matrix is not invertible over GF(2).")
+    return reduced_matrix[:, size:]
+
+
+def _get_encoding_matrix(number_of_qubits: int, transformation: str) -> np.ndarray:
+    """Binary matrix mapping occupations of spin-orbitals to states of qubits."""
+    qubits = np.arange(number_of_qubits)
+    if transformation == "Jordan-Wigner":
+        return np.eye(number_of_qubits, dtype=np.uint8)
+    if transformation == "Parity":
+        # Qubit i stores the parity of spin-orbitals 0, ..., i
+        return np.tril(np.ones((number_of_qubits, number_of_qubits), dtype=np.uint8))
+    if transformation == "Bravyi-Kitaev":
+        # Qubit i stores the parity of spin-orbitals i & (i + 1), ..., i
+        return (
+            (qubits[None, :] <= qubits[:, None])
+            & (qubits[None, :] >= (qubits & (qubits + 1))[:, None])
+        ).astype(np.uint8)
+    raise RuntimeError(f"Unrecognized transformation {transformation}")
+
+
+def _get_z_term(qubits: Sequence[int]) -> PauliTerm:
+    return tuple((int(qubit), "Z") for qubit in qubits)
+
+
+def find_z2_symmetries(
+    qubit_operator: QubitOperator, number_of_qubits: int
+) -> List[PauliTerm]:
+    """Finds independent Pauli strings made of Z only commuting with every term
+    of the operator.
+
+    A string of Z on qubits v commutes with a Pauli string iff the string acts
+    with X or Y on an even number of qubits in v, so the symmetries form the
+    kernel over GF(2) of the matrix of X/Y positions of the terms.
+
+    Args:
+        qubit_operator: operator, e.g. a qubit Hamiltonian.
+        number_of_qubits: number of qubits the operator acts on.
+
+    Returns:
+        generators of the group of Z-type symmetries.
+    """
+    flip_matrix = np.zeros((len(qubit_operator.terms), number_of_qubits), np.uint8)
+    for row, term in enumerate(qubit_operator.terms):
+        for qubit, pauli in term:
+            flip_matrix[row, qubit] = pauli in ("X", "Y")
+    reduced_matrix, pivot_columns = _gf2_row_reduce(flip_matrix, number_of_qubits)
+
+    symmetries = []
+    for free_column in sorted(set(range(number_of_qubits)) - set(pivot_columns)):
+        qubits = [free_column] + [
+            pivot_column
+            for row, pivot_column in enumerate(pivot_columns)
+            if reduced_matrix[row, free_column]
+        ]
+        symmetries.append(_get_z_term(sorted(qubits)))
+    return symmetries
+
+
+def get_spin_parity_symmetries(
+    number_of_qubits: int, transformation: str
+) -> List[PauliTerm]:
+    """Pauli strings measuring parities of the numbers of alpha and beta electrons.
+
+    Both are symmetries of any molecular Hamiltonian and of number-conserving
+    ansatzes like UCCSD, with interleaved spin ordering.
+
+    Args:
+        number_of_qubits: number of qubits (spin-orbitals).
+        transformation: transformation used for translation between fermions
+            and qubits.
+    """
+    # Occupation of spin-orbital p is the parity of qubits in row p of the inverse
+    decoding_matrix = _gf2_inverse(
+        _get_encoding_matrix(number_of_qubits, transformation)
+    )
+    return [
+        _get_z_term(np.flatnonzero(decoding_matrix[first_orbital::2].sum(axis=0) % 2))
+        for first_orbital in (0, 1)
+    ]
+
+
+class Z2Tapering:
+    def __init__(
+        self,
+        symmetries: Sequence[PauliTerm],
+        eigenvalues: Sequence[int],
+        number_of_qubits: int,
+    ):
+        """Maps operators and basis states to the space with qubits removed using
+        Z-type Z2 symmetries.
+
+        Args:
+            symmetries: Pauli strings made of Z only, e.g. from
+                `find_z2_symmetries` or `get_spin_parity_symmetries`. They need
+                not be independent.
+            eigenvalues: eigenvalue (+1 or -1) of each symmetry in the sector
+                of interest.
+            number_of_qubits: number of qubits before tapering.
+
+        Attributes:
+            symmetries: independent symmetries in reduced form, symmetry i being
+                the only one acting on tapered_qubits[i].
+            eigenvalues: eigenvalues of the reduced symmetries.
+            tapered_qubits: qubits that are removed.
+            number_of_qubits: See Args
+            reduced_number_of_qubits: number of qubits after tapering.
+        """
+        if len(symmetries) != len(eigenvalues):
+            raise ValueError("Expected one eigenvalue per symmetry.")
+        # Symmetries as rows of Z positions, with the eigenvalue's sign bit in
+        # the last column: eigenvalues multiply when symmetries are multiplied.
+        matrix = np.zeros((len(symmetries), number_of_qubits + 1), dtype=np.uint8)
+        for row, (symmetry, eigenvalue) in enumerate(zip(symmetries, eigenvalues)):
+            if eigenvalue not in (1, -1):
+                raise ValueError(f"Eigenvalues must be 1 or -1, got {eigenvalue}.")
+            for qubit, pauli in symmetry:
+                if pauli != "Z":
+                    raise ValueError(f"Symmetry {symmetry} is not made of Z only.")
+                matrix[row, qubit] = 1
+            matrix[row, -1] = eigenvalue == -1
+        reduced_matrix, pivot_columns = _gf2_row_reduce(matrix, number_of_qubits)
+        if reduced_matrix[len(pivot_columns) :, -1].any():
+            raise ValueError("Eigenvalues of dependent symmetries are inconsistent.")
+
+        self.symmetries = [
+            _get_z_term(np.flatnonzero(row[:-1]))
+            for row in reduced_matrix[: len(pivot_columns)]
+        ]
+        self.eigenvalues = [
+            1 - 2 * int(row[-1]) for row in reduced_matrix[: len(pivot_columns)]
+        ]
+        self.tapered_qubits = pivot_columns
+        self.number_of_qubits = number_of_qubits
+        self.reduced_number_of_qubits = number_of_qubits - len(pivot_columns)
+        self._new_qubit_indices = {
+            qubit: index
+            for index, qubit in enumerate(
+                sorted(set(range(number_of_qubits)) - set(pivot_columns))
+            )
+        }
+
+    @classmethod
+    def from_bitstring(
+        cls, symmetries: Sequence[PauliTerm], bitstring: Sequence[int]
+    ) -> "Z2Tapering":
+        """Tapering in the sector of the computational basis state |bitstring>,
+        e.g. the Hartree-Fock state."""
+        eigenvalues = [
+            (-1) ** sum(int(bitstring[qubit]) for qubit, _ in symmetry)
+            for symmetry in symmetries
+        ]
+        return cls(symmetries, eigenvalues, len(bitstring))
+
+    def taper_pauli_term(self, pauli_term: PauliTerm) -> Tuple[int, PauliTerm]:
+        """Maps a Pauli string commuting with the symmetries to the reduced space.
+
+        Returns:
+            sign and Pauli string on the remaining qubits, such that the string is
+            mapped to sign times the returned string.
+        """
+        phase: complex = 1
+        for symmetry, tapered_qubit in zip(self.symmetries, self.tapered_qubits):
+            paulis = dict(pauli_term)
+            if sum(paulis.get(qubit) in ("X", "Y") for qubit, _ in symmetry) % 2:
+                raise ValueError(
+                    f"Pauli term {pauli_term} doesn't commute with symmetry "
+                    f"{symmetry}."
+                )
+            # Terms anticommuting with X_q are mapped to term * tau * X_q
+            if paulis.get(tapered_qubit) in ("Y", "Z"):
+                factor, pauli_term = _multiply_pauli_terms(pauli_term, symmetry)
+                phase *= factor
+                factor, pauli_term = _multiply_pauli_terms(
+                    pauli_term, ((tapered_qubit, "X"),)
+                )
+                phase *= factor
+
+        sign = int(round(phase.real))
+        eigenvalues = dict(zip(self.tapered_qubits, self.eigenvalues))
+        tapered_term = []
+        for qubit, pauli in pauli_term:
+            if qubit in eigenvalues:
+                sign *= eigenvalues[qubit]
+            else:
+                tapered_term.append((self._new_qubit_indices[qubit], pauli))
+        return sign, tuple(tapered_term)
+
+    def taper_qubit_operator(self, qubit_operator: QubitOperator) -> QubitOperator:
+        """Maps an operator commuting with the symmetries, e.g. the Hamiltonian,
+        to the reduced space. Terms are kept in the order of their first
+        appearance."""
+        tapered_operator = QubitOperator()
+        for pauli_term, coefficient in qubit_operator.terms.items():
+            sign, tapered_term = self.taper_pauli_term(pauli_term)
+            tapered_operator.terms[tapered_term] = (
+                tapered_operator.terms.get(tapered_term, 0) + sign * coefficient
+            )
+        return tapered_operator
+
+    def taper_bitstring(self, bitstring: Sequence[int]) -> np.ndarray:
+        """Maps a computational basis state in the sector of the tapering to the
+        reduced space."""
+        bitstring = np.asarray(bitstring)
+        for symmetry, eigenvalue in zip(self.symmetries, self.eigenvalues):
+            if (-1) ** sum(int(bitstring[qubit]) for qubit, _ in symmetry) != (
+                eigenvalue
+            ):
+                raise ValueError(
+                    f"State {bitstring.tolist()} is not in the sector of the tapering."
+                )
+        return bitstring[sorted(self._new_qubit_indices)]
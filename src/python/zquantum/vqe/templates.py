@@ -0,0 +1,162 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from typing import List, Sequence, Tuple
+
+import numpy as np
+import sympy
+from scipy.sparse import csr_matrix
+from zquantum.core.circuits import Circuit
+
+from .common import split_linear_expression
+
+
+class LinearCircuitTemplate:
+    def __init__(self, circuit: Circuit, symbols: Sequence[sympy.Symbol]):
+        """Symbolic circuit precompiled for fast parameter binding.
+
+        Every symbolic gate parameter of the circuit has to be a linear function of
+        the symbols. The circuit is analyzed once: each parametrized gate is
+        indexed to the symbols it depends on, so that binding a parameter vector
+        only evaluates all gate angles at once and swaps the affected gates.
+
+        Gate parameters are given by `coefficients @ params + offsets`, where
+        `coefficients` is a sparse matrix with one row per parametrized gate
+        parameter and one column per symbol. Batches of parameter vectors are
+        evaluated with a single matrix product.
+
+        Args:
+            circuit: parametrized circuit.
+            symbols: symbols of the circuit, in the order in which parameters are
+                passed to `bind`.
+
+        Attributes:
+            circuit: See Args
+            symbols: See Args
+            coefficients: sparse matrix of shape (number of parametrized gate
+                parameters, number of symbols).
+            offsets: constant parts of the parametrized gate parameters.
+        """
+        self.circuit = circuit
+        self.symbols = list(symbols)
+        symbol_indices = {symbol: index for index, symbol in enumerate(self.symbols)}
+
+        # Each slot is (operation index, position of the parameter in the gate)
+        self._slots: List[Tuple[int, int]] = []
+        row_indices: List[int] = []
+        column_indices: List[int] = []
+        values: List[float] = []
+        offsets: List[float] = []
+        for operation_index, operation in enumerate(circuit.operations):
+            for position, param in enumerate(operation.params):
+                if not isinstance(param, sympy.Expr) or not param.free_symbols:
+                    continue
+                coefficients, offset = split_linear_expression(param, symbol_indices)
+                row_indices += [len(self._slots)] * len(coefficients)
+                column_indices += coefficients.keys()
+                values += coefficients.values()
+                self._slots.append((operation_index, position))
+                offsets.append(offset)
+
+        self.coefficients = csr_matrix(
+            (values, (row_indices, column_indices)),
+            shape=(len(self._slots), len(self.symbols)),
+        )
+        self.offsets = np.asarray(offsets, dtype=float)
+
+    @classmethod
+    def from_coefficients(
+        cls,
+        circuit: Circuit,
+        symbols: Sequence[sympy.Symbol],
+        slots: Sequence[Tuple[int, int]],
+        coefficients: csr_matrix,
+        offsets: np.ndarray,
+    ) -> "LinearCircuitTemplate":
+        """Template of a circuit whose linear gate parameters are already known,
+        e.g. from the construction of the circuit, without analyzing its gates.
+
+        Args:
+            circuit: parametrized circuit.
+            symbols: symbols of the circuit, in the order in which parameters are
+                passed to `bind`.
+            slots: (operation index, position of the parameter in the gate) of
+                every parametrized gate parameter, in the order of `coefficients`.
+            coefficients: sparse matrix of shape (len(slots), number of symbols).
+            offsets: constant parts of the parametrized gate parameters.
+        """
+        template = cls.__new__(cls)
+        template.circuit = circuit
+        template.symbols = list(symbols)
+        template._slots = list(slots)
+        template.coefficients = csr_matrix(coefficients)
+        template.offsets = np.asarray(offsets, dtype=float)
+        if template.coefficients.shape != (len(template._slots), len(template.symbols)):
+            raise ValueError(
+                f"Expected coefficients of shape ({len(template._slots)}, "
+                f"{len(template.symbols)}), got {template.coefficients.shape}."
+            )
+        return template
+
+    @property
+    def number_of_params(self) -> int:
+        return len(self.symbols)
+
+    def gate_parameters(self, params: np.ndarray) -> np.ndarray:
+        """Values of all parametrized gate parameters.
+
+        Args:
+            params: parameter vector or 2D array with one parameter vector per row.
+
+        Returns:
+            array of gate parameters, with one row per parameter vector if `params`
+            is 2D.
+        """
+        params = np.asarray(params, dtype=float)
+        if params.ndim not in (1, 2) or params.shape[-1] != self.number_of_params:
+            raise ValueError(
+                f"Expected {self.number_of_params} parameters, got {params.shape}."
+            )
+        return (self.coefficients @ params.T).T + self.offsets
+
+    def bind(self, params: np.ndarray) -> Circuit:
+        """Create executable circuit for given parameter vector.
+
+        Args:
+            params: parameters, ordered as `symbols`.
+
+        Returns:
+            circuit with all symbolic parameters replaced by numerical values.
+        """
+        params = np.asarray(params, dtype=float)
+        if params.ndim != 1:
+            raise ValueError(f"Expected 1D parameter vector, got {params.shape}.")
+        return self._build_circuit(self.gate_parameters(params))
+
+    def bind_batch(self, params_batch: np.ndarray) -> List[Circuit]:
+        """Create executable circuits for many parameter vectors at once.
+
+        Args:
+            params_batch: 2D array with one parameter vector per row.
+
+        Returns:
+            list of executable circuits, one per row of `params_batch`.
+        """
+        params_batch = np.asarray(params_batch, dtype=float)
+        if params_batch.ndim != 2:
+            raise ValueError(
+                f"Expected 2D array of parameters, got {params_batch.shape}."
+            )
+        return [
+            self._build_circuit(gate_parameters)
+            for gate_parameters in self.gate_parameters(params_batch)
+        ]
+
+    def _build_circuit(self, gate_parameters: np.ndarray) -> Circuit:
+        operations = list(self.circuit.operations)
+        for (operation_index, position), value in zip(self._slots, gate_parameters):
+            operation = operations[operation_index]
+            new_params = list(operation.params)
+            new_params[position] = float(value)
+            operations[operation_index] = operation.replace_params(tuple(new_params))
+        return Circuit(operations, n_qubits=self.circuit.n_qubits)
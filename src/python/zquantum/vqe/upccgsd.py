@@ -0,0 +1,222 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from typing import List, Optional, Tuple
+
+import numpy as np
+import sympy
+from overrides import overrides
+from zquantum.core.circuits import Circuit
+from zquantum.core.interfaces.ansatz import Ansatz
+from zquantum.core.interfaces.ansatz_utils import (
+    ansatz_property,
+    invalidates_parametrized_circuit,
+)
+from zquantum.core.openfermion import FermionOperator
+
+from .common import get_excitation_generator
+from .utils import build_hartree_fock_circuit, exponentiate_fermion_operator
+
+
+class UpCCGSDAnsatz(Ansatz):
+
+    supports_parametrized_circuits = True
+    transformation = ansatz_property("transformation")
+    optimize_circuit = ansatz_property("optimize_circuit")
+
+    def __init__(
+        self,
+        number_of_spatial_orbitals: int,
+        number_of_alpha_electrons: int,
+        number_of_layers: int = 1,
+        transformation: str = "Jordan-Wigner",
+        optimize_circuit: bool = False,
+    ):
+        """
+        Ansatz class representing the k-UpCCGSD ansatz (k products of unitary
+        pair coupled-cluster with generalized singles and doubles).
+
+        Each layer applies exp(-G_k) to the Hartree-Fock state, where G_k contains
+        for every pair of neighbouring spatial orbitals p, q = p + 1 a spin-adapted
+        generalized single excitation, i.e. the same parameter for the alpha and
+        beta excitations from p to q, and a pair double excitation moving both
+        electrons of p to q. Every layer has its own parameters,
+        2 * (number_of_spatial_orbitals - 1) of them, and is exponentiated with
+        `exponentiate_fermion_operator`. Restricting the excitations to
+        neighbouring orbitals keeps the number of parameters and gates per layer
+        linear in the number of orbitals; excitations between distant orbitals are
+        generated by products of layers.
+
+        Args:
+            number_of_spatial_orbitals: number of spatial orbitals.
+            number_of_alpha_electrons: number of alpha electrons.
+            number_of_layers: number of layers k of the ansatz.
+            transformation: transformation used for translation between fermions
+                and qubits.
+            optimize_circuit: if True, each layer is compiled with Pauli term
+                ordering and gate cancellation, see
+                `exponentiate_fermion_operator`.
+
+        Attributes:
+            number_of_beta_electrons: number of beta electrons
+                (equal to number_of_alpha_electrons).
+            number_of_electrons: total number of electrons (number_of_alpha_electrons
+                + number_of_beta_electrons).
+            number_of_qubits: number of qubits required for the ansatz circuit.
+            number_of_params_per_layer: number of parameters of a single layer.
+            number_of_params: total number of parameters of the ansatz.
+        """
+        super().__init__(number_of_layers=number_of_layers)
+        self._number_of_layers = number_of_layers
+        self._assert_number_of_layers()
+        self._number_of_spatial_orbitals = number_of_spatial_orbitals
+        self._number_of_alpha_electrons = number_of_alpha_electrons
+        self._assert_number_of_spatial_orbitals()
+        self._transformation = transformation
+        self._optimize_circuit = optimize_circuit
+
+    @property
+    def number_of_layers(self):
+        return self._number_of_layers
+
+    @invalidates_parametrized_circuit  # type: ignore
+    @number_of_layers.setter
+    def number_of_layers(self, new_number_of_layers):
+        self._number_of_layers = new_number_of_layers
+        self._assert_number_of_layers()
+
+    @property
+    def number_of_spatial_orbitals(self):
+        return self._number_of_spatial_orbitals
+
+    @invalidates_parametrized_circuit  # type: ignore
+    @number_of_spatial_orbitals.setter
+    def number_of_spatial_orbitals(self, new_number_of_spatial_orbitals):
+        self._number_of_spatial_orbitals = new_number_of_spatial_orbitals
+        self._assert_number_of_spatial_orbitals()
+
+    @property
+    def number_of_alpha_electrons(self):
+        return self._number_of_alpha_electrons
+
+    @invalidates_parametrized_circuit  # type: ignore
+    @number_of_alpha_electrons.setter
+    def number_of_alpha_electrons(self, new_number_of_alpha_electrons):
+        self._number_of_alpha_electrons = new_number_of_alpha_electrons
+        self._assert_number_of_spatial_orbitals()
+
+    @property
+    def number_of_beta_electrons(self):
+        return self._number_of_alpha_electrons
+
+    @property
+    def number_of_electrons(self):
+        return self._number_of_alpha_electrons + self.number_of_beta_electrons
+
+    @property
+    def number_of_qubits(self):
+        return self._number_of_spatial_orbitals * 2
+
+    @property
+    def number_of_params_per_layer(self) -> int:
+        return 2 * (self._number_of_spatial_orbitals - 1)
+
+    @property
+    def number_of_params(self) -> int:
+        """
+        Returns number of parameters in the ansatz.
+        """
+        return self._number_of_layers * self.number_of_params_per_layer
+
+    @property
+    def symbols(self) -> List[sympy.Symbol]:
+        """
+        Returns a list of symbolic parameters used for creating the ansatz.
+        The order of the symbols should match the order in which parameters
+        should be passed for creating executable circuit.
+        """
+        return [
+            sympy.Symbol("theta_{}".format(i), real=True)
+            for i in range(self.number_of_params)
+        ]
+
+    def _get_orbital_pairs(self) -> List[Tuple[int, int]]:
+        return [(p, p + 1) for p in range(self._number_of_spatial_orbitals - 1)]
+
+    def build_layer_generator(self, layer_params: np.ndarray) -> FermionOperator:
+        """Builds the anti-hermitian generator of a single layer.
+
+        Parameters of the singles come first, followed by those of the pair
+        doubles, both for orbital pairs (p, p + 1) in increasing order of p.
+
+        Args:
+            layer_params: number_of_params_per_layer parameters of the layer.
+        """
+        orbital_pairs = self._get_orbital_pairs()
+        if len(layer_params) != self.number_of_params_per_layer:
+            raise ValueError(
+                f"Expected {self.number_of_params_per_layer} parameters, "
+                f"got {len(layer_params)}."
+            )
+        single_params = layer_params[: len(orbital_pairs)]
+        double_params = layer_params[len(orbital_pairs) :]
+
+        generator = FermionOperator()
+        for (p, q), param in zip(orbital_pairs, single_params):
+            for spin in (0, 1):
+                generator += get_excitation_generator(
+                    ((2 * q + spin, 1), (2 * p + spin, 0)), param
+                )
+        for (p, q), param in zip(orbital_pairs, double_params):
+            generator += get_excitation_generator(
+                ((2 * q, 1), (2 * q + 1, 1), (2 * p + 1, 0), (2 * p, 0)), param
+            )
+        return generator
+
+    @overrides
+    def _generate_circuit(self, params: Optional[np.ndarray] = None) -> Circuit:
+        """
+        Returns a parametrizable circuit represention of the ansatz.
+        Args:
+            params: parameters of the circuit.
+        """
+        if params is None:
+            params = np.asarray(self.symbols)
+
+        circuit = build_hartree_fock_circuit(
+            self.number_of_qubits,
+            self._number_of_alpha_electrons,
+            self.number_of_beta_electrons,
+            self._transformation,
+        )
+        for layer_params in np.reshape(
+            params, (self._number_of_layers, self.number_of_params_per_layer)
+        ):
+            circuit += exponentiate_fermion_operator(
+                self.build_layer_generator(layer_params),
+                self._transformation,
+                self.number_of_qubits,
+                self._optimize_circuit,
+            )
+        return circuit
+
+    def _assert_number_of_spatial_orbitals(self):
+        if self._number_of_spatial_orbitals < 2:
+            raise ValueError(
+                "Number of spatials orbitals must be greater "
+                "or equal 2 and is {0}.".format(self._number_of_spatial_orbitals)
+            )
+        if self._number_of_spatial_orbitals <= self._number_of_alpha_electrons:
+            raise ValueError(
+                "Number of spatial orbitals must be greater than "
+                "number_of_alpha_electrons and is {0}".format(
+                    self._number_of_spatial_orbitals
+                )
+            )
+
+    def _assert_number_of_layers(self):
+        if self._number_of_layers < 1:
+            raise ValueError(
+                "Number of layers must be positive for k-UpCCGSD Ansatz and is "
+                "{0}".format(self._number_of_layers)
+            )
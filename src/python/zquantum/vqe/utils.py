@@ -1,25 +1,466 @@
 ################################################################################
 # © Copyright 2020-2022 Zapata Computing Inc.
 ################################################################################
-from typing import Optional, Union
+import logging
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import sympy
+from scipy.sparse import csr_matrix
 from zquantum.core.circuits import Circuit, X
 from zquantum.core.evolution import time_evolution
 from zquantum.core.openfermion import (
     FermionOperator,
     InteractionOperator,
+    QubitOperator,
     bravyi_kitaev,
     get_fermion_operator,
     jordan_wigner,
 )
 
+from .circuit_optimization import (
+    cancel_redundant_gates,
+    get_circuit_cost,
+    order_commuting_pauli_terms,
+)
+from .common import FermionTerm, split_linear_expression
+from .profiling import profile_stage, profiled
+from .statevector import PauliTerm
+from .tapering import Z2Tapering, get_spin_parity_symmetries
+from .templates import LinearCircuitTemplate
+
+logger = logging.getLogger(__name__)
+
+_EQ_TOLERANCE = 1e-8
+
+# Number of terms processed by a worker at once when building circuits in parallel
+_CHUNK_SIZE = 256
+
+_SUPPORTED_TRANSFORMATIONS = ["Jordan-Wigner", "Bravyi-Kitaev", "Parity"]
+
+# Qubit images of fermionic terms with unit coefficient, keyed by term,
+# transformation and number of qubits, in least recently used order
+_term_images: (
+    "OrderedDict[Tuple[FermionTerm, str, int], Tuple[Tuple[PauliTerm, complex], ...]]"
+) = OrderedDict()
+_TERM_IMAGES_MAX_SIZE = 2**15
+
+# Number of workers and process pool reused by parallel circuit construction
+_process_pool: Optional[Tuple[int, ProcessPoolExecutor]] = None
+
+
+def _parity_transform(
+    term: Tuple[Tuple[int, int], ...], number_of_qubits: int
+) -> QubitOperator:
+    """Image of a product of ladder operators under the parity encoding.
+
+    Qubit i holds the parity of occupations of spin-orbitals 0, ..., i, so
+    a_j^dagger = (Z_{j-1} X_j - i Y_j) X_{j+1} ... X_{n-1} / 2.
+    """
+    qubit_term = QubitOperator(())
+    for index, action in term:
+        update_string = tuple(
+            (qubit, "X") for qubit in range(index + 1, number_of_qubits)
+        )
+        parity_string = ((index - 1, "Z"),) if index > 0 else ()
+        qubit_term *= QubitOperator(
+            parity_string + ((index, "X"),) + update_string, 0.5
+        ) + QubitOperator(((index, "Y"),) + update_string, -0.5j if action else 0.5j)
+    qubit_term.compress()
+    return qubit_term
+
+
+def _compute_term_image(
+    term: FermionTerm, transformation: str, number_of_qubits: int
+) -> Tuple[Tuple[PauliTerm, complex], ...]:
+    if transformation == "Jordan-Wigner":
+        qubit_term = jordan_wigner(FermionOperator(term))
+    elif transformation == "Parity":
+        qubit_term = _parity_transform(term, number_of_qubits)
+    else:
+        qubit_term = bravyi_kitaev(FermionOperator(term), n_qubits=number_of_qubits)
+    return tuple(qubit_term.terms.items())
+
+
+def _compute_term_images(
+    terms: Sequence[FermionTerm], transformation: str, number_of_qubits: int
+) -> List[Tuple[Tuple[PauliTerm, complex], ...]]:
+    return [
+        _compute_term_image(term, transformation, number_of_qubits) for term in terms
+    ]
+
+
+def _store_term_image(
+    key: Tuple[FermionTerm, str, int], image: Tuple[Tuple[PauliTerm, complex], ...]
+) -> None:
+    _term_images[key] = image
+    if len(_term_images) > _TERM_IMAGES_MAX_SIZE:
+        _term_images.popitem(last=False)
+
+
+def _transform_fermion_term(
+    term: FermionTerm, transformation: str, number_of_qubits: int
+) -> Tuple[Tuple[PauliTerm, complex], ...]:
+    """Qubit image of a single fermionic term with unit coefficient.
+
+    The image depends only on the arguments, so it is cached process-wide and
+    reused e.g. by ansatzes rebuilt for many molecular geometries.
+    """
+    key = (term, transformation, number_of_qubits)
+    image = _term_images.get(key)
+    if image is None:
+        image = _compute_term_image(term, transformation, number_of_qubits)
+        _store_term_image(key, image)
+    else:
+        _term_images.move_to_end(key)
+    return image
+
+
+def _transform_fermion_terms(
+    terms: Sequence[FermionTerm],
+    transformation: str,
+    number_of_qubits: int,
+    executor: Optional[Executor] = None,
+) -> List[Tuple[Tuple[PauliTerm, complex], ...]]:
+    """Qubit images of fermionic terms. With an executor, terms missing in the
+    cache are transformed in chunks by its workers and their images are cached in
+    this process."""
+    if executor is None:
+        return [
+            _transform_fermion_term(term, transformation, number_of_qubits)
+            for term in terms
+        ]
+
+    missing_terms = [
+        term
+        for term in dict.fromkeys(terms)
+        if (term, transformation, number_of_qubits) not in _term_images
+    ]
+    chunks = _split_into_chunks(missing_terms)
+    computed_images = {}
+    for chunk, chunk_images in zip(
+        chunks,
+        executor.map(
+            _compute_term_images,
+            chunks,
+            [transformation] * len(chunks),
+            [number_of_qubits] * len(chunks),
+        ),
+    ):
+        for term, image in zip(chunk, chunk_images):
+            computed_images[term] = image
+            _store_term_image((term, transformation, number_of_qubits), image)
+    return [
+        (
+            computed_images[term]
+            if term in computed_images
+            else _transform_fermion_term(term, transformation, number_of_qubits)
+        )
+        for term in terms
+    ]
+
+
+def clear_transformation_cache() -> None:
+    """Removes the cached qubit images of fermionic terms, e.g. to measure how long
+    a circuit takes to build from scratch."""
+    _term_images.clear()
+
+
+def _split_into_chunks(items: Sequence) -> List[Sequence]:
+    return [
+        items[start : start + _CHUNK_SIZE]
+        for start in range(0, len(items), _CHUNK_SIZE)
+    ]
+
+
+def _get_process_pool(workers: int) -> Optional[Executor]:
+    """Process pool with the given number of workers, or None for a single one.
+
+    The pool is kept for later calls, so that worker processes are started only
+    once as long as the number of workers doesn't change.
+    """
+    global _process_pool
+    if workers < 1:
+        raise ValueError(f"Number of workers must be positive, got {workers}.")
+    if workers == 1:
+        return None
+    if _process_pool is None or _process_pool[0] != workers:
+        if _process_pool is not None:
+            _process_pool[1].shutdown()
+        _process_pool = (workers, ProcessPoolExecutor(max_workers=workers))
+    return _process_pool[1]
+
+
+def _find_symbols(fermion_generator: FermionOperator) -> List[sympy.Symbol]:
+    symbols: Dict[sympy.Symbol, None] = {}
+    for coefficient in fermion_generator.terms.values():
+        if isinstance(coefficient, sympy.Expr):
+            for symbol in sorted(coefficient.free_symbols, key=str):
+                symbols[symbol] = None
+    return list(symbols)
+
+
+def _get_number_of_qubits(fermion_generator: FermionOperator) -> int:
+    return 1 + max(
+        (index for term in fermion_generator.terms for index, _ in term),
+        default=-1,
+    )
+
+
+def _get_symbolic_qubit_generator(
+    fermion_generator: Union[FermionOperator, InteractionOperator],
+    transformation: str,
+    number_of_qubits: Optional[int],
+) -> QubitOperator:
+    """Transform antihermitian fermionic generator G to hermitian qubit operator H,
+    such that G = iH, keeping arbitrary sympy expressions as coefficients.
+
+    Slower than `_get_linear_qubit_generator`, which is used unless some
+    coefficient is not linear in its symbols, e.g. cos(theta) or theta * phi.
+    """
+    if isinstance(fermion_generator, InteractionOperator):
+        fermion_generator = get_fermion_operator(fermion_generator)
+    if number_of_qubits is None:
+        number_of_qubits = _get_number_of_qubits(fermion_generator)
+
+    qubit_generator = QubitOperator()
+    for term, coefficient in fermion_generator.terms.items():
+        for pauli_term, pauli_coefficient in _transform_fermion_term(
+            term, transformation, number_of_qubits
+        ):
+            qubit_generator.terms[pauli_term] = (
+                qubit_generator.terms.get(pauli_term, 0)
+                + coefficient * pauli_coefficient
+            )
 
+    for pauli_term, coefficient in list(qubit_generator.terms.items()):
+        if isinstance(coefficient, sympy.Expr):
+            coefficient = sympy.expand(coefficient)
+            is_hermitian = sympy.re(coefficient) == 0
+            coefficient = sympy.im(coefficient)
+            is_zero = coefficient == 0
+        else:
+            is_hermitian = np.isclose(coefficient.real, 0.0)
+            coefficient = float(coefficient.imag)
+            is_zero = abs(coefficient) <= _EQ_TOLERANCE
+        if not is_hermitian:
+            raise RuntimeError("Transformed fermion_generator is not anti-hermitian.")
+        if is_zero:
+            del qubit_generator.terms[pauli_term]
+        else:
+            qubit_generator.terms[pauli_term] = coefficient
+    return qubit_generator
+
+
+def _get_linear_qubit_generator(
+    fermion_generator: Union[FermionOperator, InteractionOperator],
+    transformation: str,
+    number_of_qubits: Optional[int],
+    symbols: Optional[Sequence[sympy.Symbol]] = None,
+    executor: Optional[Executor] = None,
+) -> Tuple[List[PauliTerm], csr_matrix, List[sympy.Symbol]]:
+    """Transform antihermitian fermionic generator G to hermitian qubit operator H,
+    such that G = iH, with coefficients of H stored as linear forms of the symbols.
+
+    Coefficients of the fermionic terms are split into linear forms once, so the
+    transformation, the anti-hermiticity check and the extraction of H are done
+    on numerical arrays only. If an executor is given, fermionic terms are
+    transformed in chunks by its workers.
+
+    Raises:
+        ValueError: if some coefficient is not linear in the symbols.
+
+    Returns:
+        Pauli terms of H, real sparse matrix with one row per Pauli term, whose
+        column 0 holds constant parts of the coefficients and column j + 1
+        coefficients of symbols[j], and the symbols themselves.
+    """
+    if transformation not in _SUPPORTED_TRANSFORMATIONS:
+        raise RuntimeError(f"Unrecognized transformation {transformation}")
+
+    # Pairs of (linear form of coefficient, qubit image of the term)
+    transformed_terms: List[
+        Tuple[Dict[int, complex], Sequence[Tuple[PauliTerm, complex]]]
+    ]
+    if transformation == "Jordan-Wigner" and isinstance(
+        fermion_generator, InteractionOperator
+    ):
+        symbols = [] if symbols is None else list(symbols)
+        transformed_terms = [
+            ({0: 1.0}, list(jordan_wigner(fermion_generator).terms.items()))
+        ]
+    else:
+        if isinstance(fermion_generator, InteractionOperator):
+            fermion_generator = get_fermion_operator(fermion_generator)
+        if number_of_qubits is None:
+            number_of_qubits = _get_number_of_qubits(fermion_generator)
+        symbols = _find_symbols(fermion_generator) if symbols is None else list(symbols)
+        symbol_indices = {symbol: index + 1 for index, symbol in enumerate(symbols)}
+        terms = list(fermion_generator.terms)
+        images = _transform_fermion_terms(
+            terms, transformation, number_of_qubits, executor
+        )
+        transformed_terms = []
+        for term, image in zip(terms, images):
+            coefficient = fermion_generator.terms[term]
+            if isinstance(coefficient, sympy.Expr) and coefficient.free_symbols:
+                linear_form, offset = split_linear_expression(
+                    coefficient, symbol_indices, complex
+                )
+                linear_form[0] = offset
+            else:
+                linear_form = {0: complex(coefficient)}
+            transformed_terms.append((linear_form, image))
+
+    pauli_term_indices: Dict[PauliTerm, int] = {}
+    row_indices: List[int] = []
+    column_indices: List[int] = []
+    values: List[complex] = []
+    for linear_form, image in transformed_terms:
+        for pauli_term, pauli_coefficient in image:
+            row_index = pauli_term_indices.setdefault(
+                pauli_term, len(pauli_term_indices)
+            )
+            for column_index, coefficient in linear_form.items():
+                row_indices.append(row_index)
+                column_indices.append(column_index)
+                values.append(coefficient * pauli_coefficient)
+
+    coefficients = csr_matrix(
+        (np.asarray(values, dtype=complex), (row_indices, column_indices)),
+        shape=(len(pauli_term_indices), len(symbols) + 1),
+    )
+    coefficients.sum_duplicates()
+    if not np.allclose(coefficients.data.real, 0.0):
+        raise RuntimeError("Transformed fermion_generator is not anti-hermitian.")
+    coefficients = coefficients.imag
+    coefficients.data[np.abs(coefficients.data) <= _EQ_TOLERANCE] = 0.0
+    coefficients.eliminate_zeros()
+
+    # Drop terms with vanishing coefficients
+    nonzero_rows = np.flatnonzero(np.diff(coefficients.indptr))
+    pauli_terms = list(pauli_term_indices)
+    return (
+        [pauli_terms[row_index] for row_index in nonzero_rows],
+        coefficients[nonzero_rows],
+        symbols,
+    )
+
+
+def _get_qubit_generator(
+    fermion_generator: Union[FermionOperator, InteractionOperator],
+    transformation: str,
+    number_of_qubits: Optional[int],
+    executor: Optional[Executor] = None,
+) -> QubitOperator:
+    """Transform antihermitian fermionic generator G to hermitian qubit operator H,
+    such that G = iH."""
+    with profile_stage("qubit_transformation") as stage:
+        try:
+            pauli_terms, coefficients, symbols = _get_linear_qubit_generator(
+                fermion_generator, transformation, number_of_qubits, executor=executor
+            )
+        except ValueError:
+            # Some coefficient is not linear in its symbols
+            qubit_generator = _get_symbolic_qubit_generator(
+                fermion_generator, transformation, number_of_qubits
+            )
+            stage.set_output(qubit_generator)
+            return qubit_generator
+        stage.set_output(pauli_terms)
+
+    with profile_stage("qubit_coefficients") as stage:
+        qubit_generator = _build_qubit_operator(pauli_terms, coefficients, symbols)
+        stage.set_output(qubit_generator)
+    return qubit_generator
+
+
+def _build_qubit_operator(
+    pauli_terms: Sequence[PauliTerm],
+    coefficients: csr_matrix,
+    symbols: Sequence[sympy.Symbol],
+) -> QubitOperator:
+    """Qubit operator with coefficients given as linear forms of the symbols, as
+    returned by `_get_linear_qubit_generator`."""
+    qubit_operator = QubitOperator()
+    for pauli_term, row in zip(pauli_terms, coefficients):
+        if row.indices.tolist() == [0]:
+            qubit_operator.terms[pauli_term] = float(row.data[0])
+        else:
+            qubit_operator.terms[pauli_term] = sympy.Add(
+                *(
+                    value if column_index == 0 else value * symbols[column_index - 1]
+                    for column_index, value in zip(row.indices, row.data.tolist())
+                )
+            )
+    return qubit_operator
+
+
+def _exponentiate_qubit_terms(terms: Sequence[Tuple[PauliTerm, object]]) -> Circuit:
+    qubit_operator = QubitOperator()
+    qubit_operator.terms.update(terms)
+    return time_evolution(qubit_operator, 1, method="Trotter", trotter_order=1)
+
+
+def _split_tapered_qubit_operator(
+    qubit_operator: QubitOperator, tapering: Z2Tapering
+) -> List[QubitOperator]:
+    """Tapered terms of the operator in their original order, split into
+    operators of consecutive terms with distinct Pauli strings. Terms mapped to
+    identity are dropped."""
+    qubit_operators = [QubitOperator()]
+    for pauli_term, coefficient in qubit_operator.terms.items():
+        sign, tapered_term = tapering.taper_pauli_term(pauli_term)
+        if not tapered_term:
+            continue
+        if tapered_term in qubit_operators[-1].terms:
+            qubit_operators.append(QubitOperator())
+        qubit_operators[-1].terms[tapered_term] = sign * coefficient
+    return qubit_operators
+
+
+def _exponentiate_qubit_operator(
+    qubit_operator: QubitOperator,
+    executor: Optional[Executor] = None,
+    tapering: Optional[Z2Tapering] = None,
+) -> Circuit:
+    """First order Trotter circuit of exp(-iH). With an executor, subcircuits of
+    chunks of consecutive terms are built by its workers and concatenated in
+    order, which gives the same circuit.
+
+    With tapering, every Pauli exponential is mapped to the tapered space
+    separately, so the circuit is the tapered image of the untapered one even if
+    several terms are mapped to the same Pauli string. Terms mapped to identity
+    only contribute a global phase.
+    """
+    if tapering is not None:
+        circuit = Circuit(n_qubits=tapering.reduced_number_of_qubits)
+        for tapered_operator in _split_tapered_qubit_operator(qubit_operator, tapering):
+            circuit += _exponentiate_qubit_operator(tapered_operator, executor)
+        return circuit
+
+    if executor is None:
+        return time_evolution(qubit_operator, 1, method="Trotter", trotter_order=1)
+
+    circuit = Circuit()
+    for subcircuit in executor.map(
+        _exponentiate_qubit_terms,
+        _split_into_chunks(list(qubit_operator.terms.items())),
+    ):
+        circuit += subcircuit
+    return circuit
+
+
+@profiled("exponentiate_fermion_operator")
 def exponentiate_fermion_operator(
     fermion_generator: Union[FermionOperator, InteractionOperator],
     transformation: str = "Jordan-Wigner",
     number_of_qubits: Optional[int] = None,
+    optimize_circuit: bool = False,
+    workers: int = 1,
+    tapering: Optional[Z2Tapering] = None,
 ) -> Circuit:
     """Create a circuit corresponding to the exponentiation of an operator.
         Works only for antihermitian fermionic operators.
@@ -31,45 +472,306 @@ def exponentiate_fermion_operator(
             the resulting operator above the number that appears in the input operator.
             Defaults to None and the number of qubits in the resulting operator will
             match the number that appears in the input operator.
+        optimize_circuit: if True, commuting Pauli terms are ordered to share basis
+            changes and CNOT ladders, and redundant gates are cancelled afterwards.
+            The implemented unitary stays the same. Reductions of CNOT count and
+            depth by gate cancellation are logged at INFO level.
+        workers: number of processes transforming fermionic terms and building
+            subcircuits of the Pauli exponentials in parallel. The resulting
+            circuit doesn't depend on the number of workers.
+        tapering: if provided, the circuit is mapped to the space with qubits
+            removed by the tapering. The symmetries of the tapering have to
+            commute with the generator.
     """
-    if transformation not in ["Jordan-Wigner", "Bravyi-Kitaev"]:
-        raise RuntimeError(f"Unrecognized transformation {transformation}")
+    executor = _get_process_pool(workers)
+    qubit_generator = _get_qubit_generator(
+        fermion_generator, transformation, number_of_qubits, executor
+    )
+
+    if not optimize_circuit:
+        # Quantum circuit implementing the excitation operators
+        with profile_stage("time_evolution") as stage:
+            circuit = _exponentiate_qubit_operator(qubit_generator, executor, tapering)
+            stage.set_output(circuit)
+        return circuit
+
+    with profile_stage("time_evolution") as stage:
+        circuit = _exponentiate_qubit_operator(
+            order_commuting_pauli_terms(qubit_generator), executor, tapering
+        )
+        stage.set_output(circuit)
+
+    # Reordering the Pauli terms doesn't change the gate counts of the circuit
+    initial_cost = get_circuit_cost(circuit)
+    with profile_stage("circuit_optimization") as stage:
+        circuit = cancel_redundant_gates(circuit)
+        stage.set_output(circuit)
+    final_cost = get_circuit_cost(circuit)
+    logger.info(
+        "Gate cancellation reduced CNOT count from %d to %d and depth from %d to %d.",
+        initial_cost.cnot_count,
+        final_cost.cnot_count,
+        initial_cost.depth,
+        final_cost.depth,
+    )
+    return circuit
 
-    # Transform generator to qubits
+
+def iterate_exponentiated_fermion_operator(
+    fermion_generator: Union[FermionOperator, InteractionOperator],
+    transformation: str = "Jordan-Wigner",
+    number_of_qubits: Optional[int] = None,
+    workers: int = 1,
+    tapering: Optional[Z2Tapering] = None,
+) -> Iterator[Circuit]:
+    """Generate the circuit of `exponentiate_fermion_operator` without circuit
+    optimization in blocks of consecutive Pauli exponentials.
+
+    The blocks concatenate to the circuit of `exponentiate_fermion_operator`.
+    Apart from the transformed generator, only a single block is held in memory
+    at a time.
+
+    Args:
+        fermion_generator: fermionic generator.
+        transformation: The name of the qubit-to-fermion transformation to use.
+        number_of_qubits: see `exponentiate_fermion_operator`.
+        workers: number of processes transforming fermionic terms and building
+            subcircuits of each block in parallel.
+        tapering: if provided, blocks are mapped to the space with qubits removed
+            by the tapering.
+    """
+    executor = _get_process_pool(workers)
+    qubit_generator = _get_qubit_generator(
+        fermion_generator, transformation, number_of_qubits, executor
+    )
+    terms = list(qubit_generator.terms.items())
+    block_size = _CHUNK_SIZE * workers
+    for start in range(0, len(terms), block_size):
+        block_operator = QubitOperator()
+        block_operator.terms.update(terms[start : start + block_size])
+        yield _exponentiate_qubit_operator(block_operator, executor, tapering)
+
+
+def get_pauli_rotations(
+    fermion_generator: Union[FermionOperator, InteractionOperator],
+    symbols: Sequence[sympy.Symbol],
+    transformation: str = "Jordan-Wigner",
+    number_of_qubits: Optional[int] = None,
+    tapering: Optional[Z2Tapering] = None,
+) -> Tuple[List[PauliTerm], csr_matrix, np.ndarray]:
+    """Decompose the exponentiation of an operator into Pauli rotations.
+
+    The circuit returned by `exponentiate_fermion_operator` implements (up to
+    a global phase) the product of rotations exp(-i angle_k P_k / 2), applied in
+    the returned order, where angles = coefficients @ params + offsets.
+
+    Args:
+        fermion_generator: fermionic generator with coefficients linear in symbols.
+        symbols: symbols used in the generator, in the order in which parameters
+            will be passed.
+        transformation: The name of the qubit-to-fermion transformation to use.
+        number_of_qubits: See `exponentiate_fermion_operator`.
+        tapering: See `exponentiate_fermion_operator`.
+
+    Returns:
+        Pauli strings P_k, sparse (rotations x params) coefficient matrix and
+        offsets of the rotation angles.
+    """
+    pauli_terms, coefficients, _ = _get_linear_qubit_generator(
+        fermion_generator, transformation, number_of_qubits, symbols
+    )
+    if tapering is not None:
+        tapered_terms = [tapering.taper_pauli_term(term) for term in pauli_terms]
+        pauli_terms = [tapered_term for _, tapered_term in tapered_terms]
+        signs = np.array([sign for sign, _ in tapered_terms], dtype=float)
+        coefficients = coefficients.multiply(signs[:, None]).tocsr()
+
+    # Identity term only contributes a global phase
+    rotation_indices = [index for index, term in enumerate(pauli_terms) if term]
+    coefficients = 2 * coefficients[rotation_indices]
+    return (
+        [pauli_terms[index] for index in rotation_indices],
+        coefficients[:, 1:],
+        coefficients[:, 0].toarray().ravel(),
+    )
+
+
+def compile_exponentiated_fermion_operator(
+    fermion_generator: Union[FermionOperator, InteractionOperator],
+    symbols: Sequence[sympy.Symbol],
+    transformation: str = "Jordan-Wigner",
+    number_of_qubits: Optional[int] = None,
+    optimize_circuit: bool = False,
+    workers: int = 1,
+) -> LinearCircuitTemplate:
+    """Create a circuit template corresponding to the exponentiation of an operator
+        whose coefficients are linear in the given symbols.
+
+    The rotation angles of the resulting circuit are given by
+    `template.coefficients @ params + template.offsets`, where `coefficients` is a
+    sparse (gates x params) matrix. Angles for a batch of parameter vectors are
+    obtained with a single matrix product. Without circuit optimization the matrix
+    is taken from the linear forms of the transformed coefficients, since every
+    Pauli term is exponentiated with a single RZ rotation.
+
+    Args:
+        fermion_generator: fermionic generator with coefficients linear in symbols.
+        symbols: symbols used in the generator, in the order in which parameters
+            will be passed to the template.
+        transformation: The name of the qubit-to-fermion transformation to use.
+        number_of_qubits: See `exponentiate_fermion_operator`.
+        optimize_circuit: See `exponentiate_fermion_operator`.
+        workers: See `exponentiate_fermion_operator`.
+
+    Returns:
+        template of the circuit implementing the exponentiated operator.
+    """
+    if optimize_circuit:
+        # Gate cancellation merges rotations, so the parameters of the remaining
+        # gates are analyzed on the optimized circuit
+        circuit = exponentiate_fermion_operator(
+            fermion_generator, transformation, number_of_qubits, True, workers
+        )
+        return LinearCircuitTemplate(circuit, symbols)
+
+    executor = _get_process_pool(workers)
+    pauli_terms, coefficients, symbols = _get_linear_qubit_generator(
+        fermion_generator, transformation, number_of_qubits, symbols, executor
+    )
+    circuit = _exponentiate_qubit_operator(
+        _build_qubit_operator(pauli_terms, coefficients, symbols), executor
+    )
+
+    # Every Pauli term P with coefficient c is exponentiated by the CNOT ladder
+    # construction with a single RZ(2c) gate, in the order of the terms
+    symbol_dependent_rows = [
+        row_index
+        for row_index, (pauli_term, number_of_symbols) in enumerate(
+            zip(pauli_terms, np.diff(coefficients[:, 1:].tocsr().indptr))
+        )
+        if pauli_term and number_of_symbols > 0
+    ]
+    slots = [
+        (operation_index, position)
+        for operation_index, operation in enumerate(circuit.operations)
+        for position, param in enumerate(operation.params)
+        if isinstance(param, sympy.Expr) and param.free_symbols
+    ]
+    if len(slots) != len(symbol_dependent_rows) or any(
+        circuit.operations[operation_index].gate.name != "RZ"
+        for operation_index, _ in slots
+    ):
+        return LinearCircuitTemplate(circuit, symbols)
+    rotation_coefficients = 2 * coefficients[symbol_dependent_rows]
+    return LinearCircuitTemplate.from_coefficients(
+        circuit,
+        symbols,
+        slots,
+        rotation_coefficients[:, 1:],
+        rotation_coefficients[:, 0].toarray().ravel(),
+    )
+
+
+def _assert_hartree_fock_arguments(transformation: str, spin_ordering: str) -> None:
+    if spin_ordering != "interleaved":
+        raise RuntimeError(
+            f"{spin_ordering} is not supported at this time. Interleaved is the only"
+            "supported spin-ordering."
+        )
+    if transformation not in _SUPPORTED_TRANSFORMATIONS:
+        raise RuntimeError(
+            f"{transformation} is not a supported transformation. Jordan-Wigner, "
+            "Bravyi-Kitaev and Parity are supported at this time."
+        )
+
+
+def get_hartree_fock_bitstrings(
+    number_of_qubits: int,
+    number_of_alpha_electrons: Union[int, Sequence[int], np.ndarray],
+    number_of_beta_electrons: Union[int, Sequence[int], np.ndarray],
+    transformation: str,
+    spin_ordering: str = "interleaved",
+) -> np.ndarray:
+    """Computes qubit states of the Hartree-Fock states of many electron
+    configurations at once.
+
+    The lowest spin-orbitals of each spin are occupied. Under Jordan-Wigner
+    qubit i holds the occupation of spin-orbital i, under Bravyi-Kitaev it holds
+    the parity of occupations of spin-orbitals i & (i + 1), ..., i and under
+    Parity that of spin-orbitals 0, ..., i. Both are obtained from prefix
+    parities without transforming any operator.
+
+    Args:
+        number_of_qubits: the number of qubits in the system.
+        number_of_alpha_electrons: number(s) of alpha electrons.
+        number_of_beta_electrons: number(s) of beta electrons, broadcast against
+            the numbers of alpha electrons.
+        transformation: the Hamiltonian transformation to use.
+        spin_ordering: the spin ordering convention to use. Defaults to "interleaved".
+
+    Returns:
+        array of shape (..., number_of_qubits) with 1 for qubits in state |1>,
+        where ... is the broadcast shape of the numbers of electrons.
+    """
+    _assert_hartree_fock_arguments(transformation, spin_ordering)
+    qubits = np.arange(number_of_qubits)
+    occupations = np.where(
+        qubits % 2 == 0,
+        qubits // 2 < np.asarray(number_of_alpha_electrons)[..., None],
+        qubits // 2 < np.asarray(number_of_beta_electrons)[..., None],
+    ).astype(np.uint8)
     if transformation == "Jordan-Wigner":
-        qubit_generator = jordan_wigner(fermion_generator)
-    else:
-        if isinstance(fermion_generator, InteractionOperator):
-            fermion_generator = get_fermion_operator(fermion_generator)
-        qubit_generator = bravyi_kitaev(fermion_generator, n_qubits=number_of_qubits)
+        return occupations
 
-    for term in qubit_generator.terms:
-        if isinstance(qubit_generator.terms[term], sympy.Expr):
-            if sympy.re(qubit_generator.terms[term]) != 0:
-                raise RuntimeError(
-                    "Transformed fermion_generator is not anti-hermitian."
-                )
-            qubit_generator.terms[term] = sympy.im(qubit_generator.terms[term])
-        else:
-            if not np.isclose(qubit_generator.terms[term].real, 0.0):
-                raise RuntimeError(
-                    "Transformed fermion_generator is not anti-hermitian."
-                )
-            qubit_generator.terms[term] = float(qubit_generator.terms[term].imag)
-    qubit_generator.compress()
+    # Parities of occupations of spin-orbitals 0, ..., i - 1
+    prefix_parities = np.zeros(
+        occupations.shape[:-1] + (number_of_qubits + 1,), dtype=np.int64
+    )
+    prefix_parities[..., 1:] = np.cumsum(occupations, axis=-1) % 2
+    if transformation == "Parity":
+        return prefix_parities[..., 1:].astype(np.uint8)
+    return (
+        prefix_parities[..., qubits + 1] ^ prefix_parities[..., qubits & (qubits + 1)]
+    ).astype(np.uint8)
 
-    # Quantum circuit implementing the excitation operators
-    circuit = time_evolution(qubit_generator, 1, method="Trotter", trotter_order=1)
 
-    return circuit
+def build_hartree_fock_circuits(
+    number_of_qubits: int,
+    number_of_alpha_electrons: Union[Sequence[int], np.ndarray],
+    number_of_beta_electrons: Union[Sequence[int], np.ndarray],
+    transformation: str,
+    spin_ordering: str = "interleaved",
+) -> List[Circuit]:
+    """Creates circuits preparing the Hartree-Fock states of many electron
+    configurations, see `get_hartree_fock_bitstrings`.
+
+    Returns:
+        circuits in the order of the flattened broadcast numbers of electrons.
+    """
+    bitstrings = get_hartree_fock_bitstrings(
+        number_of_qubits,
+        number_of_alpha_electrons,
+        number_of_beta_electrons,
+        transformation,
+        spin_ordering,
+    )
+    return [
+        Circuit(
+            [X(qubit) for qubit in np.flatnonzero(bitstring).tolist()],
+            n_qubits=number_of_qubits,
+        )
+        for bitstring in bitstrings.reshape(-1, number_of_qubits)
+    ]
 
 
+@profiled("build_hartree_fock_circuit")
 def build_hartree_fock_circuit(
     number_of_qubits: int,
     number_of_alpha_electrons: int,
     number_of_beta_electrons: int,
     transformation: str,
     spin_ordering: str = "interleaved",
+    tapering: Optional[Z2Tapering] = None,
 ) -> Circuit:
     """Creates a circuit that prepares the Hartree-Fock state.
 
@@ -79,38 +781,52 @@ def build_hartree_fock_circuit(
         number_of_beta_electrons: the number of beta electrons in the system.
         transformation: the Hamiltonian transformation to use.
         spin_ordering: the spin ordering convention to use. Defaults to "interleaved".
+        tapering: if provided, the state is prepared in the space with qubits
+            removed by the tapering. It has to lie in the sector of the tapering.
 
     Returns:
         zquantum.core.circuit.Circuit: a circuit that prepares the Hartree-Fock state.
     """
-    if spin_ordering != "interleaved":
-        raise RuntimeError(
-            f"{spin_ordering} is not supported at this time. Interleaved is the only"
-            "supported spin-ordering."
-        )
-    circuit = Circuit(n_qubits=number_of_qubits)
-
-    alpha_indexes = list(range(0, number_of_qubits, 2))
-    beta_indexes = list(range(1, number_of_qubits, 2))
-    index_list = []
-    for index in alpha_indexes[:number_of_alpha_electrons]:
-        index_list.append(index)
-    for index in beta_indexes[:number_of_beta_electrons]:
-        index_list.append(index)
-    index_list.sort()
-    op_list = [(x, 1) for x in index_list]
-    fermion_op = FermionOperator(tuple(op_list), 1.0)
-    if transformation == "Jordan-Wigner":
-        transformed_op = jordan_wigner(fermion_op)
-    elif transformation == "Bravyi-Kitaev":
-        transformed_op = bravyi_kitaev(fermion_op, n_qubits=number_of_qubits)
-    else:
-        raise RuntimeError(
-            f"{transformation} is not a supported transformation. Jordan-Wigner and "
-            "Bravyi-Kitaev are supported at this time."
-        )
-    term = next(iter(transformed_op.terms.items()))
-    for op in term[0]:
-        if op[1] != "Z":
-            circuit += X(op[0])
-    return circuit
+    bitstring = get_hartree_fock_bitstrings(
+        number_of_qubits,
+        number_of_alpha_electrons,
+        number_of_beta_electrons,
+        transformation,
+        spin_ordering,
+    )
+    if tapering is not None:
+        bitstring = tapering.taper_bitstring(bitstring)
+    return Circuit(
+        [X(qubit) for qubit in np.flatnonzero(bitstring).tolist()],
+        n_qubits=len(bitstring),
+    )
+
+
+def get_two_qubit_reduction(
+    number_of_qubits: int,
+    number_of_alpha_electrons: int,
+    number_of_beta_electrons: int,
+    transformation: str,
+) -> Z2Tapering:
+    """Creates the tapering removing two qubits using the parities of the numbers
+    of alpha and beta electrons, in the sector of the Hartree-Fock state.
+
+    It can be passed to `exponentiate_fermion_operator` and
+    `build_hartree_fock_circuit` for any supported transformation. Under Parity
+    the total parity is stored in the last qubit, which is simply dropped.
+
+    Args:
+        number_of_qubits: the number of qubits in the system.
+        number_of_alpha_electrons: the number of alpha electrons in the system.
+        number_of_beta_electrons: the number of beta electrons in the system.
+        transformation: the Hamiltonian transformation to use.
+    """
+    return Z2Tapering.from_bitstring(
+        get_spin_parity_symmetries(number_of_qubits, transformation),
+        get_hartree_fock_bitstrings(
+            number_of_qubits,
+            number_of_alpha_electrons,
+            number_of_beta_electrons,
+            transformation,
+        ),
+    )
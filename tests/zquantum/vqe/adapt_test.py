@@ -0,0 +1,97 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import numpy as np
+import pytest
+from zquantum.core.openfermion import QubitOperator
+from zquantum.vqe.adapt import SingletADAPTAnsatz
+from zquantum.vqe.statevector import apply_qubit_operator
+
+
+@pytest.fixture
+def qubit_hamiltonian():
+    return (
+        QubitOperator("", -0.5)
+        + QubitOperator("Z0 Z1", 0.3)
+        + QubitOperator("X0 Y1 Y2 X3", -0.2)
+        + QubitOperator("Z2", 0.7)
+        + QubitOperator("Y3 X4 Z5", 0.4)
+        + QubitOperator("X1 X2 Y4 Y5", 0.25)
+    )
+
+
+def _get_energy(ansatz, params, qubit_hamiltonian):
+    statevector = ansatz.get_executable_circuit(params).to_unitary()[:, 0]
+    return np.vdot(
+        statevector,
+        apply_qubit_operator(qubit_hamiltonian, statevector, ansatz.number_of_qubits),
+    ).real
+
+
+class TestSingletADAPTAnsatz:
+    @pytest.mark.parametrize("transformation", ["Jordan-Wigner", "Bravyi-Kitaev"])
+    def test_statevector_matches_executable_circuit(self, transformation, rng):
+        ansatz = SingletADAPTAnsatz(
+            3, 1, transformation=transformation, selected_operators=[4, 0, 2]
+        )
+        params = rng.uniform(-np.pi, np.pi, ansatz.number_of_params)
+
+        np.testing.assert_array_almost_equal(
+            ansatz.get_statevector(params),
+            ansatz.get_executable_circuit(params).to_unitary()[:, 0],
+        )
+
+    def test_pool_gradients_match_finite_differences(self, qubit_hamiltonian):
+        ansatz = SingletADAPTAnsatz(3, 1, selected_operators=[4])
+        params = np.array([0.3])
+        epsilon = 1e-6
+
+        gradients = ansatz.compute_pool_gradients(params, qubit_hamiltonian)
+
+        expected_gradients = []
+        for operator_index in range(ansatz.pool_size):
+            extended_ansatz = SingletADAPTAnsatz(
+                3, 1, selected_operators=[4, operator_index]
+            )
+            expected_gradients.append(
+                (
+                    _get_energy(extended_ansatz, [0.3, epsilon], qubit_hamiltonian)
+                    - _get_energy(extended_ansatz, [0.3, -epsilon], qubit_hamiltonian)
+                )
+                / (2 * epsilon)
+            )
+        np.testing.assert_array_almost_equal(gradients, expected_gradients, decimal=5)
+
+    def test_grow_appends_operator_with_largest_gradient(self, qubit_hamiltonian):
+        ansatz = SingletADAPTAnsatz(3, 1)
+        gradients = ansatz.compute_pool_gradients([], qubit_hamiltonian)
+
+        operator_index = ansatz.grow([], qubit_hamiltonian, gradient_threshold=0.0)
+
+        assert operator_index == np.argmax(np.abs(gradients))
+        assert ansatz.selected_operators == [operator_index]
+        assert ansatz.number_of_params == 1
+
+    def test_grow_appends_nothing_below_gradient_threshold(self, qubit_hamiltonian):
+        ansatz = SingletADAPTAnsatz(3, 1)
+
+        assert ansatz.grow([], qubit_hamiltonian, gradient_threshold=np.inf) is None
+        assert ansatz.selected_operators == []
+
+    def test_appending_operator_extends_parametrized_circuit(self):
+        ansatz = SingletADAPTAnsatz(3, 1, selected_operators=[1])
+        prefix_operations = ansatz.parametrized_circuit.operations
+
+        ansatz.append_operator(3)
+
+        operations = ansatz.parametrized_circuit.operations
+        assert len(operations) > len(prefix_operations)
+        assert operations[: len(prefix_operations)] == prefix_operations
+        assert len(ansatz.parametrized_circuit.free_symbols) == 2
+
+    @pytest.mark.parametrize("index", [-1, 5])
+    def test_appending_operator_outside_pool_raises_error(self, index):
+        ansatz = SingletADAPTAnsatz(3, 1)
+
+        with pytest.raises(ValueError):
+            ansatz.append_operator(index)
@@ -0,0 +1,126 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import os
+
+import numpy as np
+import pytest
+import sympy
+from zquantum.core.circuits import CNOT, RX, RY, RZ, SWAP, Circuit, H, X
+from zquantum.vqe import singlet_uccsd
+from zquantum.vqe.circuit_cache import CachedCircuitTemplate, CircuitCache
+from zquantum.vqe.singlet_uccsd import SingletUCCSDAnsatz
+from zquantum.vqe.templates import LinearCircuitTemplate
+
+SYMBOLS = [sympy.Symbol("theta_0", real=True), sympy.Symbol("theta_1", real=True)]
+
+
+@pytest.fixture
+def circuit():
+    return Circuit(
+        [
+            X(0),
+            RZ(2 * SYMBOLS[0] + 0.5)(1),
+            RX(np.pi / 2)(0),
+            CNOT(0, 2),
+            H(2),
+            RY(SYMBOLS[1] - 0.25 * SYMBOLS[0])(2),
+        ],
+        n_qubits=4,
+    )
+
+
+class TestCircuitCache:
+    def test_loaded_circuit_matches_saved_circuit(self, circuit, tmp_path):
+        cache = CircuitCache(str(tmp_path))
+        key = cache.get_key(SingletUCCSDAnsatz, {"number_of_spatial_orbitals": 2})
+
+        cache.save(key, circuit, SYMBOLS)
+        loaded_circuit = cache.load(key, SYMBOLS)
+
+        assert loaded_circuit.n_qubits == circuit.n_qubits
+        assert [operation.gate.name for operation in loaded_circuit.operations] == [
+            operation.gate.name for operation in circuit.operations
+        ]
+        symbols_map = {SYMBOLS[0]: 0.3, SYMBOLS[1]: -1.2}
+        np.testing.assert_array_almost_equal(
+            loaded_circuit.bind(symbols_map).to_unitary(),
+            circuit.bind(symbols_map).to_unitary(),
+        )
+
+    def test_loaded_template_binds_without_creating_symbolic_circuit(
+        self, circuit, tmp_path
+    ):
+        cache = CircuitCache(str(tmp_path))
+        cache.save("key", circuit, SYMBOLS)
+        params_batch = np.array([[0.3, -1.2], [-0.7, 2.5]])
+
+        template = cache.load_template("key", SYMBOLS)
+        expected_template = LinearCircuitTemplate(circuit, SYMBOLS)
+
+        assert template.bind_batch(params_batch) == expected_template.bind_batch(
+            params_batch
+        )
+        assert template._circuit is None
+        np.testing.assert_array_almost_equal(
+            template.coefficients.toarray(), expected_template.coefficients.toarray()
+        )
+        np.testing.assert_array_almost_equal(
+            template.offsets, expected_template.offsets
+        )
+
+    def test_loading_missing_entry_returns_none(self, tmp_path):
+        cache = CircuitCache(str(tmp_path / "cache"))
+
+        assert cache.load("missing", SYMBOLS) is None
+
+    def test_loading_with_different_symbols_raises_exception(self, circuit, tmp_path):
+        cache = CircuitCache(str(tmp_path))
+        cache.save("key", circuit, SYMBOLS)
+
+        with pytest.raises(ValueError):
+            cache.load("key", SYMBOLS[::-1])
+
+    def test_saving_circuit_with_unsupported_gate_raises_exception(self, tmp_path):
+        cache = CircuitCache(str(tmp_path))
+
+        with pytest.raises(ValueError):
+            cache.save("key", Circuit([SWAP(0, 1)]), SYMBOLS)
+        assert os.listdir(tmp_path) == []
+
+    def test_keys_differ_for_different_arguments(self):
+        assert CircuitCache.get_key(
+            SingletUCCSDAnsatz, {"transformation": "Jordan-Wigner"}
+        ) != CircuitCache.get_key(
+            SingletUCCSDAnsatz, {"transformation": "Bravyi-Kitaev"}
+        )
+
+
+def test_ansatz_loads_parametrized_circuit_from_cache(tmp_path, monkeypatch, rng):
+    ansatz = SingletUCCSDAnsatz(3, 1, circuit_cache_dir=str(tmp_path))
+    expected_circuit = ansatz.parametrized_circuit
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("Circuit should have been loaded from cache.")
+
+    monkeypatch.setattr(singlet_uccsd, "exponentiate_fermion_operator", _fail)
+    cached_ansatz = SingletUCCSDAnsatz(3, 1, circuit_cache_dir=str(tmp_path))
+    params = rng.uniform(-np.pi, np.pi, ansatz.number_of_params)
+
+    np.testing.assert_array_almost_equal(
+        cached_ansatz.get_executable_circuit(params).to_unitary(),
+        expected_circuit.bind(dict(zip(ansatz.symbols, params))).to_unitary(),
+    )
+    with pytest.raises(AssertionError):
+        SingletUCCSDAnsatz(
+            3, 1, transformation="Bravyi-Kitaev", circuit_cache_dir=str(tmp_path)
+        ).parametrized_circuit
+
+
+def test_ansatz_reuses_template_loaded_from_cache(tmp_path):
+    SingletUCCSDAnsatz(3, 1, circuit_cache_dir=str(tmp_path)).parametrized_circuit
+    cached_ansatz = SingletUCCSDAnsatz(
+        3, 1, use_circuit_template=True, circuit_cache_dir=str(tmp_path)
+    )
+
+    assert isinstance(cached_ansatz.circuit_template, CachedCircuitTemplate)
@@ -0,0 +1,91 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import numpy as np
+import pytest
+import sympy
+from zquantum.core.circuits import CNOT, RX, RZ, Circuit, H, X
+from zquantum.core.openfermion import QubitOperator
+from zquantum.vqe.circuit_optimization import (
+    CircuitCost,
+    cancel_redundant_gates,
+    get_circuit_cost,
+    order_commuting_pauli_terms,
+)
+
+
+class TestCancelRedundantGates:
+    @pytest.mark.parametrize(
+        "circuit,expected_circuit",
+        [
+            (Circuit([H(0), H(0)]), Circuit([])),
+            (Circuit([CNOT(0, 1), X(2), CNOT(0, 1)]), Circuit([X(2)])),
+            (Circuit([CNOT(0, 1), CNOT(1, 0)]), Circuit([CNOT(0, 1), CNOT(1, 0)])),
+            (Circuit([H(0), CNOT(0, 1), H(0)]), Circuit([H(0), CNOT(0, 1), H(0)])),
+            (
+                Circuit([RX(np.pi / 2)(0), RX(-np.pi / 2)(0), RZ(0.5)(1)]),
+                Circuit([RZ(0.5)(1)]),
+            ),
+            (Circuit([RZ(0.25)(0), RZ(0.5)(0)]), Circuit([RZ(0.75)(0)])),
+            (
+                Circuit(
+                    [
+                        CNOT(0, 1),
+                        CNOT(1, 2),
+                        H(2),
+                        H(2),
+                        CNOT(1, 2),
+                        CNOT(0, 1),
+                    ]
+                ),
+                Circuit([]),
+            ),
+        ],
+    )
+    def test_redundant_gates_are_removed(self, circuit, expected_circuit):
+        optimized_circuit = cancel_redundant_gates(circuit)
+
+        assert optimized_circuit.operations == expected_circuit.operations
+
+    def test_symbolic_rotations_are_merged(self):
+        theta = sympy.Symbol("theta")
+        circuit = Circuit([RZ(theta)(0), RZ(-theta)(0), RZ(2 * theta)(1), RZ(0.5)(1)])
+
+        optimized_circuit = cancel_redundant_gates(circuit)
+
+        assert optimized_circuit.operations == [RZ(2 * theta + 0.5)(1)]
+
+    def test_number_of_qubits_is_preserved(self):
+        circuit = Circuit([H(0), H(0)], n_qubits=3)
+
+        assert cancel_redundant_gates(circuit).n_qubits == 3
+
+
+class TestOrderCommutingPauliTerms:
+    def test_terms_are_only_reordered_within_commuting_blocks(self):
+        qubit_operator = (
+            QubitOperator("Y0 X1", 0.1)
+            + QubitOperator("X0 Y1", 0.2)
+            + QubitOperator("Z0", 0.3)
+            + QubitOperator("X1 Z2", 0.4)
+            + QubitOperator("X0", 0.5)
+        )
+
+        ordered_operator = order_commuting_pauli_terms(qubit_operator)
+
+        assert ordered_operator == qubit_operator
+        assert list(ordered_operator.terms) == [
+            ((0, "X"), (1, "Y")),
+            ((0, "Y"), (1, "X")),
+            ((0, "Z"),),
+            ((1, "X"), (2, "Z")),
+            ((0, "X"),),
+        ]
+
+
+def test_circuit_cost_counts_cnots_and_depth():
+    circuit = Circuit([H(0), CNOT(0, 1), X(2), CNOT(1, 2), H(0)])
+
+    assert get_circuit_cost(circuit) == CircuitCost(
+        number_of_gates=5, cnot_count=2, depth=3
+    )
@@ -0,0 +1,44 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import numpy as np
+import pytest
+from zquantum.core.circuits import CNOT, RX, RZ, Circuit
+from zquantum.vqe.compact_circuit import CompactCircuit
+
+
+@pytest.fixture
+def compact_circuit():
+    return CompactCircuit(
+        3,
+        ["RZ", "RX", "CNOT"],
+        opcodes=[0, 1, 2, 0],
+        qubits=[[0, -1], [1, -1], [0, 2], [2, -1]],
+        parameter_indices=[1, -1, -1, 0],
+        angles=[0.0, 0.5, 0.0, 0.0],
+    )
+
+
+class TestCompactCircuit:
+    def test_circuit_is_built_with_parameters_and_fixed_angles(self, compact_circuit):
+        assert compact_circuit.number_of_params == 2
+        assert compact_circuit.to_circuit([0.1, 0.2]) == Circuit(
+            [RZ(0.2)(0), RX(0.5)(1), CNOT(0, 2), RZ(0.1)(2)], n_qubits=3
+        )
+
+    def test_saved_circuit_is_loaded_unchanged(self, compact_circuit, tmp_path):
+        filename = str(tmp_path / "circuit.npz")
+
+        compact_circuit.save(filename)
+
+        assert (
+            CompactCircuit.load(filename).to_circuit() == compact_circuit.to_circuit()
+        )
+
+    def test_wrong_number_of_params_raises_error(self, compact_circuit):
+        with pytest.raises(ValueError):
+            compact_circuit.to_circuit(np.zeros(3))
+
+    def test_unsupported_gate_raises_error(self):
+        with pytest.raises(ValueError):
+            CompactCircuit(2, ["SWAP"], [0], [[0, 1]], [-1], [0.0])
@@ -0,0 +1,12 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def rng():
+    """Seeded random number generator, so that random inputs of tests are
+    reproducible."""
+    return np.random.default_rng(1234)
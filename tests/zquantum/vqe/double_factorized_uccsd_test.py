@@ -0,0 +1,119 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import numpy as np
+import pytest
+from zquantum.core.openfermion import (
+    FermionOperator,
+    jordan_wigner,
+    uccsd_singlet_generator,
+    uccsd_singlet_paramsize,
+)
+from zquantum.vqe.circuit_optimization import get_circuit_cost
+from zquantum.vqe.double_factorized_uccsd import (
+    DoubleFactorizedUCCSDAnsatz,
+    _get_singlet_uccsd_excitations,
+    double_factorize,
+    get_double_amplitudes_matrix,
+)
+from zquantum.vqe.singlet_uccsd import SingletUCCSDAnsatz
+
+
+def _get_random_amplitudes(rng, number_of_spatial_orbitals, number_of_alpha_electrons):
+    return 0.05 * rng.normal(
+        size=uccsd_singlet_paramsize(
+            2 * number_of_spatial_orbitals, 2 * number_of_alpha_electrons
+        )
+    )
+
+
+def _get_spin_summed_excitation(virtual, occupied):
+    return FermionOperator(((2 * virtual, 1), (2 * occupied, 0))) + FermionOperator(
+        ((2 * virtual + 1, 1), (2 * occupied + 1, 0))
+    )
+
+
+class TestDoubleFactorizedUCCSDAnsatz:
+    def test_amplitudes_matrix_reproduces_double_excitations(self, rng):
+        amplitudes = _get_random_amplitudes(rng, 4, 2)
+        singles, _ = _get_singlet_uccsd_excitations(4, 2)
+        amplitudes[[index for _, index in singles]] = 0
+
+        matrix, pairs = get_double_amplitudes_matrix(amplitudes, 4, 2)
+
+        double_excitations = FermionOperator()
+        for first_index, first_pair in enumerate(pairs):
+            for second_index, second_pair in enumerate(pairs):
+                double_excitations += (
+                    0.5
+                    * matrix[first_index, second_index]
+                    * _get_spin_summed_excitation(*first_pair)
+                    * _get_spin_summed_excitation(*second_pair)
+                )
+        assert np.allclose(matrix, matrix.T)
+        assert jordan_wigner(double_excitations) == jordan_wigner(
+            uccsd_singlet_generator(amplitudes, 8, 4, anti_hermitian=False)
+        )
+
+    def test_truncation_error_is_norm_of_dropped_amplitudes(self, rng):
+        amplitudes = _get_random_amplitudes(rng, 4, 2)
+        matrix, _ = get_double_amplitudes_matrix(amplitudes, 4, 2)
+
+        eigenvalues, eigenvectors, truncation_error = double_factorize(matrix, rank=2)
+        _, _, full_rank_truncation_error = double_factorize(matrix)
+
+        np.testing.assert_almost_equal(
+            truncation_error,
+            np.linalg.norm(
+                matrix - eigenvectors @ np.diag(eigenvalues) @ eigenvectors.T
+            ),
+        )
+        np.testing.assert_almost_equal(full_rank_truncation_error, 0)
+        assert DoubleFactorizedUCCSDAnsatz(
+            4, 2, amplitudes, rank=2
+        ).truncation_error == pytest.approx(truncation_error)
+
+    @pytest.mark.parametrize("transformation", ["Jordan-Wigner", "Bravyi-Kitaev"])
+    def test_full_rank_state_approximates_singlet_uccsd_state(
+        self, transformation, rng
+    ):
+        amplitudes = _get_random_amplitudes(rng, 3, 1)
+        ansatz = DoubleFactorizedUCCSDAnsatz(
+            3, 1, amplitudes, transformation=transformation
+        )
+        uccsd_ansatz = SingletUCCSDAnsatz(3, 1, transformation=transformation)
+
+        circuit = ansatz.get_executable_circuit(ansatz.initial_params)
+        uccsd_circuit = uccsd_ansatz.get_executable_circuit(amplitudes)
+
+        statevector = circuit.to_unitary()[:, 0]
+        uccsd_statevector = uccsd_circuit.to_unitary()[:, 0]
+        assert abs(np.vdot(uccsd_statevector, statevector)) > 1 - 1e-4
+
+    def test_truncating_rank_reduces_number_of_cnots(self, rng):
+        amplitudes = _get_random_amplitudes(rng, 4, 2)
+        ansatz = DoubleFactorizedUCCSDAnsatz(4, 2, amplitudes)
+        full_rank_cnot_count = get_circuit_cost(ansatz.parametrized_circuit).cnot_count
+
+        ansatz.rank = 1
+
+        assert (
+            get_circuit_cost(ansatz.parametrized_circuit).cnot_count
+            < full_rank_cnot_count
+        )
+
+    def test_number_of_params_is_number_of_singles_plus_rank(self, rng):
+        ansatz = DoubleFactorizedUCCSDAnsatz(
+            4, 2, _get_random_amplitudes(rng, 4, 2), rank=3
+        )
+
+        assert ansatz.number_of_params == 4 + 3
+        assert len(ansatz.initial_params) == ansatz.number_of_params
+        assert len(ansatz.parametrized_circuit.free_symbols) == ansatz.number_of_params
+
+    @pytest.mark.parametrize("rank", [-1, 5])
+    def test_init_asserts_rank(self, rank, rng):
+        with pytest.raises(ValueError):
+            DoubleFactorizedUCCSDAnsatz(
+                4, 2, _get_random_amplitudes(rng, 4, 2), rank=rank
+            )
@@ -0,0 +1,109 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import numpy as np
+import pytest
+import sympy
+from zquantum.core.openfermion import FermionOperator
+from zquantum.vqe.fermionic_excitations import (
+    compile_fermionic_excitations,
+    get_fermionic_excitations,
+)
+from zquantum.vqe.utils import exponentiate_fermion_operator
+
+
+def _excitation_generator(term, coefficient):
+    conjugate_term = tuple((orbital, 1 - action) for orbital, action in term[::-1])
+    return FermionOperator(term, coefficient) + FermionOperator(
+        conjugate_term, -coefficient
+    )
+
+
+EXCITATIONS = [
+    ((2, 1), (0, 0)),
+    ((0, 1), (5, 0)),
+    ((4, 1), (1, 0)),
+    ((3, 1), (2, 0), (5, 1), (0, 0)),
+    ((5, 1), (4, 1), (1, 0), (0, 0)),
+    ((0, 1), (3, 1), (5, 0), (2, 0)),
+    ((4, 1), (0, 0), (2, 1), (5, 0)),
+]
+
+
+class TestCompileFermionicExcitations:
+    @pytest.mark.parametrize("term", EXCITATIONS)
+    def test_excitation_circuit_matches_exponentiated_operator(self, term, rng):
+        fermion_generator = _excitation_generator(term, rng.uniform(-2, 2))
+
+        circuit = compile_fermionic_excitations(fermion_generator, 6)
+        expected_circuit = exponentiate_fermion_operator(
+            fermion_generator, "Jordan-Wigner", 6
+        )
+
+        np.testing.assert_array_almost_equal(
+            circuit.to_unitary(), expected_circuit.to_unitary()
+        )
+
+    @pytest.mark.parametrize("term", EXCITATIONS)
+    def test_excitation_circuit_uses_fewer_cnots(self, term):
+        fermion_generator = _excitation_generator(term, 0.5)
+
+        def count_cnots(circuit):
+            return sum(
+                operation.gate.name in ("CNOT", "CZ")
+                for operation in circuit.operations
+            )
+
+        assert count_cnots(
+            compile_fermionic_excitations(fermion_generator, 6)
+        ) < count_cnots(exponentiate_fermion_operator(fermion_generator))
+
+    @pytest.mark.parametrize(
+        "term,expected_count",
+        [
+            (((5, 1), (4, 1), (1, 0), (0, 0)), 14),
+            (((3, 1), (2, 0), (5, 1), (0, 0)), 14 + 2 * 2),
+            (((2, 1), (0, 0)), 4 + 2 * 1),
+            (((0, 1), (5, 0)), 4 + 2 * 4),
+        ],
+    )
+    def test_number_of_two_qubit_gates_of_excitation(self, term, expected_count):
+        circuit = compile_fermionic_excitations(_excitation_generator(term, 0.5), 6)
+
+        assert (
+            sum(len(operation.qubit_indices) == 2 for operation in circuit.operations)
+            == expected_count
+        )
+
+    def test_symbolic_circuit_matches_numeric_circuit(self):
+        theta = sympy.Symbol("theta")
+        term = ((3, 1), (2, 0), (5, 1), (0, 0))
+
+        circuit = compile_fermionic_excitations(_excitation_generator(term, theta))
+        expected_circuit = compile_fermionic_excitations(
+            _excitation_generator(term, 0.3)
+        )
+
+        np.testing.assert_array_almost_equal(
+            circuit.bind({theta: 0.3}).to_unitary(), expected_circuit.to_unitary()
+        )
+
+    def test_not_anti_hermitian_generator_raises_exception(self):
+        with pytest.raises(RuntimeError):
+            compile_fermionic_excitations(FermionOperator("2^ 0", 0.5))
+
+    def test_term_which_is_not_excitation_raises_exception(self):
+        fermion_generator = _excitation_generator(((2, 1), (2, 0), (3, 1), (0, 0)), 1.0)
+        with pytest.raises(ValueError):
+            compile_fermionic_excitations(fermion_generator)
+
+
+def test_get_fermionic_excitations_skips_hermitian_conjugates():
+    fermion_generator = _excitation_generator(((2, 1), (0, 0)), 0.5) + (
+        _excitation_generator(((3, 1), (2, 0), (5, 1), (0, 0)), -0.25)
+    )
+
+    assert get_fermionic_excitations(fermion_generator) == [
+        (((2, 1), (0, 0)), 0.5),
+        (((3, 1), (2, 0), (5, 1), (0, 0)), -0.25),
+    ]
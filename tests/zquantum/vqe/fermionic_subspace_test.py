@@ -0,0 +1,142 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from math import comb
+
+import numpy as np
+import pytest
+from scipy.linalg import expm
+from zquantum.core.openfermion import (
+    FermionOperator,
+    jordan_wigner,
+    uccsd_singlet_generator,
+)
+from zquantum.vqe.fermionic_subspace import (
+    FermionicSubspace,
+    SingletUCCSDSubspaceEngine,
+)
+from zquantum.vqe.singlet_uccsd import SingletUCCSDAnsatz
+from zquantum.vqe.statevector import apply_qubit_operator
+
+NUMBER_OF_SPATIAL_ORBITALS = 3
+NUMBER_OF_QUBITS = 2 * NUMBER_OF_SPATIAL_ORBITALS
+
+
+def _embedding(subspace):
+    """Matrix whose columns are full statevectors of the subspace determinants."""
+    embedding = np.zeros((2**NUMBER_OF_QUBITS, subspace.dimension))
+    for column, determinant in enumerate(subspace.determinants):
+        index = sum(
+            1 << (NUMBER_OF_QUBITS - orbital - 1)
+            for orbital in range(NUMBER_OF_QUBITS)
+            if (int(determinant) >> orbital) & 1
+        )
+        embedding[index, column] = 1.0
+    return embedding
+
+
+def _jordan_wigner_matrix(fermion_operator):
+    qubit_operator = jordan_wigner(fermion_operator)
+    return np.array(
+        [
+            apply_qubit_operator(qubit_operator, basis_state, NUMBER_OF_QUBITS)
+            for basis_state in np.eye(2**NUMBER_OF_QUBITS, dtype=complex)
+        ]
+    ).T
+
+
+class TestFermionicSubspace:
+    @pytest.mark.parametrize("number_of_alpha_electrons", [1, 2])
+    @pytest.mark.parametrize("number_of_beta_electrons", [0, 1])
+    def test_dimension_counts_determinants_with_fixed_electrons(
+        self, number_of_alpha_electrons, number_of_beta_electrons
+    ):
+        subspace = FermionicSubspace(
+            NUMBER_OF_SPATIAL_ORBITALS,
+            number_of_alpha_electrons,
+            number_of_beta_electrons,
+        )
+
+        assert subspace.dimension == comb(
+            NUMBER_OF_SPATIAL_ORBITALS, number_of_alpha_electrons
+        ) * comb(NUMBER_OF_SPATIAL_ORBITALS, number_of_beta_electrons)
+
+    def test_operator_matrix_matches_jordan_wigner_transformed_operator(self):
+        subspace = FermionicSubspace(NUMBER_OF_SPATIAL_ORBITALS, 1, 1)
+        operator = (
+            FermionOperator("4^ 0", 0.3)
+            + FermionOperator("0^ 4", 0.3)
+            + FermionOperator("4^ 5^ 1 0", -0.7)
+            + FermionOperator("0^ 1^ 5 4", -0.7)
+            + FermionOperator("2^ 1^ 3 0", 1.1)
+            + FermionOperator("0^ 2^ 2 0", 0.9)
+        )
+        embedding = _embedding(subspace)
+
+        np.testing.assert_array_almost_equal(
+            subspace.get_operator_matrix(operator).toarray(),
+            embedding.T @ _jordan_wigner_matrix(operator) @ embedding,
+        )
+
+
+class TestSingletUCCSDSubspaceEngine:
+    @pytest.fixture
+    def engine(self):
+        return SingletUCCSDSubspaceEngine(NUMBER_OF_SPATIAL_ORBITALS, 1)
+
+    def test_state_is_product_of_excitation_exponentials(self, engine, rng):
+        params = rng.uniform(-1, 1, engine.number_of_params)
+        embedding = _embedding(engine.subspace)
+        expected_state = embedding @ engine.subspace.hartree_fock_state()
+        for index, param in enumerate(params):
+            excitation = uccsd_singlet_generator(
+                param * np.eye(engine.number_of_params)[index],
+                NUMBER_OF_QUBITS,
+                2,
+                anti_hermitian=True,
+            )
+            expected_state = expm(-_jordan_wigner_matrix(excitation)) @ expected_state
+
+        np.testing.assert_array_almost_equal(
+            embedding @ engine.get_state(params), expected_state
+        )
+
+    # Singles and pair doubles, whose Pauli terms commute, so that the Pauli-string
+    # Trotterization of SingletUCCSDAnsatz is exact for a single parameter
+    @pytest.mark.parametrize("index", [0, 1, 2, 3])
+    def test_energy_matches_energy_of_singlet_uccsd_ansatz(self, engine, index):
+        hamiltonian = (
+            FermionOperator("0^ 0", -1.1)
+            + FermionOperator("1^ 1", -1.1)
+            + FermionOperator("2^ 0", 0.3)
+            + FermionOperator("0^ 2", 0.3)
+            + FermionOperator("4^ 0", -0.2)
+            + FermionOperator("0^ 4", -0.2)
+            + FermionOperator("2^ 3^ 1 0", 0.4)
+            + FermionOperator("0^ 1^ 3 2", 0.4)
+            + FermionOperator("4^ 5^ 1 0", -0.5)
+            + FermionOperator("0^ 1^ 5 4", -0.5)
+        )
+        params = 0.7 * np.eye(engine.number_of_params)[index]
+        ansatz = SingletUCCSDAnsatz(NUMBER_OF_SPATIAL_ORBITALS, 1)
+
+        energy, _ = ansatz.get_energy_and_gradient(params, jordan_wigner(hamiltonian))
+
+        np.testing.assert_almost_equal(
+            engine.get_expectation_value(params, hamiltonian), energy
+        )
+
+    def test_expectation_value_accepts_operator_or_its_matrix(self, engine, rng):
+        params = rng.uniform(-1, 1, engine.number_of_params)
+        operator = FermionOperator("0^ 0", 0.5) + FermionOperator("2^ 3^ 3 2", -1.2)
+
+        np.testing.assert_almost_equal(
+            engine.get_expectation_value(params, operator),
+            engine.get_expectation_value(
+                params, engine.subspace.get_operator_matrix(operator)
+            ),
+        )
+
+    def test_wrong_number_of_params_raises_error(self, engine):
+        with pytest.raises(ValueError):
+            engine.get_state(np.zeros(engine.number_of_params + 1))
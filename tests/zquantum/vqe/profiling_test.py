@@ -0,0 +1,117 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import json
+import tracemalloc
+
+from zquantum.vqe.profiling import (
+    StageProfiler,
+    add_stage_callback,
+    profile_stage,
+    profiled,
+    remove_stage_callback,
+)
+from zquantum.vqe.quantum_compiling import HEAQuantumCompilingAnsatz
+from zquantum.vqe.singlet_uccsd import SingletUCCSDAnsatz
+
+
+@profiled("build_list")
+def _build_list(size):
+    with profile_stage("fill_list") as stage:
+        values = list(range(size))
+        stage.set_output(values)
+    return values + [None]
+
+
+class TestStageProfiler:
+    def test_records_nested_stages_with_output_sizes(self):
+        with StageProfiler() as profiler:
+            _build_list(10)
+
+        assert [record.name for record in profiler.records] == [
+            "fill_list",
+            "build_list",
+        ]
+        assert [record.parent for record in profiler.records] == [
+            "build_list",
+            None,
+        ]
+        assert [record.output_size for record in profiler.records] == [10, 11]
+        assert all(record.wall_time >= 0 for record in profiler.records)
+
+    def test_nothing_is_recorded_after_profiler_exits(self):
+        with StageProfiler() as profiler:
+            _build_list(3)
+
+        _build_list(3)
+
+        assert len(profiler.records) == 2
+
+    def test_summary_aggregates_calls_of_each_stage(self):
+        with StageProfiler() as profiler:
+            _build_list(3)
+            _build_list(5)
+
+        summary = profiler.summary()
+
+        assert summary["build_list"]["calls"] == 2
+        assert summary["fill_list"]["wall_time"] == sum(
+            record.wall_time
+            for record in profiler.records
+            if record.name == "fill_list"
+        )
+
+    def test_exported_json_contains_records_and_summary(self, tmp_path):
+        with StageProfiler() as profiler:
+            _build_list(3)
+        filename = tmp_path / "profile.json"
+
+        profiler.save(str(filename))
+
+        with open(filename) as f:
+            data = json.load(f)
+        assert data == json.loads(profiler.to_json())
+        assert data["records"][1]["name"] == "build_list"
+        assert data["summary"]["fill_list"]["calls"] == 1
+
+    def test_allocated_bytes_are_recorded_only_when_tracing(self):
+        with StageProfiler() as profiler:
+            _build_list(1000)
+            tracemalloc.start()
+            try:
+                _build_list(1000)
+            finally:
+                tracemalloc.stop()
+
+        assert profiler.records[0].allocated_bytes is None
+        assert profiler.records[2].allocated_bytes > 0
+
+
+def test_callbacks_receive_records_of_finished_stages():
+    records = []
+    add_stage_callback(records.append)
+    try:
+        _build_list(2)
+    finally:
+        remove_stage_callback(records.append)
+
+    assert [record.name for record in records] == ["fill_list", "build_list"]
+
+
+def test_ansatz_circuit_generation_is_profiled():
+    with StageProfiler() as profiler:
+        SingletUCCSDAnsatz(2, 1).parametrized_circuit
+        HEAQuantumCompilingAnsatz(1, 4).parametrized_circuit
+
+    stages = profiler.summary()
+    for name in [
+        "build_hartree_fock_circuit",
+        "uccsd_generator",
+        "exponentiate_fermion_operator",
+        "qubit_transformation",
+        "qubit_coefficients",
+        "time_evolution",
+        "hea_circuit_layer",
+        "hea_rotational_subcircuit",
+    ]:
+        assert name in stages
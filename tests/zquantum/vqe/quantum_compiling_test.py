@@ -1,6 +1,7 @@
 ################################################################################
 # © Copyright 2021 Zapata Computing Inc.
 ################################################################################
+import numpy as np
 import pytest
 from zquantum.core.interfaces.ansatz_test import AnsatzTests
 from zquantum.vqe.quantum_compiling import HEAQuantumCompilingAnsatz
@@ -91,3 +92,85 @@ class TestHEAQuantumCompilingAnsatz(AnsatzTests):
             == expected_number_of_single_qubit_gates
             + expected_number_of_two_qubit_gates
         )
+
+    def test_compact_circuit_converts_to_parametrized_circuit(self, ansatz, rng):
+        params = rng.uniform(-np.pi, np.pi, ansatz.number_of_params)
+        compact_circuit = ansatz.get_compact_circuit()
+
+        assert compact_circuit.to_circuit() == ansatz.parametrized_circuit
+        assert compact_circuit.to_circuit(params) == ansatz._generate_circuit(params)
+
+    def test_get_executable_circuits_returns_circuit_for_each_parameter_set(
+        self, ansatz, rng
+    ):
+        params_batch = rng.uniform(-np.pi, np.pi, (5, ansatz.number_of_params))
+
+        circuits = ansatz.get_executable_circuits(params_batch)
+
+        assert circuits == [ansatz._generate_circuit(params) for params in params_batch]
+
+    def test_get_executable_circuits_raises_error_for_wrong_number_of_params(
+        self, ansatz
+    ):
+        params_batch = np.zeros((2, ansatz.number_of_params + 1))
+
+        with pytest.raises(ValueError):
+            ansatz.get_executable_circuits(params_batch)
+
+    def test_statevector_engine_matches_executable_circuit(self, ansatz, rng):
+        params = rng.uniform(-np.pi, np.pi, ansatz.number_of_params)
+        initial_state = rng.normal(size=2**ansatz.number_of_qubits) + 1j * rng.normal(
+            size=2**ansatz.number_of_qubits
+        )
+        initial_state /= np.linalg.norm(initial_state)
+        unitary = ansatz.get_executable_circuit(params).to_unitary()
+
+        np.testing.assert_array_almost_equal(
+            ansatz.get_statevector(params), unitary[:, 0]
+        )
+        np.testing.assert_array_almost_equal(
+            ansatz.get_statevector(params, initial_state), unitary @ initial_state
+        )
+
+    @pytest.mark.parametrize("number_of_layers,number_of_qubits", [(1, 2), (2, 4)])
+    def test_parameter_shift_gradient_matches_finite_differences(
+        self, number_of_layers, number_of_qubits, rng
+    ):
+        ansatz = HEAQuantumCompilingAnsatz(number_of_layers, number_of_qubits)
+        hamiltonian = np.diag(rng.normal(size=2**ansatz.number_of_qubits))
+
+        def energy(params):
+            statevector = ansatz.get_statevector(params)
+            return np.real(np.vdot(statevector, hamiltonian @ statevector))
+
+        def estimate_energies(circuits):
+            return [
+                np.real(np.vdot(state, hamiltonian @ state))
+                for state in (circuit.to_unitary()[:, 0] for circuit in circuits)
+            ]
+
+        params = rng.uniform(-np.pi, np.pi, ansatz.number_of_params)
+        epsilon = 1e-6
+        expected_gradient = [
+            (energy(params + shift) - energy(params - shift)) / (2 * epsilon)
+            for shift in epsilon * np.eye(ansatz.number_of_params)
+        ]
+
+        np.testing.assert_array_almost_equal(
+            ansatz.get_parameter_shift_gradient(params, estimate_energies),
+            expected_gradient,
+            decimal=5,
+        )
+
+    def test_parameter_shift_circuits_are_generated_for_both_shifts(self, ansatz):
+        params = np.zeros(ansatz.number_of_params)
+
+        circuits = ansatz.get_parameter_shift_circuits(params)
+
+        assert len(circuits) == 2 * ansatz.number_of_params
+        assert circuits[0] == ansatz._generate_circuit(
+            np.eye(ansatz.number_of_params)[0] * np.pi / 2
+        )
+        assert circuits[-1] == ansatz._generate_circuit(
+            -np.eye(ansatz.number_of_params)[-1] * np.pi / 2
+        )
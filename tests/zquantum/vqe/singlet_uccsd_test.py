@@ -5,8 +5,26 @@ import numpy as np
 import pytest
 from zquantum.core.circuits import Circuit
 from zquantum.core.interfaces.ansatz_test import AnsatzTests
-from zquantum.core.openfermion import FermionOperator
+from zquantum.core.openfermion import (
+    FermionOperator,
+    QubitOperator,
+    bravyi_kitaev,
+    jordan_wigner,
+)
+from zquantum.vqe import utils
+from zquantum.vqe.common import get_uccsd_parameter_indices
+from zquantum.vqe.fermionic_excitations import get_fermionic_excitations
 from zquantum.vqe.singlet_uccsd import SingletUCCSDAnsatz
+from zquantum.vqe.statevector import apply_qubit_operator
+from zquantum.vqe.utils import _transform_fermion_term, build_hartree_fock_circuit
+
+
+def _parity_transform(fermion_operator):
+    qubit_operator = QubitOperator()
+    for term, coefficient in fermion_operator.terms.items():
+        for pauli_term, pauli_coefficient in _transform_fermion_term(term, "Parity", 6):
+            qubit_operator += QubitOperator(pauli_term, coefficient * pauli_coefficient)
+    return qubit_operator
 
 
 class TestSingletUCCSDAnsatz(AnsatzTests):
@@ -223,6 +241,345 @@ class TestSingletUCCSDAnsatz(AnsatzTests):
             expected_mp2_based_guess,
         )
 
+    def test_uccsd_parameter_indices_are_computed_once_per_system(self):
+        parameter_indices = get_uccsd_parameter_indices(8, 2)
+
+        assert SingletUCCSDAnsatz(4, 1).compute_uccsd_vector_from_fermion_generator(
+            FermionOperator()
+        ).shape == (9,)
+        assert get_uccsd_parameter_indices(8, 2) is parameter_indices
+        assert parameter_indices[((4, 1), (0, 0), (5, 1), (1, 0))] == 4
+        assert ((0, 1), (4, 0)) not in parameter_indices
+
+    def test_screening_parameters_keeps_only_surviving_excitations(
+        self, raw_ccsd_fop, expected_mp2_based_guess
+    ):
+        ansatz = SingletUCCSDAnsatz(4, 1)
+
+        params = ansatz.screen_parameters(raw_ccsd_fop, screening_threshold=0.01)
+
+        assert ansatz.active_parameter_indices == [4, 5]
+        assert ansatz.number_of_params == 2
+        assert len(ansatz.symbols) == 2
+        np.testing.assert_array_almost_equal(params, expected_mp2_based_guess[[4, 5]])
+        np.testing.assert_array_almost_equal(
+            ansatz.expand_params(params),
+            np.where(
+                np.abs(expected_mp2_based_guess) > 0.01, expected_mp2_based_guess, 0.0
+            ),
+        )
+
+    @pytest.mark.parametrize("transformation", ["Jordan-Wigner", "Bravyi-Kitaev"])
+    def test_screened_ansatz_matches_full_ansatz_with_inactive_params_set_to_zero(
+        self, transformation, rng
+    ):
+        ansatz = SingletUCCSDAnsatz(
+            3, 1, transformation=transformation, active_parameter_indices=[0, 2, 4]
+        )
+        full_ansatz = SingletUCCSDAnsatz(3, 1, transformation=transformation)
+        params = rng.uniform(-np.pi, np.pi, ansatz.number_of_params)
+
+        np.testing.assert_array_almost_equal(
+            ansatz.get_executable_circuit(params).to_unitary(),
+            full_ansatz.get_executable_circuit(
+                ansatz.expand_params(params)
+            ).to_unitary(),
+        )
+
+    def test_screened_ansatz_gradient_is_restriction_of_full_gradient(
+        self, qubit_hamiltonian, rng
+    ):
+        ansatz = SingletUCCSDAnsatz(3, 1, active_parameter_indices=[1, 3])
+        full_ansatz = SingletUCCSDAnsatz(3, 1)
+        params = rng.uniform(-np.pi, np.pi, ansatz.number_of_params)
+
+        energy, gradient = ansatz.get_energy_and_gradient(params, qubit_hamiltonian)
+        full_energy, full_gradient = full_ansatz.get_energy_and_gradient(
+            ansatz.expand_params(params), qubit_hamiltonian
+        )
+
+        np.testing.assert_almost_equal(energy, full_energy)
+        np.testing.assert_array_almost_equal(gradient, full_gradient[[1, 3]])
+
+    @pytest.mark.parametrize("active_parameter_indices", [[2, 1], [0, 0], [5]])
+    def test_init_asserts_active_parameter_indices(self, active_parameter_indices):
+        with pytest.raises(ValueError):
+            SingletUCCSDAnsatz(3, 1, active_parameter_indices=active_parameter_indices)
+
+    def test_changing_number_of_spatial_orbitals_asserts_active_parameter_indices(
+        self,
+    ):
+        ansatz = SingletUCCSDAnsatz(4, 1, active_parameter_indices=[1, 3, 7])
+
+        ansatz.number_of_spatial_orbitals = 5
+
+        assert ansatz.number_of_params == 3
+        assert len(ansatz.expand_params(np.ones(3))) == ansatz.full_number_of_params
+        with pytest.raises(ValueError):
+            ansatz.number_of_spatial_orbitals = 3
+
+    def test_changing_number_of_alpha_electrons_asserts_active_parameter_indices(
+        self,
+    ):
+        ansatz = SingletUCCSDAnsatz(4, 2, active_parameter_indices=[1, 12])
+
+        with pytest.raises(ValueError):
+            ansatz.number_of_alpha_electrons = 1
+
+    @pytest.mark.parametrize("transformation", ["Jordan-Wigner", "Bravyi-Kitaev"])
+    def test_circuit_bound_to_template_matches_circuit_built_from_params(
+        self, transformation, rng
+    ):
+        ansatz = SingletUCCSDAnsatz(
+            3, 1, transformation=transformation, use_circuit_template=True
+        )
+        params = rng.uniform(-np.pi, np.pi, ansatz.number_of_params)
+
+        np.testing.assert_array_almost_equal(
+            ansatz.get_executable_circuit(params).to_unitary(),
+            ansatz._generate_circuit(params).to_unitary(),
+        )
+
+    def test_circuit_template_is_rebuilt_after_invalidation(self):
+        ansatz = SingletUCCSDAnsatz(3, 1, use_circuit_template=True)
+        template = ansatz.circuit_template
+        assert ansatz.circuit_template is template
+
+        ansatz.number_of_spatial_orbitals = 4
+
+        assert ansatz.circuit_template is not template
+        assert ansatz.circuit_template.number_of_params == ansatz.number_of_params
+
+    @pytest.fixture
+    def qubit_hamiltonian(self):
+        return (
+            QubitOperator("", -0.5)
+            + QubitOperator("Z0 Z1", 0.3)
+            + QubitOperator("X0 Y1 Y2 X3", -0.2)
+            + QubitOperator("Z2", 0.7)
+            + QubitOperator("Y3 X4 Z5", 0.4)
+        )
+
+    @pytest.mark.parametrize(
+        "transformation,compilation",
+        [
+            ("Jordan-Wigner", "pauli"),
+            ("Bravyi-Kitaev", "pauli"),
+            ("Parity", "pauli"),
+            ("Jordan-Wigner", "fermionic_excitations"),
+        ],
+    )
+    def test_adjoint_energy_matches_energy_of_executable_circuit(
+        self, transformation, compilation, qubit_hamiltonian, rng
+    ):
+        ansatz = SingletUCCSDAnsatz(
+            3, 1, transformation=transformation, compilation=compilation
+        )
+        params = rng.uniform(-np.pi, np.pi, ansatz.number_of_params)
+        statevector = ansatz._generate_circuit(params).to_unitary()[:, 0]
+
+        energy, _ = ansatz.get_energy_and_gradient(params, qubit_hamiltonian)
+
+        np.testing.assert_almost_equal(
+            energy,
+            np.vdot(
+                statevector,
+                apply_qubit_operator(
+                    qubit_hamiltonian, statevector, ansatz.number_of_qubits
+                ),
+            ).real,
+        )
+
+    @pytest.mark.parametrize("transformation", ["Jordan-Wigner", "Bravyi-Kitaev"])
+    def test_adjoint_gradient_matches_finite_differences(
+        self, transformation, qubit_hamiltonian, rng
+    ):
+        ansatz = SingletUCCSDAnsatz(3, 1, transformation=transformation)
+        params = rng.uniform(-np.pi, np.pi, ansatz.number_of_params)
+        epsilon = 1e-6
+
+        _, gradient = ansatz.get_energy_and_gradient(params, qubit_hamiltonian)
+
+        expected_gradient = [
+            (
+                ansatz.get_energy_and_gradient(params + shift, qubit_hamiltonian)[0]
+                - ansatz.get_energy_and_gradient(params - shift, qubit_hamiltonian)[0]
+            )
+            / (2 * epsilon)
+            for shift in epsilon * np.eye(ansatz.number_of_params)
+        ]
+        np.testing.assert_array_almost_equal(gradient, expected_gradient, decimal=5)
+
+    def test_fermionic_excitations_compilation_reduces_number_of_cnots(self):
+        pauli_ansatz = SingletUCCSDAnsatz(3, 1)
+        excitations_ansatz = SingletUCCSDAnsatz(
+            3, 1, compilation="fermionic_excitations"
+        )
+
+        def count_cnots(ansatz):
+            return sum(
+                operation.gate.name in ("CNOT", "CZ")
+                for operation in ansatz.parametrized_circuit.operations
+            )
+
+        assert count_cnots(excitations_ansatz) < count_cnots(pauli_ansatz)
+
+    @pytest.mark.parametrize(
+        "transformation,compilation",
+        [("Bravyi-Kitaev", "fermionic_excitations"), ("Jordan-Wigner", "gates")],
+    )
+    def test_init_asserts_compilation(self, transformation, compilation):
+        with pytest.raises(ValueError):
+            SingletUCCSDAnsatz(
+                3, 1, transformation=transformation, compilation=compilation
+            )
+
+    @pytest.mark.parametrize("transformation", ["Bravyi-Kitaev", "Parity"])
+    def test_set_transformation_asserts_compilation(self, transformation):
+        ansatz = SingletUCCSDAnsatz(3, 1, compilation="fermionic_excitations")
+
+        with pytest.raises(ValueError):
+            ansatz.transformation = transformation
+
+    @pytest.mark.parametrize(
+        "transformation,compilation,taper_qubits,workers",
+        [
+            ("Jordan-Wigner", "pauli", False, 1),
+            ("Bravyi-Kitaev", "pauli", False, 1),
+            ("Parity", "pauli", False, 1),
+            ("Parity", "pauli", True, 1),
+            ("Jordan-Wigner", "pauli", False, 2),
+            ("Jordan-Wigner", "fermionic_excitations", False, 1),
+        ],
+    )
+    def test_circuit_blocks_concatenate_to_circuit_of_ansatz(
+        self, transformation, compilation, taper_qubits, workers, monkeypatch
+    ):
+        # Small blocks, so that the Pauli exponentials are split between many
+        monkeypatch.setattr(utils, "_CHUNK_SIZE", 5)
+        ansatz = SingletUCCSDAnsatz(
+            3,
+            1,
+            transformation=transformation,
+            compilation=compilation,
+            taper_qubits=taper_qubits,
+            workers=workers,
+        )
+
+        blocks = list(ansatz.iterate_circuit_blocks())
+        circuit = Circuit(n_qubits=ansatz.number_of_qubits)
+        for block in blocks:
+            circuit += block
+
+        assert len(blocks) > 2
+        assert circuit == ansatz.parametrized_circuit
+
+    @pytest.mark.parametrize("transformation", ["Jordan-Wigner", "Bravyi-Kitaev"])
+    def test_circuit_blocks_start_with_hartree_fock_circuit(self, transformation, rng):
+        ansatz = SingletUCCSDAnsatz(3, 1, transformation=transformation)
+        params = rng.uniform(-np.pi, np.pi, ansatz.number_of_params)
+
+        blocks = list(ansatz.iterate_circuit_blocks(params))
+
+        assert blocks[0] == build_hartree_fock_circuit(
+            ansatz.number_of_qubits, 1, 1, transformation
+        )
+        assert all(not block.free_symbols for block in blocks)
+
+    def test_circuit_blocks_of_excitations_follow_excitations_of_generator(self, rng):
+        ansatz = SingletUCCSDAnsatz(3, 1, compilation="fermionic_excitations")
+        params = rng.uniform(-np.pi, np.pi, ansatz.number_of_params)
+
+        blocks = list(ansatz.iterate_circuit_blocks(params))
+
+        assert len(blocks) == 1 + len(
+            get_fermionic_excitations(ansatz._build_fermion_generator(params))
+        )
+
+    def test_iterating_circuit_blocks_asserts_no_circuit_optimization(self):
+        ansatz = SingletUCCSDAnsatz(3, 1, optimize_circuit=True)
+
+        with pytest.raises(ValueError):
+            next(ansatz.iterate_circuit_blocks())
+
+    @pytest.fixture
+    def fermion_hamiltonian(self):
+        return (
+            FermionOperator("0^ 0", -1.2)
+            + FermionOperator("1^ 1", -1.2)
+            + FermionOperator("2^ 2", 0.4)
+            + FermionOperator("3^ 3", 0.4)
+            + FermionOperator("0^ 2", 0.3)
+            + FermionOperator("2^ 0", 0.3)
+            + FermionOperator("0^ 1^ 5 4", 0.15)
+            + FermionOperator("4^ 5^ 1 0", 0.15)
+        )
+
+    @pytest.mark.parametrize(
+        "transformation,transform",
+        [
+            ("Jordan-Wigner", jordan_wigner),
+            ("Bravyi-Kitaev", lambda operator: bravyi_kitaev(operator, n_qubits=6)),
+            ("Parity", _parity_transform),
+        ],
+    )
+    def test_tapered_ansatz_has_energy_and_gradient_of_full_ansatz(
+        self, transformation, transform, fermion_hamiltonian, rng
+    ):
+        ansatz = SingletUCCSDAnsatz(3, 1, transformation=transformation)
+        tapered_ansatz = SingletUCCSDAnsatz(
+            3, 1, transformation=transformation, taper_qubits=True
+        )
+        qubit_hamiltonian = transform(fermion_hamiltonian)
+        params = rng.uniform(-np.pi, np.pi, ansatz.number_of_params)
+
+        energy, gradient = ansatz.get_energy_and_gradient(params, qubit_hamiltonian)
+        tapered_energy, tapered_gradient = tapered_ansatz.get_energy_and_gradient(
+            params, tapered_ansatz.taper_operator(qubit_hamiltonian)
+        )
+
+        assert tapered_ansatz.number_of_qubits == 4
+        np.testing.assert_almost_equal(tapered_energy, energy)
+        np.testing.assert_array_almost_equal(tapered_gradient, gradient)
+
+    def test_tapered_circuit_has_energy_of_full_ansatz(self, fermion_hamiltonian, rng):
+        ansatz = SingletUCCSDAnsatz(3, 1, taper_qubits=True)
+        tapered_hamiltonian = ansatz.taper_operator(jordan_wigner(fermion_hamiltonian))
+        params = rng.uniform(-np.pi, np.pi, ansatz.number_of_params)
+        statevector = ansatz._generate_circuit(params).to_unitary()[:, 0]
+
+        energy, _ = ansatz.get_energy_and_gradient(params, tapered_hamiltonian)
+
+        np.testing.assert_almost_equal(
+            energy,
+            np.vdot(
+                statevector,
+                apply_qubit_operator(tapered_hamiltonian, statevector, 4),
+            ).real,
+        )
+
+    def test_tapering_is_cached_until_transformation_changes(self, fermion_hamiltonian):
+        ansatz = SingletUCCSDAnsatz(3, 1, taper_qubits=True)
+        parity_ansatz = SingletUCCSDAnsatz(
+            3, 1, transformation="Parity", taper_qubits=True
+        )
+        qubit_hamiltonian = _parity_transform(fermion_hamiltonian)
+        tapering = ansatz._get_tapering()
+        assert ansatz._get_tapering() is tapering
+
+        ansatz.transformation = "Parity"
+
+        assert ansatz._get_tapering() is not tapering
+        assert ansatz.taper_operator(qubit_hamiltonian) == (
+            parity_ansatz.taper_operator(qubit_hamiltonian)
+        )
+
+    def test_init_asserts_pauli_compilation_for_tapering(self):
+        with pytest.raises(ValueError):
+            SingletUCCSDAnsatz(
+                3, 1, compilation="fermionic_excitations", taper_qubits=True
+            )
+
     def test_generating_circuit_from_fermion_generator(
         self, raw_ccsd_fop, expected_mp2_based_guess
     ):
@@ -0,0 +1,112 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import numpy as np
+import pytest
+from zquantum.core.circuits import CNOT, RX, RZ, Circuit, X, Y, Z
+from zquantum.core.openfermion import QubitOperator
+from zquantum.vqe.statevector import (
+    apply_cnot,
+    apply_pauli_rotation,
+    apply_pauli_string,
+    apply_qubit_operator,
+    apply_rx,
+    apply_rz,
+    initial_statevector,
+)
+
+PAULI_GATES = {"X": X, "Y": Y, "Z": Z}
+
+NUMBER_OF_QUBITS = 3
+
+
+@pytest.fixture
+def random_state(rng):
+    state = rng.normal(size=2**NUMBER_OF_QUBITS) + 1j * rng.normal(
+        size=2**NUMBER_OF_QUBITS
+    )
+    return state / np.linalg.norm(state)
+
+
+def _apply_circuit(circuit, state):
+    circuit = Circuit(circuit.operations, n_qubits=NUMBER_OF_QUBITS)
+    return circuit.to_unitary() @ state
+
+
+class TestStatevectorKernels:
+    @pytest.mark.parametrize("qubit", range(NUMBER_OF_QUBITS))
+    @pytest.mark.parametrize("angle", [-0.3, np.pi / 2, 2.1])
+    def test_rotations_match_circuit_unitaries(self, random_state, qubit, angle):
+        for gate, kernel in [(RZ, apply_rz), (RX, apply_rx)]:
+            state = random_state.copy()
+
+            kernel(state, NUMBER_OF_QUBITS, qubit, angle)
+
+            np.testing.assert_array_almost_equal(
+                state, _apply_circuit(Circuit([gate(angle)(qubit)]), random_state)
+            )
+
+    @pytest.mark.parametrize("control,target", [(0, 1), (1, 0), (0, 2), (2, 1)])
+    def test_cnot_matches_circuit_unitary(self, random_state, control, target):
+        state = random_state.copy()
+
+        apply_cnot(state, NUMBER_OF_QUBITS, control, target)
+
+        np.testing.assert_array_almost_equal(
+            state, _apply_circuit(Circuit([CNOT(control, target)]), random_state)
+        )
+
+    @pytest.mark.parametrize(
+        "pauli_term",
+        [((0, "X"),), ((1, "Y"), (2, "Z")), ((0, "Y"), (1, "X"), (2, "Y"))],
+    )
+    def test_pauli_string_matches_circuit_unitary(self, random_state, pauli_term):
+        circuit = Circuit([PAULI_GATES[pauli](qubit) for qubit, pauli in pauli_term])
+
+        np.testing.assert_array_almost_equal(
+            apply_pauli_string(random_state, NUMBER_OF_QUBITS, pauli_term),
+            _apply_circuit(circuit, random_state),
+        )
+
+    def test_pauli_rotation_is_exponential_of_pauli_string(self, random_state):
+        pauli_term = ((0, "Z"), (2, "Y"))
+        angle = 0.7
+        state = random_state.copy()
+
+        apply_pauli_rotation(state, NUMBER_OF_QUBITS, pauli_term, angle)
+
+        np.testing.assert_array_almost_equal(
+            state,
+            np.cos(angle / 2) * random_state
+            - 1j
+            * np.sin(angle / 2)
+            * apply_pauli_string(random_state, NUMBER_OF_QUBITS, pauli_term),
+        )
+
+    def test_qubit_operator_is_sum_of_pauli_strings(self, random_state):
+        operator = QubitOperator("", 0.5) + QubitOperator("X0 Z2", -1.5)
+
+        np.testing.assert_array_almost_equal(
+            apply_qubit_operator(operator, random_state, NUMBER_OF_QUBITS),
+            0.5 * random_state
+            - 1.5
+            * apply_pauli_string(random_state, NUMBER_OF_QUBITS, ((0, "X"), (2, "Z"))),
+        )
+
+    def test_initial_statevector_defaults_to_all_zeros_state(self):
+        expected_state = np.zeros(2**NUMBER_OF_QUBITS)
+        expected_state[0] = 1
+
+        np.testing.assert_array_equal(
+            initial_statevector(NUMBER_OF_QUBITS), expected_state
+        )
+
+    def test_initial_statevector_does_not_alias_initial_state(self, random_state):
+        state = initial_statevector(NUMBER_OF_QUBITS, random_state)
+        apply_rz(state, NUMBER_OF_QUBITS, 0, 0.5)
+
+        assert not np.allclose(state, random_state)
+
+    def test_initial_statevector_with_wrong_size_raises_error(self):
+        with pytest.raises(ValueError):
+            initial_statevector(NUMBER_OF_QUBITS, np.ones(2))
@@ -0,0 +1,120 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from functools import reduce
+
+import numpy as np
+import pytest
+from zquantum.core.openfermion import (
+    FermionOperator,
+    QubitOperator,
+    bravyi_kitaev,
+    jordan_wigner,
+)
+from zquantum.vqe.tapering import (
+    Z2Tapering,
+    find_z2_symmetries,
+    get_spin_parity_symmetries,
+)
+
+PAULI_MATRICES = {
+    "I": np.eye(2),
+    "X": np.array([[0, 1], [1, 0]]),
+    "Y": np.array([[0, -1j], [1j, 0]]),
+    "Z": np.diag([1, -1]),
+}
+
+
+def _get_matrix(qubit_operator, number_of_qubits):
+    return sum(
+        coefficient
+        * reduce(
+            np.kron,
+            [
+                PAULI_MATRICES[dict(term).get(qubit, "I")]
+                for qubit in range(number_of_qubits)
+            ],
+        )
+        for term, coefficient in qubit_operator.terms.items()
+    )
+
+
+@pytest.fixture
+def fermion_hamiltonian():
+    return (
+        FermionOperator("0^ 0", -1.2)
+        + FermionOperator("1^ 1", -1.2)
+        + FermionOperator("2^ 2", 0.4)
+        + FermionOperator("5^ 5", 0.7)
+        + FermionOperator("0^ 2", 0.3)
+        + FermionOperator("2^ 0", 0.3)
+        + FermionOperator("1^ 5", -0.2)
+        + FermionOperator("5^ 1", -0.2)
+        + FermionOperator("0^ 1^ 5 4", 0.15)
+        + FermionOperator("4^ 5^ 1 0", 0.15)
+        + FermionOperator("3^ 4^ 4 3", 0.4)
+    )
+
+
+class TestZ2Tapering:
+    @pytest.mark.parametrize("transformation", ["Jordan-Wigner", "Bravyi-Kitaev"])
+    def test_tapered_hamiltonian_has_spectrum_of_symmetry_sector(
+        self, fermion_hamiltonian, transformation
+    ):
+        if transformation == "Jordan-Wigner":
+            qubit_hamiltonian = jordan_wigner(fermion_hamiltonian)
+        else:
+            qubit_hamiltonian = bravyi_kitaev(fermion_hamiltonian, n_qubits=6)
+        symmetries = get_spin_parity_symmetries(6, transformation)
+        tapering = Z2Tapering(symmetries, [-1, 1], 6)
+
+        tapered_hamiltonian = tapering.taper_qubit_operator(qubit_hamiltonian)
+
+        projector = np.eye(2**6)
+        for symmetry, eigenvalue in zip(symmetries, [-1, 1]):
+            symmetry_matrix = _get_matrix(QubitOperator(symmetry), 6)
+            projector = projector @ (np.eye(2**6) + eigenvalue * symmetry_matrix) / 2
+        eigenvalues, eigenvectors = np.linalg.eigh(projector)
+        sector = eigenvectors[:, eigenvalues > 0.5]
+        assert tapering.reduced_number_of_qubits == 4
+        np.testing.assert_array_almost_equal(
+            np.linalg.eigvalsh(_get_matrix(tapered_hamiltonian, 4)),
+            np.linalg.eigvalsh(
+                sector.conj().T @ _get_matrix(qubit_hamiltonian, 6) @ sector
+            ),
+        )
+
+    def test_spin_parities_are_among_symmetries_of_hamiltonian(
+        self, fermion_hamiltonian
+    ):
+        symmetries = find_z2_symmetries(jordan_wigner(fermion_hamiltonian), 6)
+
+        tapering = Z2Tapering(symmetries, [1] * len(symmetries), 6)
+        assert (
+            Z2Tapering(
+                symmetries + get_spin_parity_symmetries(6, "Jordan-Wigner"),
+                [1] * (len(symmetries) + 2),
+                6,
+            ).tapered_qubits
+            == tapering.tapered_qubits
+        )
+
+    def test_basis_state_is_tapered_by_removing_tapered_qubits(self):
+        tapering = Z2Tapering.from_bitstring(
+            get_spin_parity_symmetries(6, "Jordan-Wigner"), [1, 1, 0, 1, 0, 0]
+        )
+
+        assert tapering.eigenvalues == [-1, 1]
+        assert tapering.taper_bitstring([0, 1, 1, 1, 0, 0]).tolist() == [1, 1, 0, 0]
+        with pytest.raises(ValueError):
+            tapering.taper_bitstring([1, 0, 0, 0, 0, 0])
+
+    def test_inconsistent_eigenvalues_of_dependent_symmetries_raise_error(self):
+        with pytest.raises(ValueError):
+            Z2Tapering([((0, "Z"), (1, "Z")), ((1, "Z"),), ((0, "Z"),)], [1, 1, -1], 2)
+
+    def test_term_anticommuting_with_symmetry_raises_error(self):
+        tapering = Z2Tapering([((0, "Z"), (1, "Z"))], [1], 2)
+
+        with pytest.raises(ValueError):
+            tapering.taper_pauli_term(((0, "X"),))
@@ -0,0 +1,106 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import numpy as np
+import pytest
+import sympy
+from zquantum.core.circuits import CNOT, RX, RZ, Circuit, X
+from zquantum.vqe.templates import LinearCircuitTemplate
+
+THETA_0, THETA_1, THETA_2 = sympy.symbols("theta_0:3")
+
+
+class TestLinearCircuitTemplate:
+    @pytest.fixture
+    def circuit(self):
+        return Circuit(
+            [
+                X(0),
+                RZ(2 * THETA_0 + 0.5)(0),
+                CNOT(0, 1),
+                RX(THETA_2 - THETA_0)(1),
+                RX(np.pi / 2)(0),
+                RZ(THETA_1)(1),
+            ]
+        )
+
+    @pytest.fixture
+    def template(self, circuit):
+        return LinearCircuitTemplate(circuit, [THETA_0, THETA_1, THETA_2])
+
+    def test_gate_parameters_are_linear_functions_of_params(self, template):
+        params = np.array([0.25, -1.0, 2.0])
+
+        np.testing.assert_array_almost_equal(
+            template.gate_parameters(params), [1.0, 1.75, -1.0]
+        )
+
+    def test_bound_circuit_is_the_same_as_circuit_with_substituted_symbols(
+        self, circuit, template
+    ):
+        params = np.array([0.25, -1.0, 2.0])
+        symbols_map = dict(zip([THETA_0, THETA_1, THETA_2], params))
+
+        assert template.bind(params) == circuit.bind(symbols_map)
+
+    def test_gate_parameters_for_batch_are_computed_row_by_row(self, template, rng):
+        params_batch = rng.uniform(-np.pi, np.pi, (4, 3))
+
+        np.testing.assert_array_almost_equal(
+            template.gate_parameters(params_batch),
+            [template.gate_parameters(params) for params in params_batch],
+        )
+
+    def test_bind_batch_returns_one_circuit_per_parameter_vector(self, template):
+        params_batch = np.array([[0.25, -1.0, 2.0], [0.5, 0.0, -0.75]])
+
+        circuits = template.bind_batch(params_batch)
+
+        assert circuits == [template.bind(params) for params in params_batch]
+
+    def test_coefficients_have_one_row_per_parametrized_gate(self, template):
+        assert template.coefficients.shape == (3, 3)
+        np.testing.assert_array_almost_equal(
+            template.coefficients.toarray(),
+            [[2.0, 0.0, 0.0], [-1.0, 0.0, 1.0], [0.0, 1.0, 0.0]],
+        )
+        np.testing.assert_array_almost_equal(template.offsets, [0.5, 0.0, 0.0])
+
+    def test_bound_circuit_does_not_contain_symbols(self, template):
+        assert not template.bind(np.array([0.1, 0.2, 0.3])).free_symbols
+
+    def test_binding_wrong_number_of_params_raises_error(self, template):
+        with pytest.raises(ValueError):
+            template.bind(np.array([0.1, 0.2]))
+
+    def test_nonlinear_gate_parameters_are_rejected(self):
+        circuit = Circuit([RZ(THETA_0 * THETA_1)(0)])
+
+        with pytest.raises(ValueError):
+            LinearCircuitTemplate(circuit, [THETA_0, THETA_1])
+
+    def test_template_from_coefficients_binds_like_analyzed_template(
+        self, circuit, template
+    ):
+        params = np.array([0.25, -1.0, 2.0])
+        template_from_coefficients = LinearCircuitTemplate.from_coefficients(
+            circuit,
+            template.symbols,
+            [(1, 0), (3, 0), (5, 0)],
+            template.coefficients,
+            template.offsets,
+        )
+
+        assert template_from_coefficients.bind(params) == template.bind(params)
+
+    def test_template_from_coefficients_asserts_shape_of_coefficients(
+        self, circuit, template
+    ):
+        with pytest.raises(ValueError):
+            LinearCircuitTemplate.from_coefficients(
+                circuit,
+                template.symbols,
+                [(1, 0), (3, 0)],
+                template.coefficients,
+                template.offsets,
+            )
@@ -0,0 +1,97 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import numpy as np
+import pytest
+from zquantum.core.interfaces.ansatz_test import AnsatzTests
+from zquantum.vqe.upccgsd import UpCCGSDAnsatz
+from zquantum.vqe.utils import build_hartree_fock_circuit
+
+
+class TestUpCCGSDAnsatz(AnsatzTests):
+    @pytest.fixture
+    def number_of_layers(self):
+        return 2
+
+    @pytest.fixture
+    def ansatz(self, number_of_layers):
+        return UpCCGSDAnsatz(
+            number_of_spatial_orbitals=3,
+            number_of_alpha_electrons=1,
+            number_of_layers=number_of_layers,
+        )
+
+    def test_number_of_params_is_number_of_neighbouring_orbital_pairs_per_excitation(
+        self, ansatz
+    ):
+        assert ansatz.number_of_params_per_layer == 4
+        assert ansatz.number_of_params == 8
+        assert len(ansatz.parametrized_circuit.free_symbols) == 8
+
+    def test_number_of_params_per_layer_is_linear_in_number_of_orbitals(self):
+        assert [UpCCGSDAnsatz(n, 1).number_of_params_per_layer for n in (3, 6, 12)] == [
+            4,
+            10,
+            22,
+        ]
+
+    @pytest.mark.parametrize("number_of_layers", [0, -1])
+    def test_init_asserts_number_of_layers(self, number_of_layers):
+        with pytest.raises(ValueError):
+            UpCCGSDAnsatz(3, 1, number_of_layers=number_of_layers)
+
+    @pytest.mark.parametrize("number_of_spatial_orbitals", [1, 2])
+    def test_init_asserts_number_of_spatial_orbitals(self, number_of_spatial_orbitals):
+        with pytest.raises(ValueError):
+            UpCCGSDAnsatz(number_of_spatial_orbitals, 2)
+
+    def test_layer_generator_contains_singles_and_pair_doubles(self, ansatz):
+        layer_params = np.arange(1, 5)
+
+        generator = ansatz.build_layer_generator(layer_params)
+
+        assert generator.terms[((2, 1), (0, 0))] == 1
+        assert generator.terms[((3, 1), (1, 0))] == 1
+        assert generator.terms[((0, 1), (2, 0))] == -1
+        assert generator.terms[((5, 1), (3, 0))] == 2
+        assert generator.terms[((2, 1), (3, 1), (1, 0), (0, 0))] == 3
+        assert generator.terms[((0, 1), (1, 1), (3, 0), (2, 0))] == -3
+        assert generator.terms[((4, 1), (5, 1), (3, 0), (2, 0))] == 4
+        assert len(generator.terms) == 2 * (2 * 2 + 2)
+
+    @pytest.mark.parametrize(
+        "transformation", ["Jordan-Wigner", "Bravyi-Kitaev", "Parity"]
+    )
+    def test_circuit_with_zero_params_prepares_hartree_fock_state(
+        self, ansatz, transformation
+    ):
+        ansatz.transformation = transformation
+
+        circuit = ansatz.get_executable_circuit(np.zeros(ansatz.number_of_params))
+
+        np.testing.assert_array_almost_equal(
+            circuit.to_unitary()[:, 0],
+            build_hartree_fock_circuit(6, 1, 1, transformation).to_unitary()[:, 0],
+        )
+
+    def test_layers_with_zero_params_dont_change_the_state(self, rng):
+        single_layer_ansatz = UpCCGSDAnsatz(3, 1, number_of_layers=1)
+        three_layer_ansatz = UpCCGSDAnsatz(3, 1, number_of_layers=3)
+        params = rng.uniform(-np.pi, np.pi, 4)
+
+        np.testing.assert_array_almost_equal(
+            three_layer_ansatz.get_executable_circuit(
+                np.concatenate([np.zeros(4), params, np.zeros(4)])
+            ).to_unitary()[:, 0],
+            single_layer_ansatz.get_executable_circuit(params).to_unitary()[:, 0],
+        )
+
+    def test_state_conserves_numbers_of_alpha_and_beta_electrons(self, ansatz, rng):
+        params = rng.uniform(-np.pi, np.pi, ansatz.number_of_params)
+
+        statevector = ansatz.get_executable_circuit(params).to_unitary()[:, 0]
+
+        for index in np.flatnonzero(np.abs(statevector) > 1e-10):
+            occupations = [int(bit) for bit in f"{index:06b}"]
+            assert sum(occupations[0::2]) == 1
+            assert sum(occupations[1::2]) == 1
@@ -1,8 +1,33 @@
 ################################################################################
 # © Copyright 2021 Zapata Computing Inc.
 ################################################################################
+import numpy as np
+import pytest
+import sympy
 from zquantum.core.circuits import Circuit, X
-from zquantum.vqe.utils import build_hartree_fock_circuit, exponentiate_fermion_operator
+from zquantum.core.openfermion import (
+    FermionOperator,
+    QubitOperator,
+    bravyi_kitaev,
+    jordan_wigner,
+    uccsd_singlet_generator,
+    uccsd_singlet_paramsize,
+)
+from zquantum.vqe import templates, utils
+from zquantum.vqe.circuit_optimization import get_circuit_cost
+from zquantum.vqe.statevector import apply_qubit_operator
+from zquantum.vqe.templates import LinearCircuitTemplate
+from zquantum.vqe.utils import (
+    _get_qubit_generator,
+    _transform_fermion_term,
+    build_hartree_fock_circuit,
+    build_hartree_fock_circuits,
+    clear_transformation_cache,
+    compile_exponentiated_fermion_operator,
+    exponentiate_fermion_operator,
+    get_hartree_fock_bitstrings,
+    get_two_qubit_reduction,
+)
 
 
 class TestVQEUtils:
@@ -33,3 +58,371 @@ class TestVQEUtils:
             transformation,
         )
         assert actual_circuit == expected_circuit
+
+    def test_build_hartree_fock_circuit_parity(self):
+        expected_circuit = Circuit([X(0)], n_qubits=4)
+        actual_circuit = build_hartree_fock_circuit(4, 1, 1, "Parity")
+        assert actual_circuit == expected_circuit
+
+    @pytest.mark.parametrize(
+        "transformation", ["Jordan-Wigner", "Bravyi-Kitaev", "Parity"]
+    )
+    def test_hartree_fock_bitstrings_match_transformed_creation_operators(
+        self, transformation
+    ):
+        number_of_qubits = 10
+        alpha_electrons, beta_electrons = np.meshgrid(np.arange(6), np.arange(6))
+
+        bitstrings = get_hartree_fock_bitstrings(
+            number_of_qubits, alpha_electrons, beta_electrons, transformation
+        )
+
+        assert bitstrings.shape == (6, 6, number_of_qubits)
+        for bitstring, alpha, beta in zip(
+            bitstrings.reshape(-1, number_of_qubits),
+            alpha_electrons.ravel(),
+            beta_electrons.ravel(),
+        ):
+            occupied_orbitals = sorted(
+                list(range(0, 2 * alpha, 2)) + list(range(1, 2 * beta, 2))
+            )
+            creation_operator = FermionOperator(
+                tuple((orbital, 1) for orbital in occupied_orbitals)
+            )
+            if transformation == "Jordan-Wigner":
+                qubit_operator = jordan_wigner(creation_operator)
+            elif transformation == "Bravyi-Kitaev":
+                qubit_operator = bravyi_kitaev(creation_operator, number_of_qubits)
+            else:
+                qubit_operator = QubitOperator()
+                qubit_operator.terms.update(
+                    _transform_fermion_term(
+                        next(iter(creation_operator.terms)), "Parity", number_of_qubits
+                    )
+                )
+            pauli_term = next(iter(qubit_operator.terms))
+            flipped_qubits = [qubit for qubit, pauli in pauli_term if pauli != "Z"]
+            assert np.flatnonzero(bitstring).tolist() == flipped_qubits
+
+    def test_build_hartree_fock_circuits_returns_circuit_for_each_configuration(
+        self,
+    ):
+        circuits = build_hartree_fock_circuits(4, [1, 2, 0], [1, 1, 2], "Jordan-Wigner")
+
+        assert circuits == [
+            Circuit([X(0), X(1)], n_qubits=4),
+            Circuit([X(0), X(1), X(2)], n_qubits=4),
+            Circuit([X(1), X(3)], n_qubits=4),
+        ]
+
+    @pytest.mark.parametrize("transformation", ["Jordan-Wigner", "Bravyi-Kitaev"])
+    def test_compiled_exponentiated_fermion_operator_matches_numeric_circuits(
+        self, transformation, rng
+    ):
+        number_of_qubits = 6
+        number_of_electrons = 2
+        symbols = sympy.symbols(
+            f"theta_0:{uccsd_singlet_paramsize(number_of_qubits, number_of_electrons)}",
+            real=True,
+        )
+        template = compile_exponentiated_fermion_operator(
+            uccsd_singlet_generator(
+                symbols, number_of_qubits, number_of_electrons, anti_hermitian=True
+            ),
+            symbols,
+            transformation,
+            number_of_qubits,
+        )
+        params_batch = rng.uniform(-np.pi, np.pi, (3, len(symbols)))
+
+        for params, circuit in zip(params_batch, template.bind_batch(params_batch)):
+            expected_circuit = exponentiate_fermion_operator(
+                uccsd_singlet_generator(
+                    params, number_of_qubits, number_of_electrons, anti_hermitian=True
+                ),
+                transformation,
+                number_of_qubits,
+            )
+            np.testing.assert_array_almost_equal(
+                circuit.to_unitary(), expected_circuit.to_unitary()
+            )
+
+        assert template.coefficients.shape == (
+            len(template.offsets),
+            len(symbols),
+        )
+
+    @pytest.mark.parametrize(
+        "transformation", ["Jordan-Wigner", "Bravyi-Kitaev", "Parity"]
+    )
+    def test_compiled_template_is_derived_without_analyzing_gates(
+        self, transformation, monkeypatch
+    ):
+        symbols = sympy.symbols(f"theta_0:{uccsd_singlet_paramsize(6, 2)}", real=True)
+        fermion_generator = uccsd_singlet_generator(symbols, 6, 2, anti_hermitian=True)
+        template = compile_exponentiated_fermion_operator(
+            fermion_generator, symbols, transformation, 6
+        )
+        expected_template = LinearCircuitTemplate(template.circuit, symbols)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Gate parameters were analyzed.")
+
+        monkeypatch.setattr(templates, "split_linear_expression", fail)
+        template = compile_exponentiated_fermion_operator(
+            fermion_generator, symbols, transformation, 6
+        )
+
+        assert template._slots == expected_template._slots
+        np.testing.assert_array_almost_equal(
+            template.coefficients.toarray(), expected_template.coefficients.toarray()
+        )
+        np.testing.assert_array_almost_equal(
+            template.offsets, expected_template.offsets
+        )
+
+    @pytest.mark.parametrize(
+        "transformation,transform",
+        [
+            ("Jordan-Wigner", jordan_wigner),
+            (
+                "Bravyi-Kitaev",
+                lambda operator: bravyi_kitaev(operator, n_qubits=8),
+            ),
+        ],
+    )
+    def test_termwise_transformation_matches_transformation_of_whole_operator(
+        self, transformation, transform, rng
+    ):
+        fermion_generator = uccsd_singlet_generator(
+            rng.uniform(-1, 1, uccsd_singlet_paramsize(8, 4)),
+            8,
+            4,
+            anti_hermitian=True,
+        )
+        expected_qubit_generator = QubitOperator()
+        for term, coefficient in transform(fermion_generator).terms.items():
+            expected_qubit_generator += QubitOperator(term, coefficient.imag)
+        expected_qubit_generator.compress()
+
+        assert (
+            _get_qubit_generator(fermion_generator, transformation, 8)
+            == expected_qubit_generator
+        )
+
+    def test_parity_transformation_matches_jordan_wigner_in_parity_basis(self, rng):
+        number_of_qubits = 6
+        fermion_generator = uccsd_singlet_generator(
+            rng.uniform(-1, 1, uccsd_singlet_paramsize(6, 2)),
+            6,
+            2,
+            anti_hermitian=True,
+        )
+
+        def get_matrix(qubit_operator):
+            return np.array(
+                [
+                    apply_qubit_operator(qubit_operator, column, number_of_qubits)
+                    for column in np.eye(2**number_of_qubits, dtype=complex)
+                ]
+            ).T
+
+        # Basis state with occupations n is mapped to the one with prefix parities
+        change_of_basis = np.zeros((2**number_of_qubits, 2**number_of_qubits))
+        for index in range(2**number_of_qubits):
+            occupations = [int(bit) for bit in f"{index:0{number_of_qubits}b}"]
+            parities = "".join(str(parity) for parity in np.cumsum(occupations) % 2)
+            change_of_basis[int(parities, 2), index] = 1
+
+        np.testing.assert_array_almost_equal(
+            get_matrix(_get_qubit_generator(fermion_generator, "Parity", 6)),
+            change_of_basis
+            @ get_matrix(_get_qubit_generator(fermion_generator, "Jordan-Wigner", 6))
+            @ change_of_basis.T,
+        )
+
+    def test_two_qubit_reduction_removes_two_qubits_from_parity_circuits(self, rng):
+        fermion_generator = uccsd_singlet_generator(
+            rng.uniform(-1, 1, uccsd_singlet_paramsize(6, 2)),
+            6,
+            2,
+            anti_hermitian=True,
+        )
+        tapering = get_two_qubit_reduction(6, 1, 1, "Parity")
+
+        assert tapering.tapered_qubits == [0, 5]
+        assert build_hartree_fock_circuit(
+            6, 1, 1, "Parity", tapering=tapering
+        ) == Circuit(n_qubits=4)
+        assert (
+            exponentiate_fermion_operator(
+                fermion_generator, "Parity", 6, tapering=tapering
+            ).n_qubits
+            == 4
+        )
+
+    def test_termwise_transformation_reuses_images_of_terms(self, monkeypatch, rng):
+        fermion_generator = uccsd_singlet_generator(
+            rng.uniform(-1, 1, uccsd_singlet_paramsize(6, 2)),
+            6,
+            2,
+            anti_hermitian=True,
+        )
+        expected_qubit_generator = _get_qubit_generator(
+            2 * fermion_generator, "Jordan-Wigner", 6
+        )
+
+        def fail(*args):
+            raise AssertionError("Image of a term was computed again.")
+
+        monkeypatch.setattr(utils, "_compute_term_image", fail)
+
+        assert (
+            _get_qubit_generator(2 * fermion_generator, "Jordan-Wigner", 6)
+            == expected_qubit_generator
+        )
+
+    def test_images_computed_by_workers_are_cached_in_parent_process(
+        self, monkeypatch, rng
+    ):
+        fermion_generator = uccsd_singlet_generator(
+            rng.uniform(-1, 1, uccsd_singlet_paramsize(6, 2)),
+            6,
+            2,
+            anti_hermitian=True,
+        )
+        clear_transformation_cache()
+        circuit = exponentiate_fermion_operator(
+            fermion_generator, "Jordan-Wigner", 6, workers=2
+        )
+
+        assert all(
+            (term, "Jordan-Wigner", 6) in utils._term_images
+            for term in fermion_generator.terms
+        )
+
+        def fail(*args):
+            raise AssertionError("Image of a term was computed again.")
+
+        monkeypatch.setattr(utils, "_compute_term_image", fail)
+
+        assert (
+            exponentiate_fermion_operator(
+                fermion_generator, "Jordan-Wigner", 6, workers=2
+            )
+            == circuit
+        )
+
+    def test_process_pool_is_reused_between_builds(self):
+        assert utils._get_process_pool(2) is utils._get_process_pool(2)
+        assert utils._get_process_pool(1) is None
+
+    @pytest.mark.parametrize("transformation", ["Jordan-Wigner", "Bravyi-Kitaev"])
+    def test_symbolic_qubit_generator_evaluates_to_numeric_qubit_generator(
+        self, transformation, rng
+    ):
+        number_of_params = uccsd_singlet_paramsize(6, 2)
+        symbols = sympy.symbols(f"theta_0:{number_of_params}", real=True)
+        params = rng.uniform(-1, 1, number_of_params)
+        symbolic_qubit_generator = _get_qubit_generator(
+            uccsd_singlet_generator(symbols, 6, 2, anti_hermitian=True),
+            transformation,
+            6,
+        )
+        numeric_qubit_generator = _get_qubit_generator(
+            uccsd_singlet_generator(params, 6, 2, anti_hermitian=True),
+            transformation,
+            6,
+        )
+
+        evaluated_qubit_generator = QubitOperator()
+        for term, coefficient in symbolic_qubit_generator.terms.items():
+            evaluated_qubit_generator += QubitOperator(
+                term, float(coefficient.subs(dict(zip(symbols, params))))
+            )
+        assert evaluated_qubit_generator == numeric_qubit_generator
+
+    @pytest.mark.parametrize(
+        "transformation", ["Jordan-Wigner", "Bravyi-Kitaev", "Parity"]
+    )
+    def test_generator_with_nonlinear_coefficients_matches_numeric_circuit(
+        self, transformation
+    ):
+        theta, phi = sympy.symbols("theta phi", real=True)
+        symbols_map = {theta: 0.3, phi: -0.7}
+
+        def build_generator(single_amplitude, double_amplitude):
+            return (
+                FermionOperator("2^ 0", single_amplitude)
+                - FermionOperator("0^ 2", single_amplitude)
+                + FermionOperator("3^ 2^ 1 0", double_amplitude)
+                - FermionOperator("0^ 1^ 2 3", double_amplitude)
+            )
+
+        circuit = exponentiate_fermion_operator(
+            build_generator(sympy.cos(theta), theta * phi), transformation, 4
+        )
+        numeric_circuit = exponentiate_fermion_operator(
+            build_generator(np.cos(0.3), 0.3 * -0.7), transformation, 4
+        )
+
+        np.testing.assert_array_almost_equal(
+            circuit.bind(symbols_map).to_unitary(), numeric_circuit.to_unitary()
+        )
+
+    @pytest.mark.parametrize("coefficient", [0.5, sympy.Symbol("theta", real=True)])
+    def test_exponentiating_hermitian_operator_raises_error(self, coefficient):
+        hermitian_operator = FermionOperator("2^ 0", coefficient) + FermionOperator(
+            "0^ 2", coefficient
+        )
+
+        with pytest.raises(RuntimeError):
+            exponentiate_fermion_operator(hermitian_operator)
+
+    @pytest.mark.parametrize("transformation", ["Jordan-Wigner", "Bravyi-Kitaev"])
+    def test_optimized_circuit_implements_the_same_unitary_with_fewer_cnots(
+        self, transformation, rng
+    ):
+        fermion_generator = uccsd_singlet_generator(
+            rng.uniform(-1, 1, uccsd_singlet_paramsize(6, 2)),
+            6,
+            2,
+            anti_hermitian=True,
+        )
+
+        circuit = exponentiate_fermion_operator(fermion_generator, transformation, 6)
+        optimized_circuit = exponentiate_fermion_operator(
+            fermion_generator, transformation, 6, optimize_circuit=True
+        )
+
+        np.testing.assert_array_almost_equal(
+            optimized_circuit.to_unitary(), circuit.to_unitary()
+        )
+        assert (
+            get_circuit_cost(optimized_circuit).cnot_count
+            < get_circuit_cost(circuit).cnot_count
+        )
+
+    @pytest.mark.parametrize("transformation", ["Jordan-Wigner", "Bravyi-Kitaev"])
+    @pytest.mark.parametrize("optimize_circuit", [False, True])
+    def test_circuit_built_by_multiple_workers_matches_serial_circuit(
+        self, transformation, optimize_circuit, monkeypatch
+    ):
+        monkeypatch.setattr(utils, "_CHUNK_SIZE", 5)
+        symbols = sympy.symbols(f"theta_:{uccsd_singlet_paramsize(6, 2)}")
+        fermion_generator = uccsd_singlet_generator(
+            np.asarray(symbols), 6, 2, anti_hermitian=True
+        )
+
+        circuit = exponentiate_fermion_operator(
+            fermion_generator, transformation, 6, optimize_circuit
+        )
+        parallel_circuit = exponentiate_fermion_operator(
+            fermion_generator, transformation, 6, optimize_circuit, workers=2
+        )
+
+        assert parallel_circuit == circuit
+
+    def test_non_positive_number_of_workers_raises_error(self):
+        with pytest.raises(ValueError):
+            exponentiate_fermion_operator(FermionOperator("1^ 0", 0.5), workers=0)